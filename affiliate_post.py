@@ -6,6 +6,13 @@ affiliate_post.py — 쿠팡 글 자동 발행 (기사형)
 - 요약은 박스로, 대가성 문구는 최상단 강조
 - 본문은 공백 제외 1500자 이상 (중복 보강 제한)
 - 하루/슬롯 1회 락으로 중복 예약 방지
+- CSS_MODE=shared: .rt 스타일은 재사용 블록으로 1회 게시, 본문에는 참조만 (shared_css)
+- MINIFY_HTML=1: 발행 직전 본문 경량화(공백 안전, 절감 바이트 로그)
+- USE_IMAGE=1: 상품 이미지를 받아 리사이즈 후 미디어 업로드(해시 중복 제거) → 썸네일 + featured_media
+- ROTATE_MODE=cursor: 골든 CSV는 그대로 두고 .usage 커서만 전진 (kw_cursor)
+- ROTATE_MODE=queue: 공유 SQLite 큐에서 lease → 발행 성공 시 ack (병렬 슬롯 안전, kw_queue)
+- SEED_STORE=sqlite: 키워드의 씨드 행(딥링크/이미지)을 seed_store에서 키 조회로 사용 → 없으면 기존 경로
+- --plan-days N (PLAN_DAYS): AFFILIATE_TIMES_KST 슬롯을 N일치 한 번에 예약 (이미 찬 슬롯은 건너뜀)
 """
 
 from __future__ import annotations
@@ -14,11 +21,14 @@ from datetime import datetime, timedelta, timezone
 from zoneinfo import ZoneInfo
 from typing import List, Dict, Optional
 from pathlib import Path
+from urllib.parse import urlparse
 import requests
 from dotenv import load_dotenv
-from coupang_api import deeplink_for_query  # 딥링크 시도
 
+# 아래 헬퍼 모듈들이 import 시점에 env를 읽으므로 .env를 먼저 로드
 load_dotenv()
+from coupang_api import deeplink_for_query  # 딥링크 시도
+import wp_schedule, thumbs, tpl, shared_css, html_minify, used_store, kw_cursor, kw_queue, seed_store
 
 # ===== ENV =====
 WP_URL=(os.getenv("WP_URL") or "").strip().rstrip("/")
@@ -35,6 +45,7 @@ USAGE_DIR=os.getenv("USAGE_DIR") or ".usage"
 USED_SHOP=os.path.join(USAGE_DIR,"used_shopping.txt")
 
 REQUIRE_COUPANG_API=(os.getenv("REQUIRE_COUPANG_API") or "0").strip().lower() in ("1","true","yes","on")
+USE_IMAGE=(os.getenv("USE_IMAGE") or "").strip().lower() in ("1","true","yes","on")
 
 P_GOLD="golden_shopping_keywords.csv"
 
@@ -56,16 +67,21 @@ _CSS_RT = """
 .rt .callout{background:#f8fafc;border-left:3px solid #94a3b8;padding:.9em 1em;border-radius:.6rem}
 .rt .rt-center{text-align:center;margin:16px 0}
 .rt .disclosure{background:#ecfdf5;border-left:6px solid #10b981;padding:.8em 1em;border-radius:.6rem;margin:0 0 12px}
+.rt figure.rt-thumb{margin:18px auto;text-align:center}
+.rt figure.rt-thumb img{max-width:100%;height:auto;border-radius:12px}
 </style>
 """.strip()
 
+shared_css.register("rt-aff", _CSS_RT)
+
 def _wrap_rt(body: str) -> str:
     if 'class="rt"' in body:
         return body
-    return _CSS_RT + "\n<div class=\"rt\">\n" + body + "\n</div>"
+    css = shared_css.style("rt-aff")  # CSS_MODE: inline → <style>, shared → 블록 참조, none → 생략
+    return (css + "\n" if css else "") + "<div class=\"rt\">\n" + body + "\n</div>"
 
 def _esc(s: Optional[str])->str:
-    return html.escape((s or "").strip())
+    return tpl.esc(s)
 
 def _ensure_usage():
     os.makedirs(USAGE_DIR, exist_ok=True)
@@ -74,6 +90,9 @@ def _mark_used(kw:str):
     _ensure_usage()
     with open(USED_SHOP,"a",encoding="utf-8") as f:
         f.write(f"{datetime.utcnow().date():%Y-%m-%d}\t{kw}\n")
+    if used_store.USED_STORE == "sqlite":
+        # 텍스트 로그가 원본, 색인은 방금 쓴 줄까지 증분 반영
+        st = used_store.UsedStore(); st.import_text("shopping", USED_SHOP); st.close()
 
 def _read_col_csv(path:str)->List[str]:
     if not os.path.exists(path): return []
@@ -88,15 +107,15 @@ def _read_col_csv(path:str)->List[str]:
             if s: out.append(s)
     return out
 
-def _rotate_csv_head_to_tail(path:str):
+def _rotate_csv_head_to_tail(path:str, count:int=1):
     if not os.path.exists(path): return
     with open(path,"r",encoding="utf-8",newline="") as f:
         rows=list(csv.reader(f))
     if not rows or len(rows)<2: return
     header, data = rows[0], rows[1:]
     if not data: return
-    head = data.pop(0)
-    data.append(head)
+    k = count % len(data)
+    data = data[k:] + data[:k]
     with open(path,"w",encoding="utf-8",newline="") as f:
         wr=csv.writer(f); wr.writerow(header); wr.writerows(data)
 
@@ -104,10 +123,11 @@ def _strip_tags(s:str)->str:
     return re.sub(r"<[^>]+>", "", s or "")
 
 def _nchars_no_space(html_text:str)->int:
-    return len(re.sub(r"\s+","",_strip_tags(html_text)))
+    return tpl.visible_len(html_text)
 
 def _ensure_min_chars(body_html:str, min_chars:int=1500)->str:
-    if _nchars_no_space(body_html) >= min_chars:
+    buf = tpl.HtmlBody(body_html)  # 본문은 1회만 스캔, 이후 보강 조각만 증분 집계
+    if buf.visible >= min_chars:
         return body_html
     fillers = [
         "<h3>구매 체크리스트</h3><p>내 환경(공간·소음·예산)을 먼저 정의하고 꼭 필요한 기능부터 우선순위를 매기세요.</p>",
@@ -116,11 +136,10 @@ def _ensure_min_chars(body_html:str, min_chars:int=1500)->str:
         "<h3>FAQ</h3><p><b>Q.</b> 과사양은 괜찮나요? <b>A.</b> 목적 대비 과사양은 비용/관리 부담이 큽니다.</p>",
     ]
     used=set()
-    buf = body_html
     for add in fillers:
-        if _nchars_no_space(buf) >= min_chars: break
+        if buf.visible >= min_chars: break
         if add not in used:
-            buf += "\n" + add
+            buf.append(add, sep="\n")
             used.add(add)
     # 남으면 짧은 노트 최대 3회만
     notes = [
@@ -129,10 +148,10 @@ def _ensure_min_chars(body_html:str, min_chars:int=1500)->str:
         "총비용(구매가+유지비)을 함께 보세요."
     ]
     i=0
-    while _nchars_no_space(buf) < min_chars and i < len(notes):
-        buf += f"<p class='aff-note'>{_esc(notes[i])}</p>"
+    while buf.visible < min_chars and i < len(notes):
+        buf.append(f"<p class='aff-note'>{_esc(notes[i])}</p>")
         i+=1
-    return buf
+    return buf.getvalue()
 
 # ===== WP =====
 def _ensure_term(kind:str, name:str)->int:
@@ -148,17 +167,19 @@ def _ensure_term(kind:str, name:str)->int:
     r.raise_for_status()
     return int(r.json()["id"])
 
-def post_wp(title:str, content:str, when_gmt:str, category:str)->dict:
+def post_wp(title:str, content:str, when_gmt:str, category:str, featured_media:Optional[int]=None)->dict:
     cat_id=_ensure_term("categories", category or AFFILIATE_CATEGORY)
     payload={
         "title": title,
-        "content": content,
+        "content": html_minify.maybe_minify(content, "affiliate"),
         "status": POST_STATUS,
         "categories": [cat_id],
         "comment_status": "closed",
         "ping_status": "closed",
         "date_gmt": when_gmt
     }
+    if featured_media:
+        payload["featured_media"] = featured_media
     r=requests.post(f"{WP_URL}/wp-json/wp/v2/posts", json=payload,
                     auth=(WP_USER,WP_APP_PASSWORD), verify=VERIFY_TLS, timeout=20, headers=REQ_HEADERS)
     r.raise_for_status()
@@ -175,17 +196,26 @@ def _slot_to_utc(kst_hm:str)->str:
     if tgt<=now: tgt+=timedelta(days=1)
     return tgt.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
 
-def _aff_lock(slot_kst: str) -> bool:
-    """같은 날짜/슬롯은 1회만."""
+def _aff_lock_path(slot_kst: str, day: Optional[str]=None) -> Path:
+    today = day or _now_kst().strftime("%Y%m%d")
+    return Path(USAGE_DIR) / f"aff_{today}_{slot_kst.replace(':', '')}.lock"
+
+def _aff_lock(slot_kst: str, day: Optional[str]=None) -> bool:
+    """같은 날짜/슬롯은 1회만. day(YYYYMMDD) 미지정 시 오늘(KST)."""
     os.makedirs(USAGE_DIR, exist_ok=True)
-    today = _now_kst().strftime("%Y%m%d")
-    tag = slot_kst.replace(":", "")
-    p = Path(USAGE_DIR) / f"aff_{today}_{tag}.lock"
+    p = _aff_lock_path(slot_kst, day)
     if p.exists():
         return False
     p.write_text("1", encoding="utf-8")
     return True
 
+def _aff_unlock(slot_kst: str, day: Optional[str]=None):
+    """발행 실패 → 락 해제 (다음 실행에서 같은 슬롯을 다시 시도)."""
+    try:
+        _aff_lock_path(slot_kst, day).unlink()
+    except FileNotFoundError:
+        pass
+
 # ===== 버튼 =====
 def _button_html_local(url: str, label: str = "바로 보기") -> str:
     u = html.escape(url); l = html.escape(label or "바로 보기")
@@ -203,7 +233,21 @@ def coupang_search_url(query: str) -> str:
     from urllib.parse import quote_plus
     return f"https://search.shopping.coupang.com/search?component=&q={quote_plus(query)}&channel=rel"
 
+def _seed_row(kw:str)->Optional[Dict]:
+    """seed_store에서 키워드의 첫 상품 행 (비활성/없음/실패 → None)."""
+    if not seed_store.enabled(): return None
+    try:
+        rows = seed_store.lookup(kw, limit=1)
+        return rows[0] if rows else None
+    except Exception as e:
+        print(f"[SEED] lookup fail '{kw}': {e}")
+        return None
+
 def resolve_affiliate_url(product_title: str) -> str:
+    row = _seed_row(product_title)
+    # 파트너스 링크만 사용: 딥링크 일괄 변환이 실패한 행은 url=raw_url(태그 없는 검색 URL) → 기존 경로로 재시도
+    if row and "link.coupang.com" in urlparse(row.get("url") or "").netloc:
+        return row["url"]
     if REQUIRE_COUPANG_API:
         try:
             u = deeplink_for_query(product_title)
@@ -213,6 +257,30 @@ def resolve_affiliate_url(product_title: str) -> str:
             pass
     return coupang_search_url(product_title)
 
+# ===== 썸네일 =====
+def _image_for_keyword(kw:str)->Optional[str]:
+    """씨드 행의 이미지 → 없으면 쿠팡 상품 검색 첫 결과의 이미지 URL (키/모듈 없으면 None)."""
+    row = _seed_row(kw)
+    if row and row.get("image"): return row["image"]
+    ak=os.getenv("COUPANG_ACCESS_KEY") or ""; sk=os.getenv("COUPANG_SECRET_KEY") or ""
+    if not (ak and sk): return None
+    try:
+        from coupang_search import search_products
+        items = search_products(kw, ak, sk, limit=1)
+        return (items[0].get("imageUrl") or None) if items else None
+    except Exception as e:
+        print(f"[THUMB] search fail '{kw}': {e}")
+        return None
+
+def _thumbs_for(keywords:List[str], session)->List[Optional[tuple]]:
+    """키워드별 (media_id, source_url) 또는 None. 검색/다운로드는 동시 처리."""
+    if not USE_IMAGE or not keywords:
+        return [None]*len(keywords)
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=thumbs.THUMB_WORKERS) as ex:
+        img_urls = list(ex.map(_image_for_keyword, keywords))
+    return thumbs.featured_for(session, WP_URL, (WP_USER,WP_APP_PASSWORD), img_urls, VERIFY_TLS)
+
 # ===== 콘텐츠 =====
 def _build_product_skeleton(keyword:str)->Dict:
     k = keyword.strip()
@@ -221,44 +289,183 @@ def _build_product_skeleton(keyword:str)->Dict:
         "summary": f"{k} 선택 시, 성능·관리·비용 균형을 빠르게 점검할 수 있도록 핵심만 정리합니다."
     }
 
-def _render_article(product:Dict, url:str)->str:
+# 공시문구/광고 숏코드는 실행 중 바뀌지 않으므로 정적 조각으로 미리 합쳐 둔다
+_ARTICLE = tpl.layout("aff_article", [
+    f'<div class="disclosure">{_esc(DISCLOSURE_TEXT)}</div>' if DISCLOSURE_TEXT else "",
+    (AD_SHORTCODE or ""),
+    '<h3>요약글</h3><div class="callout"><p>{{summary}}</p></div>',
+    "{{button}}",
+    '<h3>정보 글</h3>',
+    '<p>실사용 기준으로 자주 쓰는 기능과 관리 난도를 먼저 확인하면 선택이 쉬워집니다. '
+    '공간·소음·예산을 기준으로 필요한 수준만 고르는 것이 핵심입니다.</p>',
+    "{{thumb}}",
+    "{{button}}",
+    (AD_SHORTCODE or ""),
+    '<h3>추가 정보</h3>',
+    '<table><thead><tr><th>항목</th><th>확인 포인트</th><th>비고</th></tr></thead>'
+    '<tbody>'
+    '<tr><td>성능</td><td>공간/목적 대비 충분</td><td>과투자 방지</td></tr>'
+    '<tr><td>관리</td><td>세척·보관·소모품</td><td>난도/주기</td></tr>'
+    '<tr><td>비용</td><td>구매가 + 유지비</td><td>시즌 특가</td></tr>'
+    '</tbody></table>',
+])
+
+def _render_article(product:Dict, url:str, thumb_url:Optional[str]=None)->str:
     k = _esc(product.get("title") or "추천 제품")
-    bh = _get_button_html(url)
-
-    parts = [
-        f'<div class="disclosure">{_esc(DISCLOSURE_TEXT)}</div>' if DISCLOSURE_TEXT else "",
-        (AD_SHORTCODE or ""),
-        f'<h3>요약글</h3><div class="callout"><p>{_esc(product.get("summary"))}</p></div>',
-        bh,
-        '<h3>정보 글</h3>',
-        '<p>실사용 기준으로 자주 쓰는 기능과 관리 난도를 먼저 확인하면 선택이 쉬워집니다. '
-        '공간·소음·예산을 기준으로 필요한 수준만 고르는 것이 핵심입니다.</p>',
-        bh,
-        (AD_SHORTCODE or ""),
-        '<h3>추가 정보</h3>',
-        '<table><thead><tr><th>항목</th><th>확인 포인트</th><th>비고</th></tr></thead>'
-        '<tbody>'
-        '<tr><td>성능</td><td>공간/목적 대비 충분</td><td>과투자 방지</td></tr>'
-        '<tr><td>관리</td><td>세척·보관·소모품</td><td>난도/주기</td></tr>'
-        '<tr><td>비용</td><td>구매가 + 유지비</td><td>시즌 특가</td></tr>'
-        '</tbody></table>',
-    ]
-    return _wrap_rt(_ensure_min_chars("\n".join(p for p in parts if p), 1500))
+    thumb = f'<figure class="rt-thumb"><img src="{_esc(thumb_url)}" alt="{k} 썸네일"></figure>' if thumb_url else ""
+    body = _ARTICLE.render(summary=_esc(product.get("summary")), button=_get_button_html(url), thumb=thumb)
+    return _wrap_rt(_ensure_min_chars(body, 1500))
 
 # ===== 키워드 =====
-def _pick_keyword()->Optional[str]:
+def _gold_pool()->List[str]:
     pool=_read_col_csv(P_GOLD)
+    return kw_cursor.view(P_GOLD, pool) if kw_cursor.enabled() else pool
+
+def _pick_keyword()->Optional[str]:
+    pool=_gold_pool()
     return pool[0] if pool else None
 
-def _rotate_after_use():
-    _rotate_csv_head_to_tail(P_GOLD)
-    print("[ROTATE] rotated")
+def _rotate_after_use(count:int=1):
+    if kw_cursor.enabled():
+        kw_cursor.advance(P_GOLD, _read_col_csv(P_GOLD), count)
+    else:
+        _rotate_csv_head_to_tail(P_GOLD, count)
+    print(f"[ROTATE] rotated ({count})")
+
+def _rotate_used(keywords:List[str]):
+    """발행에 쓴 키워드만 정확히 꼬리로(사용 순서). 현재 머리 k개와 같으면 기존 회전(커서 전진)과 동일."""
+    if not keywords: return
+    items=_read_col_csv(P_GOLD)
+    view=kw_cursor.view(P_GOLD, items) if kw_cursor.enabled() else items
+    k=len(keywords)
+    if view[:k]==list(keywords):
+        _rotate_after_use(k); return
+    used=set(keywords)
+    tail=[x for x in dict.fromkeys(keywords) if x in set(view)]
+    new=[x for x in view if x not in used]+tail
+    # 현재 보이는 순서 그대로 다시 씀 → 커서 모드도 새 generation의 offset 0 = 이 순서
+    with open(P_GOLD,"r",encoding="utf-8",newline="") as f:
+        first=next(csv.reader(f), None)
+    header=first if first and first[0].strip().lower() in ("keyword","title") else ["keyword"]
+    with open(P_GOLD,"w",encoding="utf-8",newline="") as f:
+        wr=csv.writer(f); wr.writerow(header); wr.writerows([x] for x in new)
+    print(f"[ROTATE] moved {len(tail)} used keywords to tail")
+
+def _lease_gold(n:int)->Optional[List["kw_queue.Lease"]]:
+    """ROTATE_MODE=queue: 공유 큐에서 n개 대여(병렬 슬롯끼리 같은 키워드 방지). 다른 모드면 None."""
+    if not kw_queue.enabled(): return None
+    return kw_queue.lease_for(P_GOLD, n, seed=lambda: _read_col_csv(P_GOLD))
+
+def _title_for(kw:str)->str:
+    return f"{kw} 이렇게 쓰니 편해요"
+
+# ===== 여러 날짜 플래너 =====
+def _plan_slots_env()->List[str]:
+    raw = os.getenv("AFFILIATE_TIMES_KST") or os.getenv("AFFILIATE_TIME_KST") or "12:00"
+    return [x.strip() for x in raw.split(",") if x.strip()]
+
+def run_plan(days:int):
+    """N일치 슬롯을 한 번에 채운다. 이미 예약된 시각/락이 있는 슬롯은 건너뜀."""
+    slots = _plan_slots_env()
+    plan = wp_schedule.plan_slots(slots, days)
+    if not plan:
+        print("[AFFILIATE] PLAN: no slots"); return
+
+    leases = _lease_gold(len(plan))
+    pool = [l.keyword for l in leases] if leases is not None else _gold_pool()
+    used: List[str] = []
+    try:
+        if pool:
+            used = _schedule_plan(plan, pool)
+        else:
+            print("[AFFILIATE] SKIP: no keyword")
+    finally:
+        if leases is not None:
+            kw_queue.settle(leases, used)
+    if used and leases is None:
+        _rotate_used(used)
+
+def _schedule_plan(plan, pool:List[str])->List[str]:
+    """빈 슬롯에 pool 앞에서부터 배정해 발행.
+    반환: 소비한 키워드 = 이미 같은 제목으로 올라가 있어 건너뛴 키워드 + 발행에 성공한 키워드
+    (둘 다 회전/ack 대상: 건너뛴 키워드가 머리에 남아 매번 다시 걸러지지 않도록)."""
+    auth = (WP_USER, WP_APP_PASSWORD)
+    session = wp_schedule.make_session(REQ_HEADERS)
+    cat_id = _ensure_term("categories", AFFILIATE_CATEGORY)
+    shared_css.ensure_published(session, WP_URL, auth, VERIFY_TLS)
+    now_gmt = datetime.now(timezone.utc).strftime(wp_schedule.GMT_FMT)
+    idx = wp_schedule.open_index(session, WP_URL, auth, VERIFY_TLS)
+    posted: List[str] = []
+    if idx:
+        occupied = idx.occupied(now_gmt, categories=[cat_id])
+        # 이미 같은 제목으로 올라간 키워드는 제외 (소비한 것으로 반환)
+        posted = [k for k in pool if idx.has_title(_title_for(k))]
+        if posted:
+            print(f"[AFFILIATE] PLAN skip already posted: {posted}")
+            done = set(posted)
+            pool = [k for k in pool if k not in done]
+    else:
+        occupied = wp_schedule.fetch_occupied(session, WP_URL, auth, VERIFY_TLS,
+                                              after_gmt=now_gmt, categories=[cat_id])
+
+    todo = []  # (kst, gmt, kw)
+    for kst, gmt in plan:
+        if gmt in occupied:
+            print(f"[AFFILIATE] PLAN skip {kst}: already scheduled"); continue
+        if len(todo) >= len(pool):
+            print(f"[AFFILIATE] PLAN stop at {kst}: keyword pool exhausted ({len(pool)})"); break
+        if not _aff_lock(kst[11:], day=kst[:10].replace("-", "")):
+            print(f"[AFFILIATE] PLAN skip {kst}: lock exists"); continue
+        todo.append((kst, gmt, pool[len(todo)]))
+    if not todo:
+        print("[AFFILIATE] PLAN: nothing to schedule"); return posted
+
+    payloads = []
+    media = _thumbs_for([kw for _, _, kw in todo], session)
+    for (_, gmt, kw), fm in zip(todo, media):
+        payload = {
+            "title": _title_for(kw),
+            "content": html_minify.maybe_minify(
+                _render_article(_build_product_skeleton(kw), resolve_affiliate_url(kw),
+                                thumb_url=fm[1] if fm else None), "affiliate"),
+            "status": POST_STATUS,
+            "categories": [cat_id],
+            "comment_status": "closed",
+            "ping_status": "closed",
+            "date_gmt": gmt,
+        }
+        if fm: payload["featured_media"] = fm[0]
+        payloads.append(payload)
+    try:
+        results = wp_schedule.publish_many(session, WP_URL, auth, payloads, VERIFY_TLS)
+    except BaseException:
+        for kst, _, _ in todo:
+            _aff_unlock(kst[11:], day=kst[:10].replace("-", ""))
+        raise
+    if idx:
+        idx.record_many(results); idx.close()
+
+    used = []
+    for (kst, gmt, kw), res in zip(todo, results):
+        if res.get("error"):
+            print(f"[AFFILIATE] PLAN fail {kst} '{kw}': {res['error']}")
+            _aff_unlock(kst[11:], day=kst[:10].replace("-", ""))
+            continue
+        print(json.dumps({"post_id": res.get("id"), "slot_kst": kst, "date_gmt": res.get("date_gmt"),
+                          "status": res.get("status"), "keyword": kw}, ensure_ascii=False))
+        _mark_used(kw)
+        used.append(kw)
+    return posted + used
 
 # ===== 메인 =====
-def main():
+def main(plan_days:int=1):
     if not (WP_URL and WP_USER and WP_APP_PASSWORD):
         raise RuntimeError("WP_URL/WP_USER/WP_APP_PASSWORD 필요")
 
+    if plan_days > 1:
+        run_plan(plan_days)
+        return
+
     slot = (os.getenv("AFFILIATE_TIME_KST") or "12:00").strip()
     print(f"[AFFILIATE] slot={slot}")
 
@@ -267,18 +474,33 @@ def main():
         print(f"[AFFILIATE] SKIP: slot {slot} already scheduled today")
         return
 
-    kw = _pick_keyword()
+    leases = _lease_gold(1)
+    kw = (leases[0].keyword if leases else None) if leases is not None else _pick_keyword()
     if not kw:
         print("[AFFILIATE] SKIP: no keyword")
         return
-
+    try:
+        _post_one(slot, kw)
+    except BaseException:
+        _aff_unlock(slot)
+        if leases: kw_queue.settle(leases, [])
+        raise
+    if leases:
+        kw_queue.settle(leases, [kw])
+    else:
+        _rotate_after_use()
+
+def _post_one(slot:str, kw:str):
     url = resolve_affiliate_url(kw)
     prod = _build_product_skeleton(kw)
-    content_html = _render_article(prod, url)
+    session = wp_schedule.make_session(REQ_HEADERS)
+    shared_css.ensure_published(session, WP_URL, (WP_USER,WP_APP_PASSWORD), VERIFY_TLS)
+    fm = _thumbs_for([kw], session)[0]
+    content_html = _render_article(prod, url, thumb_url=fm[1] if fm else None)
 
     when_gmt = _slot_to_utc(slot)
-    title = f"{kw} 이렇게 쓰니 편해요"
-    res = post_wp(title, content_html, when_gmt, AFFILIATE_CATEGORY)
+    title = _title_for(kw)
+    res = post_wp(title, content_html, when_gmt, AFFILIATE_CATEGORY, featured_media=fm[0] if fm else None)
     print(json.dumps({
         "post_id": res.get("id"),
         "link": res.get("link"),
@@ -289,7 +511,8 @@ def main():
     }, ensure_ascii=False))
 
     _mark_used(kw)
-    _rotate_after_use()
 
 if __name__=="__main__":
-    main()
+    import sys
+    days=int(sys.argv[sys.argv.index("--plan-days")+1]) if "--plan-days" in sys.argv else wp_schedule.PLAN_DAYS
+    main(days)
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""
+aho_matcher.py — 다중 패턴 부분문자열 매칭 (Aho-Corasick)
+- 패턴 수와 무관하게 입력 길이에 선형: `any(b in s for b in bans)` 대체
+- search(s): 하나라도 포함되면 True / first(s): 처음 끝나는 패턴 / find_all(s): 포함된 패턴 전부
+- cached(patterns, path): 패턴 집합 해시가 같으면 디스크(pickle)에서 바로 로드, 다르면 새로 빌드 후 저장
+
+사용:
+    m = AhoMatcher(["히터", "USB"])
+    m.search("미니 히터")  # True
+"""
+
+from __future__ import annotations
+import os, pickle, hashlib, tempfile
+from collections import deque
+from typing import Dict, Iterable, List, Optional
+
+class AhoMatcher:
+    __slots__ = ("patterns", "_goto", "_fail", "_out", "_digest")
+
+    def __init__(self, patterns: Iterable[str]):
+        pats = sorted({p for p in patterns if p})
+        self.patterns: List[str] = pats
+        self._digest = digest(pats)
+        goto: List[Dict[str, int]] = [{}]
+        out: List[List[int]] = [[]]
+        for pid, p in enumerate(pats):
+            node = 0
+            for ch in p:
+                nxt = goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[node][ch] = nxt
+                    goto.append({}); out.append([])
+                node = nxt
+            out[node].append(pid)
+
+        fail = [0] * len(goto)
+        q = deque(goto[0].values())
+        while q:
+            r = q.popleft()
+            for ch, s in goto[r].items():
+                q.append(s)
+                f = fail[r]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fs = goto[f].get(ch, 0)
+                fail[s] = fs if fs != s else 0
+                if out[fail[s]]:
+                    out[s] = out[s] + out[fail[s]]
+        self._goto = goto
+        self._fail = fail
+        self._out = [tuple(o) for o in out]
+
+    def __len__(self) -> int:
+        return len(self.patterns)
+
+    def _walk(self, s: str):
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        for ch in s:
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if out[node]:
+                yield out[node]
+
+    def search(self, s: str) -> bool:
+        for _ in self._walk(s or ""):
+            return True
+        return False
+
+    __contains__ = search
+
+    def first(self, s: str) -> Optional[str]:
+        for ids in self._walk(s or ""):
+            return self.patterns[ids[0]]
+        return None
+
+    def find_all(self, s: str) -> List[str]:
+        seen = set()
+        for ids in self._walk(s or ""):
+            seen.update(ids)
+        return [self.patterns[i] for i in sorted(seen)]
+
+def digest(patterns: Iterable[str]) -> str:
+    h = hashlib.sha256()
+    for p in sorted({p for p in patterns if p}):
+        h.update(p.encode("utf-8")); h.update(b"\0")
+    return h.hexdigest()
+
+def cached(patterns: Iterable[str], path: Optional[str]) -> AhoMatcher:
+    """같은 패턴 집합이면 저장된 오토마톤 재사용, 아니면 빌드 후 저장(실패해도 무시)."""
+    pats = [p for p in patterns if p]
+    if not path:
+        return AhoMatcher(pats)
+    want = digest(pats)
+    try:
+        with open(path, "rb") as f:
+            m = pickle.load(f)
+        if isinstance(m, AhoMatcher) and m._digest == want:
+            return m
+    except Exception:
+        pass
+    m = AhoMatcher(pats)
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with tempfile.NamedTemporaryFile("wb", dir=os.path.dirname(path) or ".", delete=False) as tmp:
+            pickle.dump(m, tmp, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp.name, path)
+    except Exception:
+        pass
+    return m
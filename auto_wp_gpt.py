@@ -1,27 +1,33 @@
 ﻿# -*- coding: utf-8 -*-
 """
 auto_wp_gpt.py — 일상글 2건 예약
-- 기사형 섹션 구조 + .dx 네임스페이스 CSS
+- 기사형 섹션 구조 + .dx 네임스페이스 CSS (CSS_MODE=shared 면 공용 스타일 블록 참조만 삽입, shared_css)
 - AD 상/중 삽입, 중앙 버튼 유지
 - '요약글' 소제목 제거(텍스트/콜아웃만 표시)
 - 1500자 보강: 중복 금지, 최대 3블록
 - keywords_general.csv에서 2개 키워드 사용 후 머리를 꼬리로 회전 (영구 반영은 워크플로 커밋 단계에서 처리)
+- ROTATE_MODE=cursor: CSV는 그대로 두고 .usage 커서만 전진 (kw_cursor)
+- ROTATE_MODE=queue: 공유 SQLite 큐에서 lease → 발행 후 ack (병렬 슬롯 안전, kw_queue)
+- MINIFY_HTML=1: 발행 직전 본문 경량화(공백 안전, 절감 바이트 로그)
+- --plan-days N (PLAN_DAYS): 10시/17시 슬롯을 N일치 한 번에 예약 (이미 찬 슬롯은 건너뜀)
 """
 
 from __future__ import annotations
-import os, json, re, html, csv
+import os, json, re, csv
 from datetime import datetime, timedelta, timezone
 from zoneinfo import ZoneInfo
 from typing import Dict, Optional, List
 import requests
 from dotenv import load_dotenv
+
+# 아래 헬퍼 모듈들이 import 시점에 env를 읽으므로 .env를 먼저 로드
+load_dotenv()
+import wp_schedule, tpl, shared_css, html_minify, kw_cursor, kw_queue
 try:
     from slugify import slugify  # 일반 경로
 except Exception:
     from python_slugify import slugify  # 일부 환경
 
-load_dotenv()
-
 WP_URL=(os.getenv("WP_URL") or "").strip().rstrip("/")
 WP_USER=os.getenv("WP_USER") or ""
 WP_APP_PASSWORD=os.getenv("WP_APP_PASSWORD") or ""
@@ -57,16 +63,17 @@ def _css():
 """.strip()
 
 def _esc(s: Optional[str])->str:
-    return html.escape((s or "").strip())
+    return tpl.esc(s)
 
 def _strip_tags(s: str) -> str:
     return re.sub(r"<[^>]+>", "", s or "")
 
 def _nchars(x: str) -> int:
-    return len(re.sub(r"\s+","",_strip_tags(x)))
+    return tpl.visible_len(x)
 
 def _ensure_min_chars(body: str, min_chars: int = 1500) -> str:
-    if _nchars(body) >= min_chars:
+    buf=tpl.HtmlBody(body)  # 본문은 1회만 스캔, 이후 보강 조각만 증분 집계
+    if buf.visible >= min_chars:
         return body
     fillers = [
         "<h3>작은 한 걸음</h3><p>완벽보다 빈도가 중요합니다. 측정 가능한 지표를 한 줄로 정리하고, 다음 행동을 캘린더에 바로 배치하세요.</p>",
@@ -74,38 +81,41 @@ def _ensure_min_chars(body: str, min_chars: int = 1500) -> str:
         "<h3>방해요소 차단</h3><p>내일 아침 30분 동안만 환경을 단순화해보세요. 불필요한 알림/탭/물건을 치우고 핵심 도구만 남기면 집중이 쉬워집니다.</p>",
     ]
     used=set()
-    buf=body
     for b in fillers:
-        if _nchars(buf) >= min_chars: break
-        if b not in used and b not in buf:
-            buf += "\n" + b
+        if buf.visible >= min_chars: break
+        # 덧붙인 보강끼리는 used로 거르므로 원문(body)만 확인하면 충분
+        if b not in used and b not in body:
+            buf.append(b, sep="\n")
             used.add(b)
-    return buf
+    return buf.getvalue()
 
 def _center_btn(url:str, label:str)->str:
     u=_esc(url); l=_esc(label or "정보 글 더 보기")
     return f'<div class="center"><a class="btn" href="{u}" target="_blank" rel="nofollow noopener">{l}</a></div>'
 
+# 요약(소제목 제거) / 하이라이트 / 실행 / 지표+회고 (+ 광고 상/중) — CSS/광고/정적 섹션은 1회만 컴파일
+shared_css.register("dx", _css())
+
+_DIARY = tpl.layout("diary", [
+    "{{css}}",
+    '<div class="dx">',
+    (AD_SHORTCODE or ""),
+    # 요약은 소제목 없이 callout만
+    '<div class="callout"><p>오늘의 기록—‘{{title}}’—을 한 단락으로 정리합니다. 핵심만 간결하게 남겨두면 복기가 빨라집니다.</p></div>',
+    "{{button}}",
+    '<h3>하이라이트</h3>',
+    '<ul>{{hls}}</ul>',
+    (AD_INSERT_MIDDLE or ""),
+    '<h3>실행</h3>',
+    '<ul><li>내일 5분 안에 시작할 첫 행동</li><li>2주 유지할 지표 1개</li><li>하지 않을 것 1가지</li></ul>',
+    '<h3>지표/회고</h3>',
+    '<p>집중 시간, 피드백 횟수, 완료/보류 항목을 간단히 기록합니다. 작은 진동의 누적이 다음 선택의 난이도를 낮춥니다.</p>',
+    '</div>'
+])
+
 def _build_diary_html(title: str, highlight: list[str], info_btn_url:str) -> str:
-    # 요약(소제목 제거) / 하이라이트 / 실행 / 지표+회고 (+ 광고 상/중)
     hls = "".join(f"<li>{_esc(x)}</li>" for x in highlight[:3])
-    parts = [
-        _css(),
-        '<div class="dx">',
-        (AD_SHORTCODE or ""),
-        # 요약은 소제목 없이 callout만
-        f'<div class="callout"><p>오늘의 기록—‘{_esc(title)}’—을 한 단락으로 정리합니다. 핵심만 간결하게 남겨두면 복기가 빨라집니다.</p></div>',
-        _center_btn(info_btn_url, "정보 글 더 보기"),
-        '<h3>하이라이트</h3>',
-        f'<ul>{hls}</ul>',
-        (AD_INSERT_MIDDLE or ""),
-        '<h3>실행</h3>',
-        '<ul><li>내일 5분 안에 시작할 첫 행동</li><li>2주 유지할 지표 1개</li><li>하지 않을 것 1가지</li></ul>',
-        '<h3>지표/회고</h3>',
-        '<p>집중 시간, 피드백 횟수, 완료/보류 항목을 간단히 기록합니다. 작은 진동의 누적이 다음 선택의 난이도를 낮춥니다.</p>',
-        '</div>'
-    ]
-    return "\n".join(p for p in parts if p)
+    return _DIARY.render(css=shared_css.style("dx"), title=_esc(title), hls=hls, button=_center_btn(info_btn_url, "정보 글 더 보기"))
 
 # ===== 키워드 회전 =====
 def _read_col_csv(path:str)->List[str]:
@@ -120,8 +130,21 @@ def _read_col_csv(path:str)->List[str]:
             if s: out.append(s)
     return out
 
+def _read_pool(path:str)->List[str]:
+    items=_read_col_csv(path)
+    return kw_cursor.view(path, items) if kw_cursor.enabled() else items
+
+def _lease_pool(n:int)->Optional[List["kw_queue.Lease"]]:
+    """ROTATE_MODE=queue: 공유 큐에서 n개 대여. 다른 모드면 None."""
+    if not kw_queue.enabled(): return None
+    return kw_queue.lease_for(KEYWORDS_CSV, n, seed=lambda: _read_col_csv(KEYWORDS_CSV))
+
 def _write_rotated(path:str, items:List[str], k:int):
-    if not os.path.exists(path): return
+    if kw_cursor.enabled():
+        # items는 커서로 본 목록이므로 파일 원래 순서로 다시 읽어 커서만 이동
+        kw_cursor.advance(path, _read_col_csv(path), k); return
+    if not os.path.exists(path) or not items: return
+    k %= len(items)
     with open(path,"r",encoding="utf-8",newline="") as f:
         rows=list(csv.reader(f))
     if not rows: return
@@ -130,6 +153,22 @@ def _write_rotated(path:str, items:List[str], k:int):
     with open(path,"w",encoding="utf-8",newline="") as f:
         wr=csv.writer(f); wr.writerow(header); wr.writerows(data)
 
+def _rotate_used(path:str, keywords:List[str]):
+    """발행에 쓴 키워드만 정확히 꼬리로(사용 순서). 현재 머리 k개와 같으면 기존 회전(커서 전진)과 동일."""
+    view=_read_pool(path)
+    kws=[x for x in dict.fromkeys(keywords) if x in set(view)]
+    if not kws: return
+    if view[:len(kws)]==kws:
+        _write_rotated(path, view, len(kws)); return
+    used=set(kws)
+    new=[x for x in view if x not in used]+kws
+    # 현재 보이는 순서 그대로 다시 씀 → 커서 모드도 새 generation의 offset 0 = 이 순서
+    with open(path,"r",encoding="utf-8",newline="") as f:
+        first=next(csv.reader(f), None)
+    header=first if first and first[0].strip().lower() in ("keyword","title") else ["keyword"]
+    with open(path,"w",encoding="utf-8",newline="") as f:
+        wr=csv.writer(f); wr.writerow(header); wr.writerows([x] for x in new)
+
 # ===== WP =====
 def _ensure_term(kind:str, name:str)->int:
     r=requests.get(f"{WP_URL}/wp-json/wp/v2/{kind}",
@@ -146,15 +185,7 @@ def _ensure_term(kind:str, name:str)->int:
 
 def _post_wp(title:str, content:str, when_gmt:str, category:str)->dict:
     cat_id=_ensure_term("categories", category or DEFAULT_CATEGORY)
-    payload={
-        "title": title,
-        "content": content,
-        "status": POST_STATUS,
-        "categories": [cat_id],
-        "comment_status": "closed",
-        "ping_status": "closed",
-        "date_gmt": when_gmt
-    }
+    payload=_payload(title, content, when_gmt, cat_id)
     r=requests.post(f"{WP_URL}/wp-json/wp/v2/posts", json=payload,
                     auth=(WP_USER,WP_APP_PASSWORD), verify=VERIFY_TLS, timeout=20, headers=REQ_HEADERS)
     r.raise_for_status()
@@ -169,42 +200,125 @@ def _slot_to_utc(hh:int)->str:
     if tgt<=now: tgt+=timedelta(days=1)
     return tgt.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
 
+# ===== 슬롯별 글 틀 (10시 / 17시) =====
+SLOTS=[10,17]
+TITLE_FMT=["{kw} 정리 메모", "{kw} 회고 점검 노트"]
+HIGHLIGHTS=[
+    ["가장 좋았던 선택 1가지","의외의 장애물 1가지","내일 반복할 한 가지"],
+    ["에너지를 높인 순간 1가지","실패에서 배운 것 1가지","다음 개선 1가지"],
+]
+FALLBACK_KWS=["프로젝트 회고","작은 습관"]
+
+def _payload(title:str, content:str, when_gmt:str, cat_id:int)->dict:
+    return {
+        "title": title,
+        "content": html_minify.maybe_minify(content, "diary"),
+        "status": POST_STATUS,
+        "categories": [cat_id],
+        "comment_status": "closed",
+        "ping_status": "closed",
+        "date_gmt": when_gmt
+    }
+
+def run_plan(days:int):
+    """N일치 10시/17시 슬롯을 한 번에 채운다. 이미 예약된 시각은 건너뜀."""
+    leases=_lease_pool(len(SLOTS)*days)
+    if leases is None:
+        _schedule_plan(days, _read_pool(KEYWORDS_CSV) or list(FALLBACK_KWS), rotate=True)
+        return
+    used=[]
+    try:
+        used=_schedule_plan(days, [l.keyword for l in leases] or list(FALLBACK_KWS), rotate=False)
+    finally:
+        kw_queue.settle(leases, used)
+
+def _schedule_plan(days:int, pool:List[str], rotate:bool)->List[str]:
+    """빈 슬롯에 pool 앞에서부터 배정해 발행. 반환: 발행에 성공한 키워드."""
+    auth=(WP_USER,WP_APP_PASSWORD)
+    session=wp_schedule.make_session(REQ_HEADERS)
+    cat_id=_ensure_term("categories", DEFAULT_CATEGORY)
+    shared_css.ensure_published(session, WP_URL, auth, VERIFY_TLS)
+    now_gmt=datetime.now(timezone.utc).strftime(wp_schedule.GMT_FMT)
+    idx=wp_schedule.open_index(session, WP_URL, auth, VERIFY_TLS)
+    if idx:
+        occupied=idx.occupied(now_gmt, categories=[cat_id])
+    else:
+        occupied=wp_schedule.fetch_occupied(session, WP_URL, auth, VERIFY_TLS,
+                                            after_gmt=now_gmt, categories=[cat_id])
+    btn_url = WP_URL or "#"
+
+    todo=[]  # (kst, gmt, title, payload, kw)
+    for kst, gmt in wp_schedule.plan_slots(SLOTS, days):
+        if gmt in occupied:
+            print(f"[DIARY] PLAN skip {kst}: already scheduled"); continue
+        if len(todo) >= len(pool):
+            print(f"[DIARY] PLAN stop at {kst}: keyword pool exhausted ({len(pool)})"); break
+        i = SLOTS.index(int(kst[11:13]))
+        kw = pool[len(todo)]
+        tt = TITLE_FMT[i].format(kw=kw)
+        body = _ensure_min_chars(_build_diary_html(tt, HIGHLIGHTS[i], btn_url), 1500)
+        todo.append((kst, gmt, tt, _payload(tt, body, gmt, cat_id), kw))
+    if not todo:
+        print("[DIARY] PLAN: nothing to schedule"); return []
+
+    results=wp_schedule.publish_many(session, WP_URL, auth, [t[3] for t in todo], VERIFY_TLS)
+    if idx:
+        idx.record_many(results); idx.close()
+    used=[]
+    for (kst, _, tt, _, kw), res in zip(todo, results):
+        if res.get("error"):
+            print(f"[DIARY] PLAN fail {kst} '{tt}': {res['error']}"); continue
+        print(json.dumps({"id":res.get("id"),"title":tt,"slot_kst":kst,"date_gmt":res.get("date_gmt")}, ensure_ascii=False))
+        used.append(kw)
+    # 발행에 성공한 키워드만 꼬리로 (실패한 키워드는 머리에 남아 다음 실행에서 다시 배정)
+    if rotate:
+        _rotate_used(KEYWORDS_CSV, used)
+    return used
+
 # ===== 메인 =====
-def main(mode: str="two-posts"):
+def main(mode: str="two-posts", plan_days: int=1):
     if not (WP_URL and WP_USER and WP_APP_PASSWORD):
         raise RuntimeError("WP_URL/WP_USER/WP_APP_PASSWORD 필요")
 
-    # 키워드 2개 뽑기
-    pool=_read_col_csv(KEYWORDS_CSV)
-    kw1 = pool[0] if len(pool)>=1 else "프로젝트 회고"
-    kw2 = pool[1] if len(pool)>=2 else "작은 습관"
+    if plan_days > 1:
+        run_plan(plan_days)
+        return
+
+    # 키워드 2개 뽑기 (queue 모드: 대여, 발행 후 ack)
+    leases=_lease_pool(2)
+    pool=[l.keyword for l in leases] if leases is not None else _read_pool(KEYWORDS_CSV)
+    kw1 = pool[0] if len(pool)>=1 else FALLBACK_KWS[0]
+    kw2 = pool[1] if len(pool)>=2 else FALLBACK_KWS[1]
 
     titles=[
-        f"{kw1} 정리 메모",
-        f"{kw2} 회고 점검 노트",
-    ]
-    highlights=[
-        ["가장 좋았던 선택 1가지","의외의 장애물 1가지","내일 반복할 한 가지"],
-        ["에너지를 높인 순간 1가지","실패에서 배운 것 1가지","다음 개선 1가지"],
+        TITLE_FMT[0].format(kw=kw1),
+        TITLE_FMT[1].format(kw=kw2),
     ]
+    highlights=HIGHLIGHTS
     btn_url = WP_URL or "#"
 
-    # 사용한 2개 회전
-    if len(pool)>=2:
-        _write_rotated(KEYWORDS_CSV, pool, 2)
-    elif len(pool)==1:
-        _write_rotated(KEYWORDS_CSV, pool, 1)
+    # 사용한 2개 회전 (queue 모드는 발행 후 ack로 대신함)
+    if leases is None and pool:
+        _write_rotated(KEYWORDS_CSV, pool, min(2, len(pool)))
+
+    shared_css.ensure_published(wp_schedule.make_session(REQ_HEADERS), WP_URL, (WP_USER,WP_APP_PASSWORD), VERIFY_TLS)
 
     # 10시 / 17시
-    slots=[10,17]
-    for i,(hh,tt,hl) in enumerate(zip(slots, titles, highlights)):
-        html_body=_build_diary_html(tt, hl, btn_url)
-        html_body=_ensure_min_chars(html_body, 1500)
-        when=_slot_to_utc(hh)
-        res=_post_wp(tt, html_body, when, DEFAULT_CATEGORY)
-        print(json.dumps({"id":res.get("id"),"title":tt,"date_gmt":res.get("date_gmt")}, ensure_ascii=False))
+    posted=[]
+    try:
+        for i,(hh,tt,hl,kw) in enumerate(zip(SLOTS, titles, highlights, (kw1, kw2))):
+            html_body=_build_diary_html(tt, hl, btn_url)
+            html_body=_ensure_min_chars(html_body, 1500)
+            when=_slot_to_utc(hh)
+            res=_post_wp(tt, html_body, when, DEFAULT_CATEGORY)
+            print(json.dumps({"id":res.get("id"),"title":tt,"date_gmt":res.get("date_gmt")}, ensure_ascii=False))
+            posted.append(kw)
+    finally:
+        if leases is not None:
+            kw_queue.settle(leases, posted)
 
 if __name__=="__main__":
     import sys
     mode=sys.argv[sys.argv.index("--mode")+1] if "--mode" in sys.argv else "two-posts"
-    main(mode)
+    days=int(sys.argv[sys.argv.index("--plan-days")+1]) if "--plan-days" in sys.argv else wp_schedule.PLAN_DAYS
+    main(mode, days)
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""
+bench_render.py — 기사 빌더 렌더링 벤치마크 (커밋 간 비교용 JSON)
+- 대상: affiliate_post._render_article / rich_templates.build_affiliate_content / auto_wp_gpt._build_diary_html
+- 케이스: short(짧은 키워드·요약) / long(긴 제목·요약 → 본문이 길어 보강 분기도 달라짐)
+- 측정: 호출당 지연(mean/p50/p95, µs), 호출당 임시 할당 피크(tracemalloc), 출력 크기(bytes)
+- 결과: JSON(커밋 해시/파이썬 버전 포함). --compare 이전 결과와의 증감(%) 출력
+
+사용:
+    python bench_render.py --iters 2000 --out .cache/bench_render.json
+    python bench_render.py --compare .cache/bench_render.prev.json
+"""
+
+from __future__ import annotations
+import os, sys, json, time, platform, subprocess, statistics, tracemalloc, argparse
+from typing import Callable, Dict
+
+def _commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL,
+                                       text=True).strip()
+    except Exception:
+        return ""
+
+def _cases() -> Dict[str, Callable[[], str]]:
+    import affiliate_post, rich_templates, auto_wp_gpt
+
+    url = affiliate_post.coupang_search_url("휴대용 텀블러")
+    btn = affiliate_post._get_button_html(url)
+    short = {"title": "텀블러", "summary": "가볍고 보온이 좋은 텀블러."}
+    long_kw = "대용량 저소음 프리미엄 가열식 가습기 스탠드형 " * 4
+    long = {"title": long_kw.strip(), "summary": ("세척이 쉽고 소음이 적어 침실에서도 쓰기 좋습니다. " * 60).strip()}
+    hl_short = auto_wp_gpt.HIGHLIGHTS[0]
+    hl_long = [("긴 하이라이트 문장 " * 30).strip()] * 3
+
+    return {
+        "affiliate/short": lambda: affiliate_post._render_article(short, url),
+        "affiliate/long": lambda: affiliate_post._render_article(long, url),
+        "rich/short": lambda: rich_templates.build_affiliate_content(short, btn, "고지", "[ads_top]"),
+        "rich/long": lambda: rich_templates.build_affiliate_content(long, btn, "고지 " * 40, "[ads_top]",
+                                                                    "https://example.com/thumb.jpg"),
+        "diary/short": lambda: auto_wp_gpt._ensure_min_chars(
+            auto_wp_gpt._build_diary_html("텀블러 정리 메모", hl_short, "https://example.com"), 1500),
+        "diary/long": lambda: auto_wp_gpt._ensure_min_chars(
+            auto_wp_gpt._build_diary_html(long_kw + "정리 메모", hl_long, "https://example.com"), 1500),
+    }
+
+def _bench(fn: Callable[[], str], iters: int, warmup: int) -> Dict:
+    for _ in range(warmup):
+        fn()
+    lat = []
+    for _ in range(iters):
+        t0 = time.perf_counter_ns()
+        fn()
+        lat.append(time.perf_counter_ns() - t0)
+
+    # 할당은 별도 패스에서(추적 오버헤드가 지연 측정에 섞이지 않도록): 호출마다 피크 - 호출 전 사용량
+    n_alloc = max(1, min(iters, 200))
+    peaks = []
+    tracemalloc.start()
+    for _ in range(n_alloc):
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        out = fn()
+        _, peak = tracemalloc.get_traced_memory()
+        peaks.append(peak - before)
+        del out
+    out = fn()
+    tracemalloc.stop()
+
+    lat.sort()
+    return {
+        "iters": iters,
+        "mean_us": round(statistics.fmean(lat) / 1000, 3),
+        "p50_us": round(lat[len(lat) // 2] / 1000, 3),
+        "p95_us": round(lat[min(len(lat) - 1, int(len(lat) * 0.95))] / 1000, 3),
+        "alloc_peak_bytes": round(statistics.fmean(peaks)),
+        "alloc_peak_max_bytes": max(peaks),
+        "output_bytes": len(out.encode("utf-8")),
+    }
+
+def _compare(cur: Dict, prev_path: str):
+    with open(prev_path, "r", encoding="utf-8") as f:
+        prev = json.load(f)
+    print(f"\n[compare] {prev.get('commit') or '?'} → {cur.get('commit') or '?'}")
+    for case, r in cur["results"].items():
+        p = (prev.get("results") or {}).get(case)
+        if not p:
+            print(f"  {case:18s} (new)"); continue
+        cells = []
+        for k in ("mean_us", "alloc_peak_bytes", "output_bytes"):
+            d = (r[k] - p[k]) * 100.0 / p[k] if p.get(k) else 0.0
+            cells.append(f"{k}={r[k]} ({d:+.1f}%)")
+        print(f"  {case:18s} " + "  ".join(cells))
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark article renderers")
+    ap.add_argument("--iters", type=int, default=2000)
+    ap.add_argument("--warmup", type=int, default=100)
+    ap.add_argument("--only", default="", help="케이스 이름 부분 일치 필터 (예: diary)")
+    ap.add_argument("--out", default=os.path.join(os.getenv("CACHE_DIR", ".cache"), "bench_render.json"))
+    ap.add_argument("--compare", default="", help="비교할 이전 결과 JSON")
+    args = ap.parse_args()
+
+    results = {}
+    for name, fn in _cases().items():
+        if args.only and args.only not in name:
+            continue
+        results[name] = _bench(fn, args.iters, args.warmup)
+        r = results[name]
+        print(f"{name:18s} mean={r['mean_us']:8.2f}µs p95={r['p95_us']:8.2f}µs "
+              f"alloc={r['alloc_peak_bytes']:7d}B out={r['output_bytes']:6d}B")
+
+    doc = {
+        "commit": _commit(),
+        "python": platform.python_version(),
+        "ts": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "iters": args.iters,
+        "results": results,
+    }
+    os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(doc, f, ensure_ascii=False, indent=1)
+    print(f"[bench_render] → {args.out}")
+    if args.compare:
+        _compare(doc, args.compare)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+"""
+bloom.py — 디스크 상주(mmap) Bloom 필터: 수년치 사용 키워드의 '확실히 안 씀' 판정
+- 파일 = 64바이트 헤더(비트 수/해시 수/용량/건수/원본 로그 읽은 위치) + 비트 배열, mmap으로 열어 메모리에 올리지 않음
+- refresh(log_path): .usage/used_*.txt 를 지난번 위치부터만 읽어 비트 추가 (파일 교체/축소 시 처음부터 다시)
+- 용량(건수)을 넘으면 오탐률 유지를 위해 2배 크기로 전체 재빌드
+- Guarded(bloom, exact): 필터가 '있음'일 때만 exact(used_store 뷰 등)로 확인 → 결과는 exact와 동일
+- 밴은 부분문자열 매칭이라 Bloom(완전 일치)에 넣지 않음: aho_matcher 오토마톤이 그대로 담당
+
+Env:
+    USED_BLOOM       (default: 0)  1이면 update_keywords가 사용 여부 검사 앞단에 필터를 둠
+                                   USED_STORE=sqlite 에서만 사용 (text 모드는 어차피 전체 set을 만듦)
+    USED_BLOOM_CAP   (default: 1000000)
+    USED_BLOOM_FP    (default: 0.001)
+"""
+
+from __future__ import annotations
+import os, math, mmap, struct, hashlib
+from typing import Iterable, Optional
+
+from used_store import _parse_line
+
+USED_BLOOM = (os.getenv("USED_BLOOM") or "0").strip().lower() in ("1", "true", "yes", "on")
+USED_BLOOM_CAP = int(os.getenv("USED_BLOOM_CAP") or "1000000")
+USED_BLOOM_FP = float(os.getenv("USED_BLOOM_FP") or "0.001")
+
+_MAGIC = b"BLM1"
+_HDR = struct.Struct("<4sQIQQQ16s")  # magic, m_bits, k, capacity, count, src_offset, src_head
+_HDR_SIZE = 64
+
+def _size(capacity: int, fp: float):
+    m = max(64, int(math.ceil(-capacity * math.log(fp) / (math.log(2) ** 2))))
+    m = (m + 7) // 8 * 8
+    k = max(1, int(round(m / capacity * math.log(2))))
+    return m, k
+
+def _head_sig(line: bytes) -> bytes:
+    return hashlib.blake2b(line, digest_size=16).digest()
+
+class BloomFilter:
+    def __init__(self, path: str, capacity: int = USED_BLOOM_CAP, fp: float = USED_BLOOM_FP):
+        self.path, self.fp, self._cap = path, fp, capacity
+        if not os.path.exists(path):
+            self._create(capacity)
+        self._open()
+
+    def _create(self, capacity: int):
+        m, k = _size(capacity, self.fp)
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, "wb") as f:
+            f.write(_HDR.pack(_MAGIC, m, k, capacity, 0, 0, b"\0" * 16).ljust(_HDR_SIZE, b"\0"))
+            f.truncate(_HDR_SIZE + m // 8)
+
+    def _open(self):
+        self._f = open(self.path, "r+b")
+        self._mm = mmap.mmap(self._f.fileno(), 0) if os.path.getsize(self.path) >= _HDR_SIZE else None
+        if self._mm is not None:
+            magic, self.m, self.k, self.capacity, self.count, self.src_offset, self.src_head = \
+                _HDR.unpack_from(self._mm, 0)
+        if self._mm is None or magic != _MAGIC or len(self._mm) != _HDR_SIZE + self.m // 8:
+            self.close()
+            os.remove(self.path)
+            self._create(self._cap)
+            self._open()
+
+    def close(self):
+        try:
+            if self._mm is not None: self._mm.close()
+            self._f.close()
+        except Exception:
+            pass
+
+    def _flush_header(self):
+        _HDR.pack_into(self._mm, 0, _MAGIC, self.m, self.k, self.capacity, self.count,
+                       self.src_offset, self.src_head)
+        self._mm.flush()
+
+    def _positions(self, s: str):
+        d = hashlib.blake2b(s.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(d[:8], "little")
+        h2 = int.from_bytes(d[8:], "little") | 1
+        m = self.m
+        for i in range(self.k):
+            yield (h1 + i * h2) % m
+
+    def add(self, s: str):
+        mm, new = self._mm, False
+        for p in self._positions(s):
+            i = _HDR_SIZE + (p >> 3); bit = 1 << (p & 7)
+            b = mm[i]
+            if not b & bit:
+                mm[i] = b | bit; new = True
+        if new:
+            self.count += 1
+
+    def update(self, items: Iterable[str]):
+        for s in items:
+            self.add(s)
+        self._flush_header()
+
+    def __contains__(self, s: str) -> bool:
+        mm = self._mm
+        for p in self._positions(s):
+            if not mm[_HDR_SIZE + (p >> 3)] & (1 << (p & 7)):
+                return False
+        return True
+
+    def refresh(self, log_path: str) -> int:
+        """usage 로그(날짜\\t키워드)에서 새로 덧붙은 줄만 반영. 반환: 반영한 줄 수."""
+        if not os.path.exists(log_path):
+            return 0
+        size = os.path.getsize(log_path)
+        with open(log_path, "rb") as f:
+            head = _head_sig(f.readline()[:200])
+            offset = self.src_offset
+            if size < offset or (offset and head != self.src_head):
+                self._reset(self.capacity)
+                offset = 0
+            f.seek(offset)
+            chunk = f.read()
+        end = chunk.rfind(b"\n") + 1
+        n = 0
+        for ln in chunk[:end].decode("utf-8", "ignore").splitlines():
+            p = _parse_line(ln)
+            if p:
+                self.add(p[1]); n += 1
+        self.src_offset, self.src_head = offset + end, head
+        self._flush_header()
+        if self.count > self.capacity:
+            # 용량 초과 → 오탐률이 급격히 오르므로 2배로 다시 빌드
+            self._reset(self.capacity * 2)
+            return self.refresh(log_path)
+        return n
+
+    def _reset(self, capacity: int):
+        self.close()
+        os.remove(self.path)
+        self._create(capacity)
+        self._open()
+
+class Guarded:
+    """`kw in guarded` — Bloom 음성이면 즉시 False, 양성이면 exact로 확정."""
+    __slots__ = ("bloom", "exact")
+
+    def __init__(self, bloom: BloomFilter, exact):
+        self.bloom, self.exact = bloom, exact
+
+    def __contains__(self, kw: str) -> bool:
+        kw = (kw or "").strip()
+        return kw in self.bloom and kw in self.exact
+
+def for_log(kind: str, log_path: str, cache_dir: Optional[str] = None) -> BloomFilter:
+    d = cache_dir or os.getenv("CACHE_DIR", ".cache")
+    bf = BloomFilter(os.path.join(d, f"used_{kind}.bloom"))
+    n = bf.refresh(log_path)
+    if n:
+        print(f"[BLOOM] {kind}: +{n} lines (count={bf.count}, m={bf.m}, k={bf.k})")
+    return bf
@@ -5,14 +5,40 @@ build_products_seed.py
 - REQUIRE_COUPANG_API=1 이고 키/채널 설정이 있으면 coupang_api.deeplink_for_query()로 딥링크 생성
 - 실패 시 Coupang 검색 URL로 폴백하여 행을 채워, 이후 단계가 끊기지 않게 보장
 - 출력 스키마: product_name,raw_url,pros,cons,keyword,title,url,image
+- 파이프라인: 키워드 → 제한된 워커 풀(SEED_WORKERS, 초당 SEED_RPS)에서 coupang_search.search_products(캐시)
+  → 상품명/이미지/가격으로 pros·cons·image 채움 → MAX_BATCH(50)개씩 모아 coupang_deeplink.create_deeplinks 일괄 변환(URL별 캐시)
+  → 단일 CSV writer로 순서대로 기록 (행마다 파일을 다시 열지 않음)
+- 키가 없거나 검색이 실패한 키워드는 기존처럼 검색 URL 1행으로 채움
+- 증분 모드(SEED_INCREMENTAL=1): .usage/seed_state.jsonl(키워드당 1줄: sig, ts, rows, dead)을 읽어
+  키워드·소스 설정(sig)이 같고 SEED_REUSE_TTL 안인 행은 그대로 재사용, 새/만료 키워드만 다시 조회
+  → 빠진 키워드는 삭제 대신 dead(툼스톤) 표시 후 TTL 동안 보관(다시 들어오면 재사용), TTL 지나면 정리
+  → 검색 실패로 폴백된 행은 재사용하지 않고 다음 실행에서 다시 시도
+- SEED_STORE=sqlite: 같은 행을 seed_store(키워드 색인 SQLite)에도 한 번에 교체 기록
+
+Env:
+    SEED_WORKERS (default: 4)   동시 검색 수
+    SEED_RPS     (default: 4)   초당 API 요청 상한 (0=무제한)
+    SEED_PER_KEYWORD (default: 1)  키워드당 상품 행 수
+    SEED_CACHE_TTL   (default: 86400)  검색 결과 캐시 초 / 딥링크 캐시는 7일
+    SEED_INCREMENTAL (default: 0)  1이면 증분 빌드
+    SEED_REUSE_TTL   (default: 259200)  증분 빌드에서 행 재사용 기간(초)
+    SEED_STATE       (default: .usage/seed_state.jsonl)
 """
 
 from __future__ import annotations
-import os, csv, sys, html, traceback
-from typing import List, Optional
+import os, csv, sys, json, time, html, hashlib, tempfile, threading, traceback
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from statistics import median
+from typing import Dict, List, Optional
 from dotenv import load_dotenv
 
+# 아래 헬퍼 모듈들이 import 시점에 env를 읽으므로 .env를 먼저 로드
 load_dotenv()
+from utils_cache import cached_call
+from coupang_api import coupang_search_url
+from coupang_deeplink import MAX_BATCH, create_deeplinks
+import seed_store
 
 # ===== ENV =====
 PRODUCTS_SEED_CSV = os.getenv("PRODUCTS_SEED_CSV", "products_seed.csv")
@@ -22,6 +48,22 @@ REQUIRE_COUPANG_API = (os.getenv("REQUIRE_COUPANG_API") or "0").strip().lower()
 COUNT = int(os.getenv("SEED_COUNT") or "12")  # 한 번에 뽑을 키워드 수 (원하면 .env에서 조정)
 COUPANG_DEBUG = (os.getenv("COUPANG_DEBUG") or "0").strip().lower() in ("1", "true", "yes", "on")
 
+SEED_WORKERS = max(1, int(os.getenv("SEED_WORKERS") or "4"))
+SEED_RPS = float(os.getenv("SEED_RPS") or "4")
+SEED_PER_KEYWORD = max(1, int(os.getenv("SEED_PER_KEYWORD") or "1"))
+SEED_CACHE_TTL = int(os.getenv("SEED_CACHE_TTL") or "86400")
+SEED_INCREMENTAL = (os.getenv("SEED_INCREMENTAL") or "0").strip().lower() in ("1", "true", "yes", "on")
+SEED_REUSE_TTL = int(os.getenv("SEED_REUSE_TTL") or "259200")
+SEED_STATE = os.getenv("SEED_STATE") or os.path.join(os.getenv("USAGE_DIR") or ".usage", "seed_state.jsonl")
+DEEPLINK_CACHE = os.path.join(os.getenv("CACHE_DIR", ".cache"), "deeplinks.json")
+DEEPLINK_TTL = 7 * 86400
+
+ACCESS_KEY = (os.getenv("COUPANG_ACCESS_KEY") or "").strip()
+SECRET_KEY = (os.getenv("COUPANG_SECRET_KEY") or "").strip()
+CHANNEL_ID = (os.getenv("COUPANG_CHANNEL_ID") or "").strip() or None
+SUBID_PREFIX = (os.getenv("COUPANG_SUBID_PREFIX") or "auto").strip()
+HEADER = ["product_name", "raw_url", "pros", "cons", "keyword", "title", "url", "image"]
+
 # ===== Optional import (API 사용 조건일 때만) =====
 DEEPLINK_AVAILABLE = False
 if REQUIRE_COUPANG_API:
@@ -30,6 +72,7 @@ if REQUIRE_COUPANG_API:
         DEEPLINK_AVAILABLE = True
     except Exception:
         DEEPLINK_AVAILABLE = False
+USE_API = REQUIRE_COUPANG_API and bool(ACCESS_KEY and SECRET_KEY)
 
 def _read_col_csv(path: str) -> List[str]:
     if not os.path.exists(path):
@@ -68,12 +111,158 @@ def _ensure_header(path: str):
     # 항상 헤더부터 씀(덮어쓰기). 다운스트림에서 헤더를 기대하므로 명시적으로 재작성.
     with open(path, "w", encoding="utf-8", newline="") as f:
         wr = csv.writer(f)
-        wr.writerow(["product_name", "raw_url", "pros", "cons", "keyword", "title", "url", "image"])
+        wr.writerow(HEADER)
 
-def _append_row(path: str, row: List[str]):
-    with open(path, "a", encoding="utf-8", newline="") as f:
-        wr = csv.writer(f)
-        wr.writerow(row)
+class _RateLimiter:
+    """스레드 공용 간격 제한: 호출 사이 최소 1/rps초."""
+    def __init__(self, rps: float):
+        self.gap = 1.0 / rps if rps > 0 else 0.0
+        self.lock = threading.Lock()
+        self.next_at = 0.0
+
+    def wait(self):
+        if not self.gap:
+            return
+        with self.lock:
+            now = time.monotonic()
+            at = max(now, self.next_at)
+            self.next_at = at + self.gap
+        if at > now:
+            time.sleep(at - now)
+
+_LIMIT = _RateLimiter(SEED_RPS)
+
+def _search(keyword: str, limit: int) -> List[Dict]:
+    from coupang_search import search_products
+    _LIMIT.wait()
+    return search_products(keyword, ACCESS_KEY, SECRET_KEY, limit=limit)
+
+def _price(p) -> Optional[float]:
+    try:
+        return float(str(p).replace(",", "")) if p not in (None, "") else None
+    except ValueError:
+        return None
+
+def _pros_cons(item: Dict, rank: int, mid: Optional[float]):
+    pros, cons = [], []
+    if item.get("category"):
+        pros.append(f"{item['category']} 카테고리")
+    pros.append(f"검색 상위 {rank}위")
+    price = _price(item.get("price"))
+    if price:
+        pros.append(f"약 {price:,.0f}원")
+        if mid and price <= mid * 0.9:
+            pros.append(f"같은 검색 중앙값보다 {100 - price * 100 / mid:.0f}% 저렴")
+        elif mid and price >= mid * 1.1:
+            cons.append(f"같은 검색 중앙값보다 {price * 100 / mid - 100:.0f}% 비쌈")
+    cons.append("옵션·판매자별 가격과 재고 확인 필요")
+    return " · ".join(pros), " · ".join(cons)
+
+def _fallback_row(kw: str) -> List[str]:
+    # 기존과 같은 행: 상품명=키워드, 원본 검색 URL. url 칸은 딥링크 원본(www 검색 URL)
+    return [kw, _coupang_search_url(kw), "", "", kw, kw, coupang_search_url(kw), ""]
+
+def _enrich(kw: str) -> List[List[str]]:
+    """워커: 키워드 1개 → 씨드 행들. url 칸에는 딥링크할 원본 URL을 넣고 일괄 딥링크 단계에서 교체."""
+    if not USE_API:
+        # 키가 없으면 기존 경로 그대로(딥링크 시도 → 검색 URL)
+        row = _fallback_row(kw)
+        row[6] = _safe_deeplink(kw)
+        return [row]
+    try:
+        items = cached_call(_search, ttl_sec=SEED_CACHE_TTL, namespace="coupang_search",
+                            keyword=kw, limit=max(5, SEED_PER_KEYWORD)) or []
+    except Exception as e:
+        if COUPANG_DEBUG:
+            print(f"[build_products_seed] search error '{kw}': {type(e).__name__}: {e}", file=sys.stderr)
+        items = []
+    if not items:
+        return [_fallback_row(kw)]
+    prices = [p for p in (_price(it.get("price")) for it in items) if p]
+    mid = median(prices) if prices else None
+    rows = []
+    for rank, it in enumerate(items[:SEED_PER_KEYWORD], start=1):
+        pros, cons = _pros_cons(it, rank, mid)
+        name = html.unescape(it["productName"]).strip()
+        url = it["productUrl"]
+        rows.append([name, url, pros, cons, kw, name, url, it.get("imageUrl") or ""])
+    return rows
+
+def _load_deeplink_cache() -> Dict[str, Dict]:
+    try:
+        with open(DEEPLINK_CACHE, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        now = time.time()
+        return {k: v for k, v in data.items() if now - float(v.get("ts", 0)) <= DEEPLINK_TTL}
+    except Exception:
+        return {}
+
+def _save_deeplink_cache(cache: Dict[str, Dict]):
+    d = os.path.dirname(DEEPLINK_CACHE) or "."
+    try:
+        os.makedirs(d, exist_ok=True)
+        with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=d, delete=False, suffix=".tmp") as tmp:
+            json.dump(cache, tmp, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp.name, DEEPLINK_CACHE)
+    except Exception:
+        pass
+
+def _deeplink_rows(rows: List[List[str]], cache: Dict[str, Dict]):
+    """url 칸(원본 URL)을 딥링크로 교체: 캐시 → 나머지는 create_deeplinks 1회(최대 MAX_BATCH) → 실패 시 raw_url."""
+    if not USE_API:
+        return
+    # 검색 API의 productUrl은 이미 파트너스 링크(link.coupang.com)라 그대로 둠
+    todo = [r[6] for r in rows if "link.coupang.com" not in r[6] and r[6] not in cache]
+    if todo:
+        try:
+            _LIMIT.wait()
+            got = create_deeplinks(todo, ACCESS_KEY, SECRET_KEY, sub_id=f"{SUBID_PREFIX}-seed",
+                                   channel_id=CHANNEL_ID)
+            now = time.time()
+            cache.update({u: {"url": d, "ts": now} for u, d in got.items() if d})
+        except Exception as e:
+            print(f"[build_products_seed] deeplink batch fallback ({len(todo)}): {type(e).__name__}: {e}",
+                  file=sys.stderr)
+    for r in rows:
+        if "link.coupang.com" not in r[6]:
+            hit = cache.get(r[6])
+            r[6] = hit["url"] if hit else r[1]
+
+def _source_sig() -> str:
+    """행을 만든 소스 설정의 해시: 바뀌면(키 추가, 행 수 변경 등) 저장된 행을 재사용하지 않음."""
+    raw = json.dumps([USE_API, SEED_PER_KEYWORD, CHANNEL_ID, SUBID_PREFIX, HEADER])
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:12]
+
+def _load_state(path: str) -> Dict[str, Dict]:
+    out: Dict[str, Dict] = {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            for ln in f:
+                try:
+                    e = json.loads(ln)
+                    out[e["keyword"]] = e
+                except (ValueError, KeyError, TypeError):
+                    continue
+    except FileNotFoundError:
+        pass
+    return out
+
+def _save_state(path: str, state: Dict[str, Dict]):
+    d = os.path.dirname(path) or "."
+    os.makedirs(d, exist_ok=True)
+    with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=d, delete=False, suffix=".tmp") as tmp:
+        for kw in sorted(state):
+            tmp.write(json.dumps(state[kw], ensure_ascii=False, sort_keys=True) + "\n")
+    os.replace(tmp.name, path)
+
+def _reusable(e: Optional[Dict], sig: str, now: float) -> bool:
+    return bool(e and e.get("rows") and e.get("sig") == sig and not e.get("retry")
+                and now - float(e.get("ts") or 0) <= SEED_REUSE_TTL)
+
+def _done(rows: List[List[str]]) -> Future:
+    f: Future = Future()
+    f.set_result(rows)
+    return f
 
 def main():
     pool = _read_col_csv(P_GOLD)
@@ -86,27 +275,73 @@ def main():
     # 뽑을 수 만큼 슬라이스(맨 위부터)
     picks = pool[:max(1, COUNT)]
 
-    _ensure_header(PRODUCTS_SEED_CSV)
+    t0 = time.perf_counter()
+    cache = _load_deeplink_cache()
     inserted = 0
+    written: List[List[str]] = []
+    now, sig = time.time(), _source_sig()
+    state = _load_state(SEED_STATE) if SEED_INCREMENTAL else {}
+    reused = set(kw for kw in picks if _reusable(state.get(kw), sig, now))
 
-    for kw in picks:
-        # 우선 딥링크 → 실패 시 검색 URL
-        url = _safe_deeplink(kw)
-
-        # seed CSV 스키마에 맞춰 채우기
-        product_name = kw
-        raw_url = _coupang_search_url(kw)  # 원본 검색 URL(딥링크 전)
-        pros = ""   # 나중에 풍부화 가능
-        cons = ""   # 나중에 풍부화 가능
-        title = kw  # 기본 타이틀(본문 단계에서 대체됨)
-        image = ""  # 이미지 선택 로직이 없으므로 빈칸
+    def submit(kw):
+        # 재사용 행은 이미 딥링크까지 끝난 상태 → 완료된 Future로 같은 순서 파이프라인에 태움
+        if kw in reused:
+            return kw, False, _done([list(r) for r in state[kw]["rows"]])
+        return kw, True, ex.submit(_enrich, kw)
 
-        _append_row(PRODUCTS_SEED_CSV, [
-            product_name, raw_url, pros, cons, kw, title, url, image
-        ])
-        inserted += 1
+    with open(PRODUCTS_SEED_CSV, "w", encoding="utf-8", newline="") as f, \
+            ThreadPoolExecutor(max_workers=SEED_WORKERS) as ex:
+        wr = csv.writer(f)
+        wr.writerow(HEADER)
+        # 진행 중 작업을 워커 수 x2로 제한하고, 완료는 키워드 순서대로 소비 → 출력 순서 결정적
+        it = iter(picks)
+        pending = deque(submit(kw) for _, kw in zip(range(SEED_WORKERS * 2), it))
+        buf: List[tuple] = []  # (keyword, fresh, row)
+        while pending:
+            kw, fresh, fut = pending.popleft()
+            buf.extend((kw, fresh, r) for r in fut.result())
+            nxt = next(it, None)
+            if nxt is not None:
+                pending.append(submit(nxt))
+            while buf and (len(buf) >= MAX_BATCH or not pending):
+                chunk, buf = buf[:MAX_BATCH], buf[MAX_BATCH:]
+                _deeplink_rows([r for _, fresh, r in chunk if fresh], cache)
+                for kw, fresh, r in chunk:
+                    if fresh:
+                        e = state.setdefault(kw, {"keyword": kw, "rows": []})
+                        if e.get("ts") != now:
+                            e.update(rows=[], ts=now, sig=sig, dead=None,
+                                     retry=USE_API and not r[2])  # 검색 폴백 행 → 다음에 재시도
+                        e["rows"].append(r)
+                wr.writerows(r for _, _, r in chunk)
+                if seed_store.enabled():
+                    written.extend(r for _, _, r in chunk)
+                inserted += len(chunk)
+    if USE_API:
+        _save_deeplink_cache(cache)
+    if seed_store.enabled():
+        st = seed_store.SeedStore()
+        try:
+            print(f"[build_products_seed] seed_store: {st.replace(written)} rows -> {seed_store.SEED_STORE_DB}")
+        finally:
+            st.close()
+    if SEED_INCREMENTAL:
+        # 빠진 키워드는 툼스톤(dead) → 재사용 기간이 지나면 정리
+        picked = set(picks)
+        for kw in list(state):
+            e = state[kw]
+            if kw in picked:
+                e["dead"] = None
+            elif now - float(e.get("ts") or 0) > SEED_REUSE_TTL:
+                del state[kw]
+            elif not e.get("dead"):
+                e["dead"] = now
+        _save_state(SEED_STATE, state)
+        print(f"[build_products_seed] incremental: reused {len(reused)}/{len(picks)} keywords, "
+              f"resolved {len(picks) - len(reused)}, tombstones {sum(1 for e in state.values() if e.get('dead'))}")
 
-    print(f"[build_products_seed] OK: {inserted} rows -> {PRODUCTS_SEED_CSV}")
+    print(f"[build_products_seed] OK: {inserted} rows ({len(picks)} keywords, workers={SEED_WORKERS}) "
+          f"-> {PRODUCTS_SEED_CSV} in {time.perf_counter() - t0:.2f}s")
 
 if __name__ == "__main__":
     try:
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""
+bulk_render.py — 키워드 풀 전체를 오프라인으로 렌더링해 미리보기 HTML로 저장 (발행 없음)
+- 입력: golden_shopping_keywords.csv 등 1열 키워드 CSV (헤더 keyword/title 자동 건너뜀)
+- 키워드마다 3종 렌더링:
+    affiliate.html  affiliate_post._render_article
+    rich.html       rich_templates.build_affiliate_content
+    diary.html      auto_wp_gpt._build_diary_html (+ _ensure_min_chars)
+- ProcessPoolExecutor로 키워드 청크를 병렬 처리, 링크는 네트워크 없이 쿠팡 검색 URL 사용
+- 출력: <out>/<번호>_<키워드>/*.html + <out>/summary.json (건수, 종류별 평균 ms/바이트, 전체 시간)
+
+사용:
+    python bulk_render.py --input golden_shopping_keywords.csv --out .cache/preview --workers 4
+"""
+
+from __future__ import annotations
+import os, re, json, time, argparse
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple
+
+KINDS = ("affiliate", "rich", "diary")
+
+def _safe_name(s: str) -> str:
+    return re.sub(r"[^\w가-힣-]+", "_", s).strip("_")[:60] or "kw"
+
+def _render_chunk(args: Tuple[List[Tuple[int, str]], str, bool]) -> List[Dict]:
+    """워커: (번호, 키워드) 묶음을 렌더링해 파일로 저장하고 키워드별 측정값을 돌려준다."""
+    items, out_dir, minify = args
+    import affiliate_post, rich_templates, auto_wp_gpt, html_minify
+
+    stats: List[Dict] = []
+    for idx, kw in items:
+        url = affiliate_post.coupang_search_url(kw)
+        prod = affiliate_post._build_product_skeleton(kw)
+        renders = {
+            "affiliate": lambda: affiliate_post._render_article(prod, url),
+            "rich": lambda: rich_templates.build_affiliate_content(
+                prod, affiliate_post._get_button_html(url), affiliate_post.DISCLOSURE_TEXT, affiliate_post.AD_SHORTCODE),
+            "diary": lambda: auto_wp_gpt._ensure_min_chars(auto_wp_gpt._build_diary_html(
+                auto_wp_gpt.TITLE_FMT[0].format(kw=kw), auto_wp_gpt.HIGHLIGHTS[0], auto_wp_gpt.WP_URL or "#"), 1500),
+        }
+        d = os.path.join(out_dir, f"{idx:04d}_{_safe_name(kw)}")
+        os.makedirs(d, exist_ok=True)
+        rec: Dict = {"idx": idx, "keyword": kw}
+        for kind in KINDS:
+            t0 = time.perf_counter()
+            html = renders[kind]()
+            if minify:
+                html = html_minify.minify(html)
+            rec[f"{kind}_ms"] = (time.perf_counter() - t0) * 1000.0
+            data = html.encode("utf-8")
+            rec[f"{kind}_bytes"] = len(data)
+            with open(os.path.join(d, f"{kind}.html"), "wb") as f:
+                f.write(data)
+        stats.append(rec)
+    return stats
+
+def main():
+    ap = argparse.ArgumentParser(description="Render every keyword to preview HTML (no publishing)")
+    ap.add_argument("--input", default="golden_shopping_keywords.csv")
+    ap.add_argument("--out", default=os.path.join(os.getenv("CACHE_DIR", ".cache"), "preview"))
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    ap.add_argument("--chunk", type=int, default=50, help="워커당 한 번에 넘길 키워드 수")
+    ap.add_argument("--limit", type=int, default=0, help="앞에서 N개만 (0=전체)")
+    ap.add_argument("--minify", action="store_true", help="html_minify 적용 후 저장")
+    args = ap.parse_args()
+
+    from affiliate_post import _read_col_csv
+    pool = _read_col_csv(args.input)
+    if args.limit > 0:
+        pool = pool[:args.limit]
+    if not pool:
+        print(f"[bulk_render] no keywords in {args.input}")
+        return 0
+
+    os.makedirs(args.out, exist_ok=True)
+    numbered = list(enumerate(pool, start=1))
+    chunks = [(numbered[i:i + args.chunk], args.out, args.minify) for i in range(0, len(numbered), max(1, args.chunk))]
+
+    t0 = time.perf_counter()
+    rows: List[Dict] = []
+    with ProcessPoolExecutor(max_workers=max(1, args.workers)) as ex:
+        for part in ex.map(_render_chunk, chunks):
+            rows.extend(part)
+    wall = time.perf_counter() - t0
+
+    rows.sort(key=lambda r: r["idx"])
+    summary = {
+        "input": args.input,
+        "keywords": len(rows),
+        "workers": args.workers,
+        "minify": args.minify,
+        "wall_sec": round(wall, 3),
+        "articles_per_sec": round(len(rows) * len(KINDS) / wall, 1) if wall else None,
+        "kinds": {
+            k: {
+                "avg_ms": round(sum(r[f"{k}_ms"] for r in rows) / len(rows), 3),
+                "avg_bytes": round(sum(r[f"{k}_bytes"] for r in rows) / len(rows)),
+            } for k in KINDS
+        },
+        "rows": rows,
+    }
+    with open(os.path.join(args.out, "summary.json"), "w", encoding="utf-8") as f:
+        json.dump(summary, f, ensure_ascii=False, indent=1)
+    print(f"[bulk_render] {len(rows)} keywords × {len(KINDS)} → {args.out} "
+          f"({wall:.2f}s, {summary['articles_per_sec']} articles/s)")
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+html_minify.py — 발행 직전 본문 HTML 경량화 (공백 안전)
+- 블록 요소 경계의 '공백만 있는' 구간(줄바꿈+들여쓰기)만 제거 → 인라인 요소 사이 공백은 그대로
+- 텍스트 노드는 한 글자도 건드리지 않음 (숏코드 [..], 문단 안 줄바꿈 포함)
+- <pre>/<textarea>/<script>와 HTML 주석(<!-- wp:block ... --> 포함)은 원문 그대로 보존
+- <style> 내용은 주석/공백/마지막 세미콜론 제거
+- MINIFY_HTML=1 일 때 maybe_minify()가 동작하고 절감 바이트를 로그로 남김
+
+사용:
+    out, saved = minify_report(html)
+    content = maybe_minify(content, label="affiliate")
+"""
+
+from __future__ import annotations
+import os, re
+from typing import List, Tuple
+
+MINIFY_HTML = (os.getenv("MINIFY_HTML") or "0").strip().lower() in ("1", "true", "yes", "on")
+
+_BLOCK = frozenset("""
+address article aside blockquote body caption col colgroup details dialog dd div dl dt fieldset figcaption
+figure footer form h1 h2 h3 h4 h5 h6 head header hr html li link main meta nav ol option p pre section
+style script summary table tbody td tfoot th thead title tr ul
+""".split())
+
+# 보존 구간(원문 유지) | style 블록 | 주석 | 태그
+_TOKEN = re.compile(
+    r"(?P<raw><(?P<rt>pre|textarea|script)\b[^>]*>.*?</(?P=rt)\s*>)"
+    r"|(?P<style><style\b[^>]*>)(?P<css>.*?)(?P<endstyle></style\s*>)"
+    r"|(?P<comment><!--.*?-->)"
+    r"|(?P<tag></?[A-Za-z][^>]*>)",
+    re.S | re.I,
+)
+_TAGNAME = re.compile(r"</?\s*([A-Za-z][\w-]*)")
+
+def _is_block(tok: str) -> bool:
+    if tok.startswith("<!--"):
+        return True  # 블록 주석(wp:block 등)은 경계로 취급
+    m = _TAGNAME.match(tok)
+    return bool(m and m.group(1).lower() in _BLOCK)
+
+def minify_css(css: str) -> str:
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};,>])\s*", r"\1", css)
+    # 선언부의 ':' 주변만 정리 (선택자의 ' :hover' 같은 의미 있는 공백은 건드리지 않음)
+    css = re.sub(r"([{;][\w-]+)\s*:\s*", r"\1:", css)
+    css = css.replace(";}", "}")
+    return css.strip()
+
+def minify(html: str) -> str:
+    if not html:
+        return html or ""
+    # (종류, 문자열) 토큰열: kind ∈ {"text","tag","raw"}
+    toks: List[Tuple[str, str]] = []
+    pos = 0
+    for m in _TOKEN.finditer(html):
+        if m.start() > pos:
+            toks.append(("text", html[pos:m.start()]))
+        if m.group("style"):
+            toks.append(("raw", m.group("style") + minify_css(m.group("css")) + m.group("endstyle")))
+        else:
+            kind = "tag" if m.group("tag") else "raw"
+            toks.append((kind, m.group(0)))
+        pos = m.end()
+    if pos < len(html):
+        toks.append(("text", html[pos:]))
+
+    out: List[str] = []
+    n = len(toks)
+    for i, (kind, s) in enumerate(toks):
+        if kind == "text" and not s.strip():
+            prev = toks[i - 1][1] if i > 0 and toks[i - 1][0] != "text" else None
+            nxt = toks[i + 1][1] if i + 1 < n and toks[i + 1][0] != "text" else None
+            # 문서 양끝 또는 블록 경계의 공백만 제거
+            if prev is None or nxt is None or _is_block(prev) or _is_block(nxt):
+                continue
+        out.append(s)
+    return "".join(out)
+
+def minify_report(html: str) -> Tuple[str, int]:
+    out = minify(html)
+    return out, len((html or "").encode("utf-8")) - len(out.encode("utf-8"))
+
+def maybe_minify(html: str, label: str = "") -> str:
+    if not MINIFY_HTML:
+        return html
+    out, saved = minify_report(html)
+    before = len(html.encode("utf-8")) or 1
+    print(f"[MINIFY]{' ' + label if label else ''} -{saved} bytes ({saved * 100 / before:.1f}%)")
+    return out
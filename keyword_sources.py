@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+"""
+keyword_sources.py — 외부 키워드 소스 병렬 수집 (update_keywords 앞단)
+- KEYWORD_SOURCES: "종류=URL" 목록(쉼표 구분). 종류는 general | shopping (생략 시 shopping)
+    예) KEYWORD_SOURCES="shopping=https://example.com/trend.json,general=file:///data/general.txt"
+- 소스마다 utils_cache.cached_call(TTL)로 응답 캐시 → 같은 날 재실행은 네트워크 없이 끝남, 실패 시 스테일 캐시 사용
+- ThreadPoolExecutor(max_workers=--parallel)로 동시에 요청, 요청마다 타임아웃 → 전체 지연 ≈ 가장 느린 소스 1개
+- 응답 형식: JSON 배열(문자열 또는 {"keyword"|"title"|"query": ...}) / {"keywords": [...]} / 줄·쉼표 구분 텍스트
+- 소스가 없거나 전부 실패하면 빈 결과 → update_keywords가 내장 제너레이터로 채움
+- --serve: 테스트용 로컬 소스 서버 (/general, /shopping 에 JSON 배열 응답)
+
+Env:
+    KEYWORD_SOURCES          (default: 비어 있음 = 수집 안 함)
+    KEYWORD_SOURCES_TTL      (default: 21600)  응답 캐시 초
+    KEYWORD_SOURCES_TIMEOUT  (default: 5)      요청당 초
+    KEYWORD_SOURCES_MAX      (default: 200)    소스당 최대 키워드 수
+
+사용:
+    python keyword_sources.py --serve --port 8097 &
+    KEYWORD_SOURCES="shopping=http://127.0.0.1:8097/shopping" python update_keywords.py --parallel 8
+"""
+
+from __future__ import annotations
+import os, json, time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple
+from urllib.parse import urlparse, unquote
+
+import requests
+from utils_cache import cached_call
+
+KEYWORD_SOURCES = os.getenv("KEYWORD_SOURCES") or ""
+KEYWORD_SOURCES_TTL = int(os.getenv("KEYWORD_SOURCES_TTL") or "21600")
+KEYWORD_SOURCES_TIMEOUT = float(os.getenv("KEYWORD_SOURCES_TIMEOUT") or "5")
+KEYWORD_SOURCES_MAX = int(os.getenv("KEYWORD_SOURCES_MAX") or "200")
+KINDS = ("general", "shopping")
+
+def parse_sources(raw: str) -> List[Tuple[str, str]]:
+    out = []
+    for part in (raw or "").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        kind, sep, url = part.partition("=")
+        if not sep or kind.strip() not in KINDS:
+            kind, url = "shopping", part
+        out.append((kind.strip(), url.strip()))
+    return out
+
+def _parse(text: str) -> List[str]:
+    text = (text or "").strip()
+    items: list = []
+    if text[:1] in "[{":
+        try:
+            data = json.loads(text)
+            if isinstance(data, dict):
+                data = data.get("keywords") or data.get("items") or data.get("data") or []
+            for x in data if isinstance(data, list) else []:
+                if isinstance(x, dict):
+                    x = x.get("keyword") or x.get("title") or x.get("query") or ""
+                items.append(str(x))
+        except ValueError:
+            items = []
+    if not items:
+        for ln in text.splitlines():
+            items.extend(ln.split(","))
+    out, seen = [], set()
+    for x in items:
+        x = " ".join(x.split())
+        if x and x.lower() not in ("keyword", "title") and x not in seen:
+            seen.add(x); out.append(x)
+    return out[:KEYWORD_SOURCES_MAX]
+
+def _fetch(url: str) -> List[str]:
+    """소스 1개 → 키워드 목록. 실패는 예외로 (cached_call이 실패 결과를 캐시하지 않도록)."""
+    u = urlparse(url)
+    if u.scheme == "file":
+        with open(unquote(u.path), "r", encoding="utf-8", errors="ignore") as f:
+            return _parse(f.read())
+    r = requests.get(url, timeout=KEYWORD_SOURCES_TIMEOUT, headers={"User-Agent": "gpt-blog-auto/keyword-sources"})
+    r.raise_for_status()
+    return _parse(r.text)
+
+def _fetch_cached(url: str) -> List[str]:
+    try:
+        return cached_call(_fetch, ttl_sec=KEYWORD_SOURCES_TTL, namespace="kwsrc", url=url) or []
+    except Exception as e:
+        print(f"[SOURCES] fail {url}: {e}")
+        return []
+
+def fetch_all(parallel: int = 4, raw: str = KEYWORD_SOURCES) -> Dict[str, List[str]]:
+    """설정된 모든 소스를 동시에 수집 → {"general": [...], "shopping": [...]} (소스 순서 유지, 중복 제거)."""
+    out: Dict[str, List[str]] = {k: [] for k in KINDS}
+    srcs = parse_sources(raw)
+    if not srcs:
+        return out
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, min(parallel, len(srcs)))) as ex:
+        results = list(ex.map(lambda s: _fetch_cached(s[1]), srcs))
+    for (kind, _), kws in zip(srcs, results):
+        seen = set(out[kind])
+        out[kind].extend(k for k in kws if k not in seen and not seen.add(k))
+    print(f"[SOURCES] {len(srcs)} sources in {time.perf_counter() - t0:.2f}s → "
+          + ", ".join(f"{k}={len(v)}" for k, v in out.items()))
+    return out
+
+def serve(port: int = 8097, host: str = "127.0.0.1", path: str = ""):
+    """로컬 대역 소스: /general, /shopping → JSON 배열. path가 있으면 그 파일 내용을 둘 다로 응답."""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    import update_keywords as uk
+
+    if path:
+        with open(path, "r", encoding="utf-8", errors="ignore") as f:
+            fixed = _parse(f.read())
+        data = {"general": fixed, "shopping": fixed}
+    else:
+        data = {"general": [f"{b} 체크리스트" for b in uk.GENERAL_BASE],
+                "shopping": [f"{c} 추천" for c in uk.SHOP_CATEGORIES]}
+
+    class H(BaseHTTPRequestHandler):
+        def do_GET(self):
+            kind = self.path.strip("/").split("?")[0]
+            body = json.dumps(data.get(kind, []), ensure_ascii=False).encode("utf-8")
+            self.send_response(200 if kind in data else 404)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *a):
+            pass
+
+    print(f"[SOURCES] serving on http://{host}:{port}/general, /shopping")
+    ThreadingHTTPServer((host, port), H).serve_forever()
+
+if __name__ == "__main__":
+    import argparse
+    ap = argparse.ArgumentParser(description="Fetch keyword sources or serve a local stand-in")
+    ap.add_argument("--serve", action="store_true")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8097)
+    ap.add_argument("--file", default="", help="--serve: 이 파일의 키워드로 응답")
+    ap.add_argument("--parallel", type=int, default=4)
+    args = ap.parse_args()
+    if args.serve:
+        serve(args.port, args.host, args.file)
+    else:
+        print(json.dumps(fetch_all(args.parallel), ensure_ascii=False, indent=1))
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""
+kw_cursor.py — 키워드 CSV를 다시 쓰지 않는 회전 (커서 방식)
+- CSV는 그대로 두고 .usage/cursor_<파일명>.json 에 {offset, generation}만 저장
+- view(): 파일 순서를 offset만큼 회전한 목록 = 기존 '앞에서 k개 → 맨 뒤' 회전을 k번 한 결과와 동일
+- advance(): offset += k (mod 길이) → 사용 1회당 작은 JSON 1줄만 바뀜 (git diff 1줄)
+- generation = 키워드 목록 해시: update_keywords 등이 파일을 새로 쓰면 offset 0부터 다시
+
+Env:
+    ROTATE_MODE  (default: rewrite)  cursor 로 두면 affiliate_post / auto_wp_gpt / rotate_keywords 가 커서 사용
+"""
+
+from __future__ import annotations
+import os, json, hashlib, tempfile
+from datetime import datetime
+from typing import List
+
+ROTATE_MODE = (os.getenv("ROTATE_MODE") or "rewrite").strip().lower()
+USAGE_DIR = os.getenv("USAGE_DIR") or ".usage"
+
+def enabled() -> bool:
+    return ROTATE_MODE == "cursor"
+
+def _state_path(path: str) -> str:
+    return os.path.join(USAGE_DIR, f"cursor_{os.path.basename(path)}.json")
+
+def generation(items: List[str]) -> str:
+    return hashlib.sha1("\n".join(items).encode("utf-8")).hexdigest()[:16]
+
+def _load(path: str) -> dict:
+    try:
+        with open(_state_path(path), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return {}
+
+def offset(path: str, items: List[str]) -> int:
+    st = _load(path)
+    if not items or st.get("generation") != generation(items):
+        return 0
+    return int(st.get("offset") or 0) % len(items)
+
+def view(path: str, items: List[str]) -> List[str]:
+    """파일 원래 순서(items)를 현재 커서 위치부터 본 목록."""
+    k = offset(path, items)
+    return items[k:] + items[:k] if k else list(items)
+
+def advance(path: str, items: List[str], k: int = 1) -> int:
+    """k개 사용 → 커서 이동. 반환: 새 offset."""
+    if not items:
+        return 0
+    new = (offset(path, items) + k) % len(items)
+    st = {"file": os.path.basename(path), "generation": generation(items), "offset": new,
+          "size": len(items), "updated": datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ")}
+    sp = _state_path(path)
+    os.makedirs(os.path.dirname(sp) or ".", exist_ok=True)
+    with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=os.path.dirname(sp) or ".",
+                                     delete=False, suffix=".tmp") as tmp:
+        tmp.write(json.dumps(st, ensure_ascii=False) + "\n")
+    os.replace(tmp.name, sp)
+    return new
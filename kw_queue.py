@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+"""
+kw_queue.py — 포스터끼리 공유하는 키워드 큐 (SQLite, 원자적 lease/ack/nack)
+- lease(name, n): 머리에서 n개를 '대여' (BEGIN IMMEDIATE로 잠근 뒤 선택+표시 → 병렬 슬롯이 같은 키워드를 못 가져감)
+- ack(leases): 발행 성공 → 꼬리로 이동 (기존 '머리 → 꼬리' 회전과 같은 의미)
+- nack(leases): 실패/미사용 → 대여 해제, 제자리(머리)에 남음
+- 대여 만료(KW_QUEUE_LEASE_SEC): 실행이 죽어 ack/nack를 못 해도 만료 후 다시 대여 가능
+- enqueue_many(name, keywords): update_keywords가 새 목록으로 큐를 통째 교체 / 큐가 비어 있으면 lease가 CSV로 채움
+
+Env:
+    ROTATE_MODE        queue 면 affiliate_post / auto_wp_gpt 가 큐 사용 (kw_cursor 참고)
+    KW_QUEUE_DB        (default: .cache/kw_queue.sqlite3)  커밋되는 .usage/ 밖 — 비어 있으면 lease가 CSV로 다시 채움
+                       큐 모드는 CSV를 회전하지 않으므로 DB가 유지돼야 함: 상주 호스트 또는 CI의 .cache 캐시
+                       (autopost.yml). 캐시가 지워지면 CSV 머리부터 다시 시작
+    KW_QUEUE_LEASE_SEC (default: 900)
+"""
+
+from __future__ import annotations
+import os, time, uuid, sqlite3
+from typing import Callable, Iterable, List, NamedTuple, Optional
+
+KW_QUEUE_DB = os.getenv("KW_QUEUE_DB") or os.path.join(os.getenv("CACHE_DIR", ".cache"), "kw_queue.sqlite3")
+KW_QUEUE_LEASE_SEC = int(os.getenv("KW_QUEUE_LEASE_SEC") or "900")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS queue(
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL,
+    keyword TEXT NOT NULL,
+    pos INTEGER NOT NULL,
+    lease_until REAL,
+    token TEXT
+);
+CREATE INDEX IF NOT EXISTS ix_queue_name_pos ON queue(name, pos);
+"""
+
+ROTATE_MODE = (os.getenv("ROTATE_MODE") or "rewrite").strip().lower()
+
+def enabled() -> bool:
+    return ROTATE_MODE == "queue"
+
+def name_for(path: str) -> str:
+    """CSV 경로 → 큐 이름 (golden_shopping_keywords.csv → golden_shopping_keywords)."""
+    return os.path.splitext(os.path.basename(path))[0]
+
+class Lease(NamedTuple):
+    id: int
+    keyword: str
+    token: str
+
+class KeywordQueue:
+    def __init__(self, path: str = KW_QUEUE_DB):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        # isolation_level=None: 트랜잭션은 BEGIN IMMEDIATE로 직접 연다
+        self.db = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self.db.executescript(_SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def _tx(self):
+        self.db.execute("BEGIN IMMEDIATE")
+
+    def size(self, name: str) -> int:
+        return self.db.execute("SELECT COUNT(*) FROM queue WHERE name=?", (name,)).fetchone()[0]
+
+    def enqueue_many(self, name: str, keywords: Iterable[str], replace: bool = True) -> int:
+        """키워드를 순서대로 꼬리에 추가. replace=True면 기존 큐(대여 중 포함)를 비우고 새로 채움."""
+        kws = [k.strip() for k in keywords if k and k.strip()]
+        self._tx()
+        try:
+            if replace:
+                self.db.execute("DELETE FROM queue WHERE name=?", (name,))
+            base = self.db.execute("SELECT COALESCE(MAX(pos), 0) FROM queue WHERE name=?", (name,)).fetchone()[0]
+            self.db.executemany("INSERT INTO queue(name, keyword, pos) VALUES(?,?,?)",
+                                [(name, k, base + i + 1) for i, k in enumerate(kws)])
+            self.db.execute("COMMIT")
+        except Exception:
+            self.db.execute("ROLLBACK"); raise
+        return len(kws)
+
+    def peek(self, name: str, n: int = 10) -> List[str]:
+        return [r[0] for r in self.db.execute(
+            "SELECT keyword FROM queue WHERE name=? AND (lease_until IS NULL OR lease_until<?) ORDER BY pos LIMIT ?",
+            (name, time.time(), n))]
+
+    def lease(self, name: str, n: int = 1, ttl: int = KW_QUEUE_LEASE_SEC,
+              seed: Optional[Callable[[], List[str]]] = None) -> List[Lease]:
+        """대여 가능한 머리 n개를 원자적으로 대여. 큐가 비어 있으면 seed()로 먼저 채움(같은 트랜잭션)."""
+        now, token = time.time(), uuid.uuid4().hex
+        self._tx()
+        try:
+            if seed is not None and self.size(name) == 0:
+                kws = [k.strip() for k in seed() if k and k.strip()]
+                self.db.executemany("INSERT INTO queue(name, keyword, pos) VALUES(?,?,?)",
+                                    [(name, k, i + 1) for i, k in enumerate(kws)])
+                print(f"[QUEUE] {name}: empty → seeded {len(kws)} from CSV (KW_QUEUE_DB not persisted?)")
+            rows = self.db.execute(
+                "SELECT id, keyword FROM queue WHERE name=? AND (lease_until IS NULL OR lease_until<?) "
+                "ORDER BY pos LIMIT ?", (name, now, max(0, n))).fetchall()
+            self.db.executemany("UPDATE queue SET lease_until=?, token=? WHERE id=?",
+                                [(now + ttl, token, r[0]) for r in rows])
+            self.db.execute("COMMIT")
+        except Exception:
+            self.db.execute("ROLLBACK"); raise
+        return [Lease(r[0], r[1], token) for r in rows]
+
+    def ack(self, leases: Iterable[Lease]) -> int:
+        """사용 완료 → 대여 순서대로 꼬리로. 토큰이 다르면(만료 후 다른 실행이 가져감) 무시."""
+        done = 0
+        self._tx()
+        try:
+            for l in leases:
+                tail = self.db.execute("SELECT COALESCE(MAX(q2.pos), 0) FROM queue q2 "
+                                       "WHERE q2.name=(SELECT name FROM queue WHERE id=?)", (l.id,)).fetchone()[0]
+                done += self.db.execute("UPDATE queue SET pos=?, lease_until=NULL, token=NULL WHERE id=? AND token=?",
+                                        (tail + 1, l.id, l.token)).rowcount
+            self.db.execute("COMMIT")
+        except Exception:
+            self.db.execute("ROLLBACK"); raise
+        return done
+
+    def nack(self, leases: Iterable[Lease]) -> int:
+        """미사용 → 대여만 해제 (머리 자리 유지)."""
+        self._tx()
+        try:
+            done = sum(self.db.execute("UPDATE queue SET lease_until=NULL, token=NULL WHERE id=? AND token=?",
+                                       (l.id, l.token)).rowcount for l in leases)
+            self.db.execute("COMMIT")
+        except Exception:
+            self.db.execute("ROLLBACK"); raise
+        return done
+
+def lease_for(path: str, n: int, seed: Callable[[], List[str]]) -> List[Lease]:
+    """CSV 경로 이름의 큐에서 n개 대여 (큐가 비었으면 seed()=CSV 내용으로 채움)."""
+    q = KeywordQueue()
+    try:
+        return q.lease(name_for(path), n, seed=seed)
+    finally:
+        q.close()
+
+def settle(leases: List[Lease], used: Iterable[str]):
+    """발행된 키워드는 ack(꼬리로), 나머지는 nack(머리 자리로 반납)."""
+    used = set(used)
+    q = KeywordQueue()
+    try:
+        ok = q.ack([l for l in leases if l.keyword in used])
+        back = q.nack([l for l in leases if l.keyword not in used])
+    finally:
+        q.close()
+    print(f"[QUEUE] ack={ok} nack={back}")
+
+if __name__ == "__main__":
+    import argparse, csv
+    ap = argparse.ArgumentParser(description="Inspect or load the shared keyword queue")
+    ap.add_argument("name", nargs="?", default="golden_shopping_keywords")
+    ap.add_argument("--load", default="", help="1열 키워드 CSV로 큐 교체")
+    ap.add_argument("--peek", type=int, default=10)
+    args = ap.parse_args()
+    q = KeywordQueue()
+    if args.load:
+        with open(args.load, "r", encoding="utf-8", newline="") as f:
+            rows = [r[0].strip() for r in csv.reader(f) if r and r[0].strip()]
+        if rows and rows[0].lower() in ("keyword", "title"):
+            rows = rows[1:]
+        print(f"[kw_queue] {args.name}: loaded {q.enqueue_many(args.name, rows)}")
+    print(f"[kw_queue] {args.name}: size={q.size(args.name)} head={q.peek(args.name, args.peek)}")
+    q.close()
@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+"""
+near_dup.py — 유사 키워드 억제 (문자 n-gram MinHash + LSH)
+- 정규화: 소문자, 숫자만 있는 토큰 제거("미니 히터 3" → "미니 히터"), 반복 토큰 1회("무선 무선 청소기")
+- 특징: 토큰별 문자 2-gram 집합 (어순과 띄어쓰기 차이에 둔감)
+- LSH(밴드 × 행)로 후보만 찾고, 후보는 실제 Jaccard로 확인 → 인덱스 크기와 무관하게 조회가 거의 일정
+- threshold 이상 비슷한 키워드가 이미 있으면 중복으로 판단
+
+사용:
+    nd = NearDupIndex(0.7)
+    nd.add_many(recent_used)
+    if nd.admit("저소음 가열식 가습기"):  # 비슷한 게 없으면 True + 인덱스에 추가
+        ...
+
+Env:
+    NEAR_DUP_THRESHOLD (default: 0)    0이면 비활성. 권장 0.7 (LSH 밴드가 0.7 기준으로 맞춰져 있음)
+                       예: "휴대용 선풍기"/"휴대용 미니 선풍기" 0.8, "미니 히터 3"/"미니 히터" 1.0 → 제외
+                       짧은 키워드 포함 관계는 못 잡음: "USB 니트"/"니트" 0.33, "무선 청소기"/"유선 청소기" 0.5
+    NEAR_DUP_DAYS      (default: 30)   비교할 최근 사용 이력 기간
+"""
+
+from __future__ import annotations
+import os, hashlib
+from collections import defaultdict
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+NEAR_DUP_THRESHOLD = float(os.getenv("NEAR_DUP_THRESHOLD") or "0")
+NEAR_DUP_DAYS = int(os.getenv("NEAR_DUP_DAYS") or "30")
+
+_NGRAM = 2
+_BANDS, _ROWS = 20, 3                  # J=0.7에서 후보 재현율 ≈ 99.9%
+_PRIME = (1 << 61) - 1
+
+def _perms(n: int):
+    out = []
+    for i in range(n):
+        d = hashlib.blake2b(f"perm{i}".encode(), digest_size=16).digest()
+        out.append((int.from_bytes(d[:8], "little") % _PRIME | 1, int.from_bytes(d[8:], "little") % _PRIME))
+    return out
+
+_PERMS = _perms(_BANDS * _ROWS)
+
+def normalize(s: str) -> str:
+    seen, toks = set(), []
+    for t in (s or "").lower().split():
+        if t.isdigit() or t in seen:
+            continue
+        seen.add(t); toks.append(t)
+    return " ".join(toks)
+
+@lru_cache(maxsize=65536)
+def shingles(s: str) -> FrozenSet[str]:
+    out = set()
+    for t in normalize(s).split():
+        if len(t) <= _NGRAM:
+            out.add(t)
+        else:
+            out.update(t[i:i + _NGRAM] for i in range(len(t) - _NGRAM + 1))
+    return frozenset(out)
+
+@lru_cache(maxsize=65536)
+def _h64(sh: str) -> int:
+    return int.from_bytes(hashlib.blake2b(sh.encode("utf-8"), digest_size=8).digest(), "little")
+
+def signature(sh: FrozenSet[str]) -> Tuple[int, ...]:
+    hs = [_h64(x) for x in sh] or [0]
+    return tuple(min((a * h + b) % _PRIME for h in hs) for a, b in _PERMS)
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+class NearDupIndex:
+    def __init__(self, threshold: float = NEAR_DUP_THRESHOLD):
+        self.threshold = threshold
+        self._buckets: Dict[Tuple[int, Tuple[int, ...]], List[int]] = defaultdict(list)
+        self._keys: List[str] = []
+        self._sh: List[FrozenSet[str]] = []
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _bands(self, sig: Tuple[int, ...]):
+        for b in range(_BANDS):
+            yield (b, sig[b * _ROWS:(b + 1) * _ROWS])
+
+    def _add(self, key: str, sh: FrozenSet[str], sig: Tuple[int, ...]):
+        i = len(self._keys)
+        self._keys.append(key); self._sh.append(sh)
+        for band in self._bands(sig):
+            self._buckets[band].append(i)
+
+    def add(self, key: str):
+        sh = shingles(key)
+        self._add(key, sh, signature(sh))
+
+    def add_many(self, keys: Iterable[str]):
+        for k in keys:
+            self.add(k)
+
+    def _match(self, sh: FrozenSet[str], sig: Tuple[int, ...]) -> Optional[Tuple[str, float]]:
+        best, seen = None, set()
+        for band in self._bands(sig):
+            for i in self._buckets.get(band, ()):
+                if i in seen:
+                    continue
+                seen.add(i)
+                j = jaccard(sh, self._sh[i])
+                if j >= self.threshold and (best is None or j > best[1]):
+                    best = (self._keys[i], j)
+        return best
+
+    def query(self, key: str) -> Optional[Tuple[str, float]]:
+        """가장 비슷한 기존 키워드와 유사도(임계값 이상일 때만), 없으면 None."""
+        sh = shingles(key)
+        return self._match(sh, signature(sh))
+
+    def admit(self, key: str) -> bool:
+        """비슷한 키워드가 없으면 추가하고 True, 있으면 False."""
+        if self.threshold <= 0:
+            return True
+        sh = shingles(key)
+        sig = signature(sh)
+        if self._match(sh, sig):
+            return False
+        self._add(key, sh, sig)
+        return True
+
+def dedup(seq: Iterable[str], threshold: float = NEAR_DUP_THRESHOLD, history: Iterable[str] = ()) -> List[str]:
+    """순서를 유지하며 history 및 앞선 항목과 비슷한 것을 제거."""
+    nd = NearDupIndex(threshold)
+    nd.add_many(history)
+    return [x for x in seq if nd.admit(x)]
+
+if __name__ == "__main__":
+    import argparse
+    ap = argparse.ArgumentParser(description="Report near-duplicate keywords in a usage log or CSV")
+    ap.add_argument("path", nargs="?", default=os.path.join(os.getenv("USAGE_DIR") or ".usage", "used_shopping.txt"))
+    ap.add_argument("--threshold", type=float, default=NEAR_DUP_THRESHOLD or 0.7)
+    args = ap.parse_args()
+    nd = NearDupIndex(args.threshold)
+    total = dup = 0
+    with open(args.path, "r", encoding="utf-8", errors="ignore") as f:
+        for ln in f:
+            kw = ln.rstrip("\n").split("\t")[-1].split(",")[0].strip()
+            if not kw or kw.lower() in ("keyword", "title"):
+                continue
+            total += 1
+            hit = nd.query(kw)
+            if hit:
+                dup += 1
+                print(f"{kw}\t≈ {hit[0]}\t{hit[1]:.2f}")
+            else:
+                nd.add(kw)
+    print(f"[near_dup] {dup}/{total} near-duplicates at threshold {args.threshold}")
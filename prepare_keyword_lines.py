@@ -1,7 +1,9 @@
 # -*- coding: utf-8 -*-
 """
 prepare_keyword_lines.py
-- keywords.csv 1줄에서 키워드를 읽어 일반/쇼핑 분리
+- keywords.csv(여러 줄·쉼표 구분·.gz·'-'=stdin)를 스트리밍으로 읽어 일반/쇼핑 분리
+- 점수는 배치로 계산(사전 컴파일 정규식, 단어 목록은 정규식 1개로 합침, NumPy 있으면 벡터화)
+- 상위 N은 달리는 최소 힙으로 유지(중복 제거 포함) → 입력이 커져도 메모리는 k에 비례
 - 출력:
   - keywords_general.csv      (일상용 라인)
   - golden_shopping_keywords.csv  (쿠팡용 상위 N)
@@ -10,7 +12,12 @@ prepare_keyword_lines.py
   python prepare_keyword_lines.py --k 10 --gold 5 --shop-gold 5
 """
 
-import os, re, argparse, csv
+import os, re, sys, gzip, argparse, csv, heapq
+
+try:
+    import numpy as np  # 선택 의존성(requirements.txt 주석 참고): 대량 점수 계산 벡터화, 없어도 결과 동일
+except Exception:
+    np = None
 
 DEFAULT_IN = os.getenv("KEYWORDS_CSV") or "keywords.csv"
 
@@ -22,45 +29,154 @@ SHOPPING_WORDS = set("""
 
 GENERAL_STOP = set(["브리핑","정리","알아보기","대해 알아보기","해야 할 것","해야할 것","해야할것"])
 
+_HEADER = frozenset(("keyword", "keywords", "title"))
+
+def _open_text(path: str):
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8", errors="ignore", newline="")
+    return open(path, "r", encoding="utf-8", errors="ignore", newline="")
+
+def iter_keywords(path: str):
+    """여러 줄/대용량/.gz 입력을 한 줄씩 스트리밍: 쉼표 구분 셀마다 키워드 1개 (첫 줄 헤더 셀은 건너뜀)."""
+    if path != "-" and not os.path.exists(path): return
+    f = sys.stdin if path == "-" else _open_text(path)
+    try:
+        for n, row in enumerate(csv.reader(f)):
+            for x in row:
+                x = x.strip()
+                if x and not (n == 0 and x.lower() in _HEADER):
+                    yield x
+    finally:
+        if f is not sys.stdin: f.close()
+
 def read_line_csv(path: str):
-    if not os.path.exists(path): return []
-    with open(path,"r",encoding="utf-8") as f:
-        line=f.readline().strip()
-    arr=[x.strip() for x in line.split(",") if x.strip()]
-    # 중복 제거(순서 유지)
+    # 전체를 리스트로 (중복 제거, 순서 유지) — 작은 입력용
     seen=set(); out=[]
-    for x in arr:
+    for x in iter_keywords(path):
         if x not in seen:
             seen.add(x); out.append(x)
     return out
 
+# ===== 사전 컴파일 패턴 =====
+_MODEL_RE = re.compile(r"[A-Za-z]+[\-\s]?\d{2,}")
+_COMMERCE_RE = re.compile(r"(추천|리뷰|최저가|세일|특가|할인|구매|가격)")
+_HANGUL_RE = re.compile(r"[가-힣]{2,}")
+
+def _words_re(words):
+    # 단어 집합 → 정규식 1개(부분문자열 포함 검사를 C 레벨 한 번의 스캔으로)
+    # 토큰 집합 조회는 쓰지 않음: 기존 any(w in kw)는 부분문자열 의미라 "무선이어폰"(붙여 쓴 복합어)의 "이어폰",
+    # "대해 알아보기" 같은 여러 단어 불용어도 잡아야 함 → 토큰 분리로는 결과가 달라짐
+    return re.compile("|".join(re.escape(w) for w in sorted(words, key=len, reverse=True)))
+
+_SHOP_RE = _words_re(SHOPPING_WORDS)
+_STOP_RE = _words_re(GENERAL_STOP)
+
+def _features(kw: str):
+    """(쇼핑 단어 포함, 쇼핑형, 일반 불용어 포함, 한글 2자+, 길이)"""
+    has_shop = _SHOP_RE.search(kw) is not None
+    shop_like = has_shop or _MODEL_RE.search(kw) is not None or _COMMERCE_RE.search(kw) is not None
+    return (has_shop, shop_like, _STOP_RE.search(kw) is not None, _HANGUL_RE.search(kw) is not None, len(kw))
+
 def is_shopping_like(kw: str) -> bool:
-    if any(w in kw for w in SHOPPING_WORDS): return True
-    # 모델명/제품형
-    if re.search(r"[A-Za-z]+[\-\s]?\d{2,}", kw): return True
-    # 상업 신호
-    if re.search(r"(추천|리뷰|최저가|세일|특가|할인|구매|가격)", kw): return True
-    return False
+    return _features(kw)[1]
 
 def info_score(kw: str) -> float:
     # 일반 키워드 '정보성' 점수
+    _, shop_like, stop, hangul, L = _features(kw)
     s = 0.0
-    L = len(kw)
     s += min(L, 20)/20.0            # 적당한 길이 가점
-    s += 0.3 if not any(w in kw for w in GENERAL_STOP) else -0.5
-    s += -0.7 if is_shopping_like(kw) else 0.0
-    s += 0.2 if re.search(r"[가-힣]{2,}", kw) else 0.0
+    s += 0.3 if not stop else -0.5
+    s += -0.7 if shop_like else 0.0
+    s += 0.2 if hangul else 0.0
     return s
 
 def shop_score(kw: str) -> float:
     # 쇼핑 키워드 점수
+    has_shop, shop_like, _, _, L = _features(kw)
     s = 0.0
-    L = len(kw)
-    s += 0.6 if is_shopping_like(kw) else 0.0
-    s += 0.2 if any(w in kw for w in SHOPPING_WORDS) else 0.0
+    s += 0.6 if shop_like else 0.0
+    s += 0.2 if has_shop else 0.0
     s += min(L, 18)/18.0
     return s
 
+def score_batch(kws):
+    """키워드 묶음 → (쇼핑형 플래그, 정보성 점수, 쇼핑 점수). NumPy가 있으면 점수 계산을 벡터화.
+    덧셈 순서를 info_score/shop_score와 같게 유지해 부동소수 결과도 동일."""
+    feats = [_features(k) for k in kws]
+    flags = [f[1] for f in feats]
+    if np is None or not feats:
+        info = [(((0.0 + min(L, 20)/20.0) + (0.3 if not st else -0.5)) + (-0.7 if sl else 0.0)) + (0.2 if hg else 0.0)
+                for _, sl, st, hg, L in feats]
+        shop = [((0.0 + (0.6 if sl else 0.0)) + (0.2 if hs else 0.0)) + min(L, 18)/18.0
+                for hs, sl, _, _, L in feats]
+        return flags, info, shop
+    a = np.array(feats, dtype=np.int64)
+    hs, sl, st, hg = (a[:, i].astype(bool) for i in range(4))
+    L = a[:, 4]
+    info = np.minimum(L, 20) / 20.0
+    info = info + np.where(st, -0.5, 0.3)
+    info = info + np.where(sl, -0.7, 0.0)
+    info = info + np.where(hg, 0.2, 0.0)
+    shop = np.where(sl, 0.6, 0.0)
+    shop = shop + np.where(hs, 0.2, 0.0)
+    shop = shop + np.minimum(L, 18) / 18.0
+    return flags, info, shop
+
+class RunningTopK:
+    """스트림에서 점수 상위 k를 유지하는 최소 힙 — 결과는 sorted(..., reverse=True)[:k]와 같음
+    (동점은 먼저 들어온 것 우선). 같은 키워드가 다시 오면 점수도 같으므로 힙 안에 있는지만 보면 중복 제거가 됨:
+    한 번 밀려난 키워드는 그 뒤 임계값이 더 올라가 다시 들어올 수 없다 → 메모리는 k에 비례."""
+
+    def __init__(self, k: int):
+        self.k = max(0, k)
+        self.heap = []        # (score, -seq, kw)
+        self.members = set()
+
+    def threshold(self):
+        return self.heap[0][0] if len(self.heap) >= self.k and self.heap else None
+
+    def push(self, score: float, seq: int, kw: str):
+        if self.k == 0 or kw in self.members: return
+        item = (score, -seq, kw)
+        if len(self.heap) < self.k:
+            heapq.heappush(self.heap, item); self.members.add(kw)
+        elif item > self.heap[0]:
+            old = heapq.heapreplace(self.heap, item)
+            self.members.discard(old[2]); self.members.add(kw)
+
+    def result(self):
+        return [kw for _, _, kw in sorted(self.heap, reverse=True)]
+
+def _batches(it, n: int):
+    buf = []
+    for x in it:
+        buf.append(x)
+        if len(buf) >= n:
+            yield buf; buf = []
+    if buf: yield buf
+
+def select_stream(keywords, k_general: int, k_shop: int, batch: int = 50000):
+    """키워드 스트림 → (일반 상위 k_general, 쇼핑 상위 k_shop, 읽은 수). 배치 단위로 점수 계산 후 힙에 반영."""
+    g, sh = RunningTopK(k_general), RunningTopK(k_shop)
+    seq = 0; seen = 0
+    for chunk in _batches(keywords, batch):
+        flags, info, shop = score_batch(chunk)
+        if np is not None and isinstance(info, np.ndarray):
+            mask = np.array(flags, dtype=bool)
+            # 힙이 찼으면 임계값 이하(동점은 먼저 온 쪽이 이김)는 파이썬 루프에 넣지 않음
+            tg, ts = g.threshold(), sh.threshold()
+            keep_g = ~mask if tg is None else ~mask & (info > tg)
+            keep_s = mask if ts is None else mask & (shop > ts)
+            cand = np.flatnonzero(keep_g | keep_s).tolist()
+            flags_l, info_l, shop_l = mask.tolist(), info.tolist(), shop.tolist()
+        else:
+            cand, flags_l, info_l, shop_l = range(len(chunk)), flags, info, shop
+        for i in cand:
+            if flags_l[i]: sh.push(shop_l[i], seq + i, chunk[i])
+            else: g.push(info_l[i], seq + i, chunk[i])
+        seq += len(chunk); seen += len(chunk)
+    return g.result(), sh.result(), seen
+
 def write_csv_keywords(path: str, keywords):
     # header=keyword 1열 CSV
     with open(path,"w",encoding="utf-8",newline="") as f:
@@ -75,26 +191,24 @@ def main():
     ap.add_argument("--k", type=int, default=10, help="일상 라인 길이")
     ap.add_argument("--gold", type=int, default=5, help="일상 황금 개수")
     ap.add_argument("--shop-gold", type=int, default=5, help="쇼핑 황금 개수")
+    ap.add_argument("--batch", type=int, default=50000, help="한 번에 점수 계산할 키워드 수")
     args=ap.parse_args()
 
-    base = read_line_csv(args.input)
-    if not base:
+    # 스트리밍: 입력 크기와 무관하게 힙 크기(k)만큼만 메모리 사용
+    ranked, golden_shop, seen = select_stream(iter_keywords(args.input), max(args.k, args.gold),
+                                              args.shop_gold, args.batch)
+    if not seen:
         print(f"[WARN] no keywords in {args.input}")
         return 0
-
-    general = [kw for kw in base if not is_shopping_like(kw)]
-    shopping = [kw for kw in base if is_shopping_like(kw)]
-
-    # 일상 라인: 정보성 높은 순 → 상위 k
-    general_ranked = sorted(general, key=info_score, reverse=True)[:args.k]
-    # 황금(일반/쇼핑): 각 점수 상위
-    golden_general = sorted(general, key=info_score, reverse=True)[:args.gold]
-    golden_shop = sorted(shopping, key=shop_score, reverse=True)[:args.shop_gold]
+    # 일상 라인/일상 황금: 같은 정보성 순위 → 한 번 뽑아 앞부분 공유
+    general_ranked = ranked[:args.k]
+    golden_general = ranked[:args.gold]
 
     write_csv_keywords("keywords_general.csv", general_ranked)
     write_csv_keywords("golden_keywords.csv", golden_general)
     write_csv_keywords("golden_shopping_keywords.csv", golden_shop)
 
+    print(f"[OK] scanned {seen} keywords from {args.input}")
     print(f"[OK] wrote keywords_general.csv ({len(general_ranked)})")
     print(f"[OK] wrote golden_keywords.csv ({len(golden_general)})")
     print(f"[OK] wrote golden_shopping_keywords.csv ({len(golden_shop)})")
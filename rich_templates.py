@@ -3,12 +3,15 @@
 rich_templates.py — 가벼운 기사형 템플릿
 - 박스 레이아웃 제거, 자연스러운 h2/h3 스타일
 - 버튼은 부모 래퍼 안에서 항상 중앙 정렬
+- CSS_MODE=shared 면 <style> 대신 공용 스타일 블록 참조만 출력 (shared_css)
+- 정적 섹션(CSS/요약/본문2)은 tpl.layout으로 1회 컴파일, 호출 시 슬롯만 채움
 - 섹션 순서(요청안): 내부광고 → 요약 → 버튼 → 본문1(짧게) → 썸네일(옵션)
                  → 버튼 → 내부광고 → 본문2(나머지)
 """
 
 from __future__ import annotations
 from typing import Dict, Optional
+import tpl, shared_css
 
 def _css_block() -> str:
     # .rt-* 네임스페이스: 테마와 충돌 방지
@@ -35,29 +38,16 @@ def _css_block() -> str:
 """.strip()
 
 def _esc(s: Optional[str]) -> str:
-    import html
-    return html.escape((s or "").strip())
+    return tpl.esc(s)
 
-def build_affiliate_content(
-    product: Dict,
-    button_html: str,
-    disclosure_text: Optional[str] = None,
-    ad_shortcode: Optional[str] = None,
-    thumb_url: Optional[str] = None,
-) -> str:
-    k = _esc(product.get("title") or "추천 제품")
-    disc = _esc(disclosure_text) if disclosure_text else ""
-    btn = button_html or ""
-    ad = (ad_shortcode or "").strip()
+# 본문1: 짧은 인트로(요약과 분리)
+_INTRO = (
+    "<p>{{k}}는 ‘필수 기능을 중심으로’ 쓰면 체감 효용이 확 올라갑니다. "
+    "과도한 옵션보다 자주 쓰는 장면에서 필요한 기능을 먼저 고르는 게 핵심이에요.</p>"
+)
 
-    # 본문1: 짧은 인트로(요약과 분리)
-    intro = (
-        f"<p>{k}는 ‘필수 기능을 중심으로’ 쓰면 체감 효용이 확 올라갑니다. "
-        f"과도한 옵션보다 자주 쓰는 장면에서 필요한 기능을 먼저 고르는 게 핵심이에요.</p>"
-    )
-
-    # 본문2: 나머지(자연스러운 서술 + 표/목록)
-    body_2 = f"""
+# 본문2: 나머지(자연스러운 서술 + 표/목록)
+_BODY_2 = """
 <h3>선택 기준 3가지</h3>
 <table class="rt-table">
   <thead><tr><th>항목</th><th>확인 포인트</th><th>메모</th></tr></thead>
@@ -69,7 +59,7 @@ def build_affiliate_content(
 </table>
 
 <h3>상세 리뷰</h3>
-<p>{k}의 첫 인상은 ‘필요한 기능을 알찬 구성으로 담았다’는 점입니다. 
+<p>{{k}}의 첫 인상은 ‘필요한 기능을 알찬 구성으로 담았다’는 점입니다. 
 초기 세팅이 단순해 가족과 함께 쓰기에도 적합하고, 관리 주기가 명확해 습관화가 쉽습니다. 
 자주 쓰는 장면을 2~3개 정한 뒤 거기에 꼭 맞는 기능부터 활성화하면 만족도가 높아요.</p>
 
@@ -104,26 +94,45 @@ def build_affiliate_content(
 <b>A.</b> 목적 대비 과사양은 비용·관리 부담이 큽니다. 내 환경에 맞는 균형이 핵심입니다.</p>
 """.strip()
 
+# CSS·요약·본문2 등 정적 섹션은 모듈 로드 시 1회만 컴파일
+shared_css.register("rt-rich", _css_block())
+
+_LAYOUT = tpl.layout("rich_affiliate", [
+    "{{css}}",
+    '<div class="rt">',
+    "{{meta}}",
+    "{{ad}}",
+    '<h2>요약</h2>',
+    '<div class="rt-kicker"><ul>'
+    '<li>대표 포인트: 핵심 기능</li>'
+    '<li>서브 포인트: 관리 난도</li>'
+    '<li>추가 포인트: 가격대</li>'
+    '</ul></div>',
+    '<div class="rt-cta">{{btn}}</div>',
+    '<h2>한 눈에 보기</h2>',
+    _INTRO,
+    "{{thumb}}",
+    '<div class="rt-cta">{{btn}}</div>',
+    "{{ad}}",
+    _BODY_2,
+    '</div>',
+])
+
+def build_affiliate_content(
+    product: Dict,
+    button_html: str,
+    disclosure_text: Optional[str] = None,
+    ad_shortcode: Optional[str] = None,
+    thumb_url: Optional[str] = None,
+) -> str:
+    k = _esc(product.get("title") or "추천 제품")
+    disc = _esc(disclosure_text) if disclosure_text else ""
+    btn = button_html or ""
+    ad = (ad_shortcode or "").strip()
     thumb = f"""<figure class="rt-thumb"><img src="{_esc(thumb_url)}" alt="{k} 썸네일"></figure>""" if thumb_url else ""
 
-    parts = [
-        _css_block(),
-        '<div class="rt">',
-        (f'<p class="rt-meta">{disc}</p>' if disc else ''),
-        (ad if ad else ''),
-        '<h2>요약</h2>',
-        f'<div class="rt-kicker"><ul>'
-        f'<li>대표 포인트: 핵심 기능</li>'
-        f'<li>서브 포인트: 관리 난도</li>'
-        f'<li>추가 포인트: 가격대</li>'
-        f'</ul></div>',
-        f'<div class="rt-cta">{btn}</div>',
-        '<h2>한 눈에 보기</h2>',
-        intro,
-        thumb,
-        f'<div class="rt-cta">{btn}</div>',
-        (ad if ad else ''),
-        body_2,
-        '</div>',
-    ]
-    return "\n".join(p for p in parts if p)
+    return _LAYOUT.render(
+        css=shared_css.style("rt-rich"),
+        k=k, btn=btn, ad=ad, thumb=thumb,
+        meta=(f'<p class="rt-meta">{disc}</p>' if disc else ''),
+    )
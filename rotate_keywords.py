@@ -9,14 +9,18 @@
 #   --mode auto|lines|list : 강제 모드 지정(기본 auto)
 #   --dry-run         : 파일을 수정하지 않고 결과만 출력
 #   --backup          : 수정 전 백업 파일 생성(예: keywords.csv.bak)
+#   --cursor          : 파일은 그대로 두고 .usage/cursor_<파일명>.json 커서만 전진 (kw_cursor)
+#                       --used 가 현재 머리가 아니면 커서로 표현할 수 없으므로 기존 방식으로 재작성
 #
 # Env:
 #   KEYWORDS_CSV (기본 "keywords.csv")
 #   USED_KEYWORD (선택: --used 미지정 시 사용)
+#   ROTATE_MODE  (cursor 면 --cursor 기본 적용)
 
 import os
 import argparse
 from typing import List
+import kw_cursor
 
 CSV_PATH = os.getenv("KEYWORDS_CSV", "keywords.csv")
 
@@ -78,6 +82,38 @@ def rotate_list_mode(text: str, delimiter: str = ",", used: str = "", count: int
         items = rotate_list(items, count=count)
     return delimiter.join(items)
 
+def cursor_items(text: str, mode: str, delimiter: str = ",") -> List[str]:
+    # 커서는 affiliate_post/auto_wp_gpt와 같은 목록(헤더 제외)을 기준으로 해야 상태 파일을 공유할 수 있음
+    if mode == "lines":
+        items = [ln.strip() for ln in text.splitlines() if ln.strip()]
+    else:
+        items = [x.strip() for x in text.strip().split(delimiter) if x.strip()]
+    if items and items[0].lower() in ("keyword", "title"):
+        items = items[1:]
+    return items
+
+def rotate_cursor(path: str, items: List[str], used: str = "", count: int = 1):
+    """커서 전진. used가 현재 머리가 아니면 None(호출측이 재작성으로 처리)."""
+    if used:
+        head = kw_cursor.view(path, items)[:1]
+        if head != [used.strip()]:
+            return None
+        count = 1
+    return kw_cursor.advance(path, items, count)
+
+def cursor_rewrite_text(path: str, text: str, mode: str, items: List[str], used: str,
+                        delimiter: str = ",") -> str:
+    """used가 커서 머리가 아닐 때: 현재 커서 순서(view)를 그대로 파일에 풀어 쓰고 used만 맨 뒤로.
+    새 generation의 offset 0 = 이 순서 → 회전 위치가 원래 파일 순서로 되돌아가지 않음."""
+    new = move_used_to_end(kw_cursor.view(path, items), used.strip())
+    if mode == "lines":
+        first = next((ln.strip() for ln in text.splitlines() if ln.strip()), "")
+    else:
+        first = next((x.strip() for x in text.strip().split(delimiter) if x.strip()), "")
+    if first.lower() in ("keyword", "title"):
+        new = [first] + new
+    return ("\n" if mode == "lines" else delimiter).join(new) + "\n"
+
 def main():
     ap = argparse.ArgumentParser(description="Rotate keywords in keywords.csv")
     ap.add_argument("--used", default=os.getenv("USED_KEYWORD", ""), help="이번에 사용한 키워드(우선 이동)")
@@ -87,6 +123,8 @@ def main():
     ap.add_argument("--path", default=CSV_PATH, help="키워드 파일 경로 (기본 KEYWORDS_CSV)")
     ap.add_argument("--dry-run", action="store_true", help="파일을 수정하지 않고 결과만 출력")
     ap.add_argument("--backup", action="store_true", help="수정 전 .bak 백업 생성")
+    ap.add_argument("--cursor", action="store_true", default=kw_cursor.enabled(),
+                    help="파일 대신 .usage 커서만 전진 (기본: ROTATE_MODE=cursor)")
     args = ap.parse_args()
 
     if not os.path.exists(args.path):
@@ -96,7 +134,19 @@ def main():
     raw = read_text(args.path)
     mode = args.mode if args.mode != "auto" else detect_mode(raw)
 
-    if mode == "lines":
+    if args.cursor:
+        items = cursor_items(raw, mode, args.delimiter)
+        if args.dry_run:
+            print("[dry-run] mode: cursor/" + mode)
+            print("\n".join(kw_cursor.view(args.path, items)))
+            return 0
+        off = rotate_cursor(args.path, items, used=args.used, count=args.count)
+        if off is not None:
+            print(f"[OK] advanced cursor for {args.path} → offset={off}/{len(items)}")
+            return 0
+        print(f"[warn] '{args.used}' is not at the cursor head; rewriting file in cursor order")
+        new_text = cursor_rewrite_text(args.path, raw, mode, items, args.used, args.delimiter)
+    elif mode == "lines":
         new_text = rotate_lines_mode(raw, used=args.used, count=args.count)
     else:  # list
         new_one_line = rotate_list_mode(raw, delimiter=args.delimiter, used=args.used, count=args.count)
@@ -6,12 +6,15 @@ seed_quality_check.py (enhanced)
           per-keyword counts, product_name duplicates-in-keyword
 - Features:
     * CSV auto dialect (comma/semicolon/pipe) + UTF-8 BOM tolerant
-    * Concurrent network checks (ThreadPoolExecutor)
-    * --http-fallback : HEAD 실패/비정상 시 GET 재시도
+    * Concurrent network checks: --engine async(기본, url_check: 호스트별 동시성/keep-alive/속도 제한)
+                                 | threads(기존 ThreadPoolExecutor + 공유 Session)
+    * --http-fallback : HEAD 실패/비정상 시 GET 재시도 (async 엔진은 Range: bytes=0-0 GET)
     * --report PATH   : Markdown 품질 리포트 작성 (기본 .cache/seed_report.md)
     * --write-clean   : products_seed.cleaned.csv 생성 (중복/결측/도메인 제외)
     * --max-per-keyword N : 클린 저장 시 키워드별 최대 행수 제한
     * --strict        : 에러가 있으면 종료코드 1 반환
+    * URL 상태 캐시   : cache_key(쿼리 포함 정규화 URL) 키로 TTL 안의 정상 결과는 재요청 안 함, 나머지는 조건부 요청 (--no-cache로 끔)
+    * --store         : CSV 대신 seed_store(SQLite)를 커서로 순회 (SEED_STORE=sqlite 면 기본)
 
 Env (optional):
     PRODUCTS_SEED_CSV (default: products_seed.csv)
@@ -19,16 +22,20 @@ Env (optional):
     MIN_PER_KEYWORD   (default: 2)
     VERIFY_SSL        (default: true)
     TIMEOUT_SEC       (default: 8)
-    MAX_WORKERS       (default: 8)
+    MAX_WORKERS       (default: 8)     threads 엔진 전용
+    URL_CHECK_ENGINE  (default: async) / URL_CHECK_PER_HOST, URL_CHECK_RPS ... (url_check 참고)
+    URL_STATUS_CACHE / URL_STATUS_TTL (url_check 참고, async 엔진 전용)
     ALLOW_DOMAINS     (default: "coupang.com,link.coupang.com")
+    SEED_STORE / SEED_STORE_DB (seed_store 참고)
 """
 
-import os, sys, csv, argparse, itertools
-from urllib.parse import urlparse, urlunparse
+import os, sys, csv, time, argparse, itertools
+from urllib.parse import urlparse, urlunparse, parse_qsl, urlencode
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from collections import Counter, defaultdict
 import requests
 from pathlib import Path
+import seed_store, url_check
 
 # ========= Env & Defaults =========
 PRODUCTS_SEED_CSV = os.getenv("PRODUCTS_SEED_CSV", "products_seed.csv")
@@ -37,6 +44,7 @@ MIN_PER_KEYWORD   = int(os.getenv("MIN_PER_KEYWORD", "2"))
 VERIFY_SSL        = os.getenv("VERIFY_SSL", "true").lower() != "false"
 TIMEOUT_SEC       = int(os.getenv("TIMEOUT_SEC", "8"))
 MAX_WORKERS       = int(os.getenv("MAX_WORKERS", "8"))
+URL_CHECK_ENGINE  = (os.getenv("URL_CHECK_ENGINE") or "async").strip().lower()
 ALLOW_DOMAINS     = [d.strip().lower() for d in (os.getenv("ALLOW_DOMAINS", "coupang.com,link.coupang.com").split(","))
                      if d.strip()]
 
@@ -54,6 +62,17 @@ def normalize_url(u: str) -> str:
     except Exception:
         return (u or "").strip().rstrip("/")
 
+def cache_key(u: str) -> str:
+    """URL 상태 캐시 키: normalize_url + 정렬된 쿼리.
+    normalize_url은 쿼리를 버려 link.coupang.com/re/AFFSDP?...&itemId=N, search?q=... 가 각각 한 키로 합쳐지므로
+    상품/검색어별 결과가 섞이지 않도록 쿼리는 유지."""
+    try:
+        q = urlencode(sorted(parse_qsl(urlparse((u or "").strip()).query, keep_blank_values=True)))
+    except Exception:
+        q = ""
+    base = normalize_url(u)
+    return f"{base}?{q}" if q else base
+
 def is_allowed_domain(url: str) -> bool:
     try:
         host = urlparse(url).netloc.lower()
@@ -98,6 +117,16 @@ def load_rows(path: str):
         rows = list(reader)
     return headers, rows
 
+def load_store_rows(path: str):
+    """seed_store 전체를 입력 순서대로 스트리밍 (헤더는 CSV 스키마와 동일)."""
+    st = seed_store.SeedStore(path)
+    def rows():
+        try:
+            yield from st.iter_rows()
+        finally:
+            st.close()
+    return list(seed_store.FIELDS), rows()
+
 def head_ok(session: requests.Session, url: str, timeout: int, verify: bool, http_fallback: bool):
     try:
         r = session.head(url, allow_redirects=True, timeout=timeout, verify=verify)
@@ -127,18 +156,24 @@ def main():
     ap.add_argument("--write-clean", action="store_true", help="클린 CSV(products_seed.cleaned.csv) 생성")
     ap.add_argument("--no-network", action="store_true", help="HEAD 요청 생략")
     ap.add_argument("--http-fallback", action="store_true", help="HEAD 실패 시 GET으로 재시도")
+    ap.add_argument("--engine", choices=["async", "threads"], default=URL_CHECK_ENGINE,
+                    help="네트워크 검사 엔진 (async: 호스트별 동시성 제한)")
+    ap.add_argument("--no-cache", action="store_true", help="URL 상태 캐시를 쓰지 않고 전부 다시 확인")
     ap.add_argument("--max-per-keyword", type=int, default=0, help="키워드별 최대 행수 (클린 저장 시만 적용)")
     ap.add_argument("--report", default=".cache/seed_report.md", help="마크다운 리포트 경로")
     ap.add_argument("--pros-min", type=int, default=4, help="pros 최소 글자 수 (경고 기준)")
     ap.add_argument("--cons-min", type=int, default=4, help="cons 최소 글자 수 (경고 기준)")
+    ap.add_argument("--store", action="store_true", default=seed_store.enabled(),
+                    help="CSV 대신 seed_store(SQLite)에서 읽기")
     args = ap.parse_args()
 
-    if not os.path.exists(PRODUCTS_SEED_CSV):
-        print(f"[ERROR] '{PRODUCTS_SEED_CSV}' 파일이 없습니다.")
+    src = seed_store.SEED_STORE_DB if args.store else PRODUCTS_SEED_CSV
+    if not os.path.exists(src):
+        print(f"[ERROR] '{src}' 파일이 없습니다.")
         return sys.exit(1 if args.strict else 0)
 
-    # --- read csv ---
-    headers, rows = load_rows(PRODUCTS_SEED_CSV)
+    # --- read csv / store ---
+    headers, rows = load_store_rows(src) if args.store else load_rows(src)
     missing = [h for h in REQUIRED_HEADERS if h not in headers]
     if missing:
         print(f"[ERROR] 헤더 누락: {missing} / 현재 헤더: {headers}")
@@ -197,7 +232,17 @@ def main():
     # --- optional network check ---
     if not args.no_network:
         to_check = [(idx, r["raw_url"]) for idx, r in enumerate(cleaned_rows, start=2) if r["raw_url"]]
-        if to_check:
+        if to_check and args.engine == "async":
+            t0 = time.perf_counter()
+            cache = None if args.no_cache or url_check.URL_STATUS_TTL <= 0 else url_check.StatusCache()
+            checked = url_check.check_urls([u for _, u in to_check], TIMEOUT_SEC, VERIFY_SSL, args.http_fallback,
+                                           cache=cache, key=cache_key)
+            results = {(idx, url): checked[url][:2] for idx, url in to_check}
+            if cache:
+                cache.save()
+                print(f"[URL] cache: {cache.hits} fresh, {cache.revalidated} not modified")
+            print(f"[URL] {len(to_check)} URLs checked in {time.perf_counter() - t0:.2f}s")
+        elif to_check:
             session = requests.Session()
             results = {}
             with ThreadPoolExecutor(max_workers=max(1, MAX_WORKERS)) as ex:
@@ -213,7 +258,7 @@ def main():
                     except Exception:
                         ok, status = False, None
                     results[(idx, url)] = (ok, status)
-
+        if to_check:
             for (idx, url), (ok, status) in results.items():
                 if not ok:
                     if status is None:
@@ -230,7 +275,7 @@ def main():
             warns.append(f"[부족] '{k}' 키워드 행수 {cnt.get(k,0)}/{MIN_PER_KEYWORD}")
 
     # --- summary ---
-    total = len(rows)
+    total = len(cleaned_rows)
     print("\n===== products_seed.csv 품질 리포트 =====")
     print(f"총 행수: {total}")
     print(f"에러: {len(errors)}건 / 경고: {len(warns)}건")
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+"""
+seed_store.py — 키워드 색인 씨드 저장소 (SQLite, products_seed.csv 대체 형식)
+- 스키마는 CSV와 같음: product_name,raw_url,pros,cons,keyword,title,url,image (+ 입력 순서 id)
+- lookup(keyword): keyword 인덱스 조회 → 발행 시 씨드 크기와 무관하게 키워드 1개의 상품만 읽음
+- iter_rows(): 입력 순서대로 커서 스트리밍 → seed_quality_check 등 전체 검사용 (전부 메모리에 올리지 않음)
+- append(rows) / replace(rows): build_products_seed가 CSV와 함께 기록
+- CSV ↔ 저장소 변환: python seed_store.py --from-csv products_seed.csv / --to-csv out.csv
+
+Env:
+    SEED_STORE     (default: csv)  sqlite 로 두면 build_products_seed가 저장소에도 쓰고,
+                                   affiliate_post / seed_quality_check 가 저장소에서 읽음
+    SEED_STORE_DB  (default: products_seed.sqlite3)
+"""
+
+from __future__ import annotations
+import os, csv, sqlite3
+from typing import Dict, Iterable, Iterator, List, Sequence, Union
+
+SEED_STORE = (os.getenv("SEED_STORE") or "csv").strip().lower()
+SEED_STORE_DB = os.getenv("SEED_STORE_DB") or "products_seed.sqlite3"
+FIELDS = ["product_name", "raw_url", "pros", "cons", "keyword", "title", "url", "image"]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS seeds(
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    product_name TEXT NOT NULL DEFAULT '',
+    raw_url TEXT NOT NULL DEFAULT '',
+    pros TEXT NOT NULL DEFAULT '',
+    cons TEXT NOT NULL DEFAULT '',
+    keyword TEXT NOT NULL,
+    title TEXT NOT NULL DEFAULT '',
+    url TEXT NOT NULL DEFAULT '',
+    image TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS ix_seeds_keyword ON seeds(keyword, id);
+"""
+_COLS = ",".join(FIELDS)
+_INSERT = f"INSERT INTO seeds({_COLS}) VALUES({','.join('?' * len(FIELDS))})"
+
+Row = Union[Sequence[str], Dict[str, str]]
+
+def enabled() -> bool:
+    return SEED_STORE == "sqlite"
+
+def _values(r: Row) -> tuple:
+    if isinstance(r, dict):
+        return tuple((r.get(k) or "").strip() for k in FIELDS)
+    vals = [(x or "").strip() for x in list(r)[:len(FIELDS)]]
+    return tuple(vals + [""] * (len(FIELDS) - len(vals)))
+
+class SeedStore:
+    def __init__(self, path: str = SEED_STORE_DB):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.db = sqlite3.connect(path)
+        self.db.executescript(_SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def count(self) -> int:
+        return self.db.execute("SELECT COUNT(*) FROM seeds").fetchone()[0]
+
+    def append(self, rows: Iterable[Row]) -> int:
+        vals = [v for v in map(_values, rows) if v[4]]
+        with self.db:
+            self.db.executemany(_INSERT, vals)
+        return len(vals)
+
+    def replace(self, rows: Iterable[Row]) -> int:
+        """전체 교체 (한 트랜잭션: 읽는 쪽은 이전 또는 새 씨드 중 하나만 봄)."""
+        vals = [v for v in map(_values, rows) if v[4]]
+        with self.db:
+            self.db.execute("DELETE FROM seeds")
+            self.db.executemany(_INSERT, vals)
+        return len(vals)
+
+    def lookup(self, keyword: str, limit: int = 0) -> List[Dict[str, str]]:
+        sql = f"SELECT {_COLS} FROM seeds WHERE keyword=? ORDER BY id" + (" LIMIT ?" if limit else "")
+        args = ((keyword or "").strip(), limit) if limit else ((keyword or "").strip(),)
+        return [dict(zip(FIELDS, r)) for r in self.db.execute(sql, args)]
+
+    def keywords(self) -> List[str]:
+        return [r[0] for r in self.db.execute("SELECT keyword FROM seeds GROUP BY keyword ORDER BY MIN(id)")]
+
+    def iter_rows(self) -> Iterator[Dict[str, str]]:
+        for r in self.db.execute(f"SELECT {_COLS} FROM seeds ORDER BY id"):
+            yield dict(zip(FIELDS, r))
+
+    def import_csv(self, path: str, replace: bool = True) -> int:
+        with open(path, "r", encoding="utf-8-sig", newline="") as f:
+            rows = csv.DictReader(f)
+            return self.replace(rows) if replace else self.append(rows)
+
+    def export_csv(self, path: str) -> int:
+        n = 0
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            w = csv.DictWriter(f, fieldnames=FIELDS)
+            w.writeheader()
+            for r in self.iter_rows():
+                w.writerow(r); n += 1
+        return n
+
+def lookup(keyword: str, limit: int = 0, path: str = SEED_STORE_DB) -> List[Dict[str, str]]:
+    """저장소가 없으면 빈 목록 (발행은 기존 딥링크 경로로 진행)."""
+    if not os.path.exists(path):
+        return []
+    st = SeedStore(path)
+    try:
+        return st.lookup(keyword, limit)
+    finally:
+        st.close()
+
+if __name__ == "__main__":
+    import argparse
+    ap = argparse.ArgumentParser(description="Convert products_seed.csv to/from the keyword-indexed seed store")
+    ap.add_argument("--db", default=SEED_STORE_DB)
+    ap.add_argument("--from-csv", default="", help="CSV로 저장소 교체")
+    ap.add_argument("--append", action="store_true", help="--from-csv: 교체 대신 추가")
+    ap.add_argument("--to-csv", default="", help="저장소를 CSV로 내보내기")
+    ap.add_argument("--lookup", default="", help="키워드 1개의 상품 출력")
+    args = ap.parse_args()
+    st = SeedStore(args.db)
+    if args.from_csv:
+        print(f"[seed_store] {args.from_csv} → {args.db}: {st.import_csv(args.from_csv, not args.append)} rows")
+    if args.to_csv:
+        print(f"[seed_store] {args.db} → {args.to_csv}: {st.export_csv(args.to_csv)} rows")
+    if args.lookup:
+        for r in st.lookup(args.lookup):
+            print(r)
+    print(f"[seed_store] rows={st.count()} keywords={len(st.keywords())}")
+    st.close()
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""
+shared_css.py — 글마다 <style>를 싣지 않고 스타일시트를 1회만 게시하는 모드
+- CSS_MODE=inline (기본): 지금처럼 본문마다 <style> 인라인
+- CSS_MODE=shared       : 스타일을 재사용 블록(wp_block)으로 1회 게시하고, 글에는 블록 참조 주석만 삽입
+                          (<!-- wp:block {"ref":ID} /--> — do_blocks가 클래식 본문에서도 렌더링)
+- CSS_MODE=none         : 테마/추가 CSS에 이미 넣어둔 경우, 마크업만 출력
+- 블록 id/해시는 .usage/shared_css.json 에 보관 → CSS가 바뀐 경우에만 블록을 갱신
+- 게시 실패/미확인 시에는 자동으로 인라인으로 폴백
+
+사용:
+    register("rt-aff", CSS)                  # 템플릿 모듈 로드 시
+    ensure_published(session, wp_url, auth)  # 발행 전에 1회 (shared 모드에서만 동작)
+    style("rt-aff")                          # 본문에 넣을 문자열 (인라인 CSS | 블록 참조 | "")
+"""
+
+from __future__ import annotations
+import os, json, hashlib
+from typing import Dict, Tuple
+import requests
+
+CSS_MODE = (os.getenv("CSS_MODE") or "inline").strip().lower()
+USAGE_DIR = os.getenv("USAGE_DIR") or ".usage"
+STATE_PATH = os.path.join(USAGE_DIR, "shared_css.json")
+TITLE_PREFIX = "gpt-blog-style:"
+
+_CSS: Dict[str, str] = {}
+_REFS: Dict[str, str] = {}  # name → 블록 참조 주석
+
+def register(name: str, css: str):
+    _CSS[name] = css
+
+def _hash(css: str) -> str:
+    return hashlib.sha256(css.encode("utf-8")).hexdigest()[:16]
+
+def _block_content(css: str) -> str:
+    return f"<!-- wp:html -->\n{css}\n<!-- /wp:html -->"
+
+def _ref(bid: int) -> str:
+    return f'<!-- wp:block {{"ref":{int(bid)}}} /-->'
+
+def style(name: str) -> str:
+    if CSS_MODE == "none":
+        return ""
+    if CSS_MODE == "shared" and name in _REFS:
+        return _REFS[name]
+    return _CSS.get(name, "")
+
+def _load_state() -> Dict:
+    try:
+        with open(STATE_PATH, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return {}
+
+def _save_state(st: Dict):
+    os.makedirs(USAGE_DIR, exist_ok=True)
+    with open(STATE_PATH, "w", encoding="utf-8") as f:
+        json.dump(st, f, ensure_ascii=False, indent=1, sort_keys=True)
+
+def _upsert_block(session: requests.Session, wp_url: str, auth: Tuple[str, str], verify: bool,
+                  name: str, css: str, known_id: int = 0) -> int:
+    title = TITLE_PREFIX + name
+    payload = {"title": title, "content": _block_content(css), "status": "publish"}
+    bid = known_id
+    if not bid:
+        r = session.get(f"{wp_url}/wp-json/wp/v2/blocks", params={"search": title, "context": "edit", "per_page": 20},
+                        auth=auth, verify=verify, timeout=15)
+        r.raise_for_status()
+        for it in r.json():
+            t = it.get("title")
+            t = t.get("raw") if isinstance(t, dict) else t
+            if (t or "").strip() == title:
+                bid = int(it["id"]); break
+    url = f"{wp_url}/wp-json/wp/v2/blocks" + (f"/{bid}" if bid else "")
+    r = session.post(url, json=payload, auth=auth, verify=verify, timeout=15)
+    if r.status_code == 404 and known_id:
+        # 저장된 블록이 사이트에서 지워짐 → 제목으로 다시 찾거나 새로 생성
+        return _upsert_block(session, wp_url, auth, verify, name, css, 0)
+    r.raise_for_status()
+    return int(r.json()["id"])
+
+def ensure_published(session: requests.Session, wp_url: str, auth: Tuple[str, str], verify: bool = True):
+    """shared 모드에서 등록된 스타일을 블록으로 게시/갱신. 실패한 스타일은 인라인 유지."""
+    if CSS_MODE != "shared" or not _CSS:
+        return
+    st = _load_state()
+    changed = False
+    for name, css in _CSS.items():
+        h = _hash(css)
+        cur = st.get(name) or {}
+        if cur.get("id") and cur.get("hash") == h:
+            _REFS[name] = _ref(cur["id"]); continue
+        try:
+            bid = _upsert_block(session, wp_url, auth, verify, name, css, int(cur.get("id") or 0))
+        except requests.RequestException as e:
+            print(f"[shared_css] '{name}' publish failed → inline fallback: {e}")
+            continue
+        st[name] = {"id": bid, "hash": h}
+        _REFS[name] = _ref(bid)
+        changed = True
+        print(f"[shared_css] '{name}' → wp_block #{bid}")
+    if changed:
+        _save_state(st)
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""
+thumbs.py — 상품 썸네일 파이프라인
+- fetch_many(): 이미지 URL 동시 다운로드 → .cache/thumbs/<sha256> 로 내용 해시 캐시 (URL→해시 맵 재사용)
+- prepare(): 웹용으로 리사이즈/재인코딩(JPEG, Pillow — requirements.txt). Pillow가 없는 환경이면 원본 그대로 사용
+- upload_media(): 같은 해시를 이미 올렸으면 재업로드 없이 기존 media id 반환 (.usage/media_uploaded.json)
+- featured_for(): 위 단계를 묶어 URL 목록 → [(media_id, source_url) | None]
+
+Env:
+    THUMB_DIR        (default: .cache/thumbs)
+    THUMB_MAX_W      (default: 800)
+    THUMB_QUALITY    (default: 82)
+    THUMB_WORKERS    (default: 6)
+"""
+
+from __future__ import annotations
+import os, json, hashlib, io, tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import requests
+
+try:
+    from PIL import Image  # 선택 의존성
+except Exception:
+    Image = None
+
+CACHE_DIR = os.getenv("CACHE_DIR", ".cache")
+USAGE_DIR = os.getenv("USAGE_DIR") or ".usage"
+THUMB_DIR = Path(os.getenv("THUMB_DIR") or os.path.join(CACHE_DIR, "thumbs"))
+THUMB_MAX_W = int(os.getenv("THUMB_MAX_W") or "800")
+THUMB_QUALITY = int(os.getenv("THUMB_QUALITY") or "82")
+THUMB_WORKERS = int(os.getenv("THUMB_WORKERS") or "6")
+MEDIA_MAP = Path(USAGE_DIR) / "media_uploaded.json"
+URL_MAP = THUMB_DIR / "url_index.json"
+
+UA = os.getenv("USER_AGENT") or "gpt-blog-auto/thumbs-1.0"
+_EXT = {"image/jpeg": ".jpg", "image/png": ".png", "image/webp": ".webp", "image/gif": ".gif"}
+
+def _load_json(p: Path) -> Dict:
+    try:
+        return json.loads(p.read_text(encoding="utf-8"))
+    except Exception:
+        return {}
+
+def _save_json(p: Path, obj: Dict):
+    p.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=str(p.parent), delete=False) as tmp:
+        json.dump(obj, tmp, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp.name, p)
+
+def _sha(b: bytes) -> str:
+    return hashlib.sha256(b).hexdigest()
+
+# ===== 다운로드 =====
+def _fetch_one(session: requests.Session, url: str, known: Dict[str, str]) -> Optional[Path]:
+    sha = known.get(url)
+    if sha:
+        hit = next(THUMB_DIR.glob(f"{sha}.*"), None)
+        if hit:
+            return hit
+    try:
+        r = session.get(url, timeout=15, headers={"User-Agent": UA})
+        r.raise_for_status()
+    except requests.RequestException as e:
+        print(f"[thumbs] fetch fail {url}: {e}")
+        return None
+    data = r.content
+    ctype = (r.headers.get("Content-Type") or "").split(";")[0].strip().lower()
+    if not ctype.startswith("image/") or not data:
+        return None
+    sha = _sha(data)
+    p = THUMB_DIR / f"{sha}{_EXT.get(ctype, '.img')}"
+    if not p.exists():
+        p.write_bytes(data)
+    known[url] = sha
+    return p
+
+def fetch_many(urls: List[str], workers: int = THUMB_WORKERS) -> Dict[str, Optional[Path]]:
+    """URL → 로컬 원본 경로(실패 시 None). 같은 URL/내용은 다시 받지 않음."""
+    THUMB_DIR.mkdir(parents=True, exist_ok=True)
+    uniq = list(dict.fromkeys(u for u in urls if u))
+    if not uniq:
+        return {}
+    known = _load_json(URL_MAP)
+    with requests.Session() as session, ThreadPoolExecutor(max_workers=max(1, workers)) as ex:
+        paths = list(ex.map(lambda u: _fetch_one(session, u, known), uniq))
+    _save_json(URL_MAP, known)
+    return dict(zip(uniq, paths))
+
+# ===== 리사이즈 =====
+def prepare(src: Path) -> Tuple[Path, str]:
+    """웹용 JPEG로 변환(가로 THUMB_MAX_W 이하). 반환: (경로, 결과물 sha256)."""
+    out = src.with_name(f"{src.stem}_w{THUMB_MAX_W}.jpg")
+    if not out.exists():
+        if Image is None:
+            return src, _sha(src.read_bytes())
+        try:
+            with Image.open(src) as im:
+                im = im.convert("RGB")
+                if im.width > THUMB_MAX_W:
+                    im = im.resize((THUMB_MAX_W, round(im.height * THUMB_MAX_W / im.width)), Image.LANCZOS)
+                buf = io.BytesIO()
+                im.save(buf, "JPEG", quality=THUMB_QUALITY, optimize=True, progressive=True)
+            out.write_bytes(buf.getvalue())
+        except Exception as e:
+            print(f"[thumbs] resize fail {src.name}: {e}")
+            return src, _sha(src.read_bytes())
+    return out, _sha(out.read_bytes())
+
+# ===== 업로드 =====
+def upload_media(session: requests.Session, wp_url: str, auth: Tuple[str, str], path: Path, sha: str,
+                 verify: bool = True, filename: Optional[str] = None, uploaded: Optional[Dict] = None) -> Optional[Tuple[int, str]]:
+    """같은 해시는 1회만 업로드. 반환: (media_id, source_url) 또는 None."""
+    own = uploaded is None
+    uploaded = _load_json(MEDIA_MAP) if own else uploaded
+    hit = uploaded.get(sha)
+    if hit:
+        return int(hit["id"]), hit.get("url") or ""
+    ext = path.suffix.lower()
+    ctype = {".jpg": "image/jpeg", ".png": "image/png", ".webp": "image/webp", ".gif": "image/gif"}.get(ext, "application/octet-stream")
+    name = filename or f"thumb-{sha[:12]}{ext}"
+    try:
+        r = session.post(f"{wp_url}/wp-json/wp/v2/media", data=path.read_bytes(), auth=auth, verify=verify, timeout=60,
+                         headers={"Content-Type": ctype, "Content-Disposition": f'attachment; filename="{name}"'})
+        r.raise_for_status()
+    except requests.RequestException as e:
+        print(f"[thumbs] upload fail {name}: {e}")
+        return None
+    j = r.json()
+    uploaded[sha] = {"id": int(j["id"]), "url": j.get("source_url") or ""}
+    if own:
+        _save_json(MEDIA_MAP, uploaded)
+    return uploaded[sha]["id"], uploaded[sha]["url"]
+
+def featured_for(session: requests.Session, wp_url: str, auth: Tuple[str, str], image_urls: List[Optional[str]],
+                 verify: bool = True) -> List[Optional[Tuple[int, str]]]:
+    """이미지 URL 목록 → 같은 순서의 (media_id, source_url) 또는 None."""
+    fetched = fetch_many([u for u in image_urls if u])
+    uploaded = _load_json(MEDIA_MAP)
+    out: List[Optional[Tuple[int, str]]] = []
+    for u in image_urls:
+        src = fetched.get(u) if u else None
+        if not src:
+            out.append(None); continue
+        path, sha = prepare(src)
+        out.append(upload_media(session, wp_url, auth, path, sha, verify, uploaded=uploaded))
+    _save_json(MEDIA_MAP, uploaded)
+    return out
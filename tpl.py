@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+"""
+tpl.py — 사전 컴파일 + 정적 조각 캐시 템플릿 (rich_templates / affiliate_post / auto_wp_gpt 공용)
+- layout(name, parts): 파트 목록을 1회만 컴파일해 이름으로 캐시
+    * 파트가 정확히 "{{slot}}"  → 선택 슬롯(값이 비면 구분자째 생략 = "\\n".join(p for p in parts if p) 와 동일)
+    * 그 외 문자열              → 정적 조각(안에 {{slot}} 인라인 치환 가능)
+    * 연속된 정적 조각은 미리 "\\n"으로 합쳐 하나의 문자열로 보관
+- render(): 변수 슬롯만 채워 join → 호출마다 CSS/정적 섹션을 다시 만들지 않음
+- esc(): 같은 문자열의 반복 escape를 메모이즈
+- HtmlBody: 조각을 덧붙일 때마다 '보이는 글자 수(태그/공백 제외)'를 증분 집계 → 최소 글자 보강이 선형
+"""
+
+from __future__ import annotations
+import html, re
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple, Union
+
+_SLOT = re.compile(r"\{\{(\w+)\}\}")
+_TAG = re.compile(r"<[^>]+>")
+_WS = re.compile(r"\s+")
+
+@lru_cache(maxsize=4096)
+def esc(s: Optional[str]) -> str:
+    return html.escape((s or "").strip())
+
+class _Inline:
+    """정적 텍스트 + 인라인 슬롯. 문자열을 (정적, 슬롯) 교대로 쪼개 둔다."""
+    __slots__ = ("statics", "names")
+
+    def __init__(self, src: str):
+        bits = _SLOT.split(src)
+        self.statics: Tuple[str, ...] = tuple(bits[0::2])
+        self.names: Tuple[str, ...] = tuple(bits[1::2])
+
+    def render(self, vals: Dict[str, str]) -> str:
+        st = self.statics
+        out = [st[0]]
+        for i, n in enumerate(self.names):
+            out.append(vals[n]); out.append(st[i + 1])
+        return "".join(out)
+
+# 세그먼트: str(완성된 정적 조각) | ("opt", 슬롯명) | _Inline
+Segment = Union[str, Tuple[str, str], _Inline]
+
+class Layout:
+    __slots__ = ("name", "segments")
+
+    def __init__(self, name: str, parts: List[str]):
+        self.name = name
+        segs: List[Segment] = []
+        buf: List[str] = []
+        for p in parts:
+            if not p:
+                continue
+            m = _SLOT.fullmatch(p)
+            if m or _SLOT.search(p):
+                if buf:
+                    segs.append("\n".join(buf)); buf = []
+                segs.append(("opt", m.group(1)) if m else _Inline(p))
+            else:
+                buf.append(p)
+        if buf:
+            segs.append("\n".join(buf))
+        self.segments: Tuple[Segment, ...] = tuple(segs)
+
+    def render(self, **vals: str) -> str:
+        out: List[str] = []
+        for s in self.segments:
+            if s.__class__ is str:
+                out.append(s)
+            elif s.__class__ is tuple:
+                v = vals.get(s[1]) or ""
+                if v:
+                    out.append(v)
+            else:
+                out.append(s.render(vals))
+        return "\n".join(out)
+
+_LAYOUTS: Dict[str, Layout] = {}
+
+def layout(name: str, parts: List[str]) -> Layout:
+    """이름 단위로 1회만 컴파일. 같은 이름 재호출 시 캐시된 Layout 반환."""
+    lay = _LAYOUTS.get(name)
+    if lay is None:
+        lay = _LAYOUTS[name] = Layout(name, parts)
+    return lay
+
+# ===== 보이는 글자 수 증분 집계 =====
+def visible_len(fragment: str) -> int:
+    """태그와 공백을 뺀 글자 수 (기존 _nchars/_nchars_no_space와 같은 규칙)."""
+    return len(_WS.sub("", _TAG.sub("", fragment or "")))
+
+class HtmlBody:
+    """
+    본문 빌더. 조각은 태그가 닫힌 완결 HTML이어야 하며(escape된 텍스트 포함),
+    그 조각만 스캔해 visible을 갱신하므로 전체 버퍼를 다시 훑지 않는다.
+    """
+    __slots__ = ("_parts", "visible")
+
+    def __init__(self, initial: str = ""):
+        self._parts: List[str] = [initial] if initial else []
+        self.visible = visible_len(initial)
+
+    def append(self, fragment: str, sep: str = "") -> "HtmlBody":
+        if sep:
+            self._parts.append(sep)
+            self.visible += visible_len(sep)
+        self._parts.append(fragment)
+        self.visible += visible_len(fragment)
+        return self
+
+    def __len__(self) -> int:
+        return self.visible
+
+    def getvalue(self) -> str:
+        s = "".join(self._parts)
+        self._parts = [s] if s else []
+        return s
+
+    __str__ = getvalue
@@ -3,14 +3,23 @@
 update_keywords.py — 매 실행 '완전 새 키워드' 생성 + 밴/중복 제거 + 골든 선별 보장
 - 기존 CSV 백업(.bak-타임스탬프) 후 새로 작성
 - NAVER 실패 여부와 무관하게 폴백 제너레이터로 K개/Gold개 보장
+- KEYWORD_SOURCES(외부 HTTP/file 소스)를 --parallel 개 동시 수집(TTL 캐시) → 후보 앞쪽에 두고 같은 필터 적용
 - BAN_KEYWORDS, .usage/ban_keywords_shopping.txt, used_* 로그 반영
 - build_products_seed용 keywords.csv까지 생성
 - CI 인자(--k/--gold/--shop-k/--shop-gold 등)도 받아들이도록 호환 처리
+- USED_STORE=sqlite 면 used_* 로그를 색인 저장소(used_store)로 증분 가져와 조회 (기본 text: 기존 전체 파싱)
+- USED_BLOOM=1 이면 mmap Bloom 필터(.cache/used_*.bloom)를 앞단에 두고 양성일 때만 색인 확인
+- ROTATE_MODE=queue 면 일반/골든 목록을 공유 키워드 큐(kw_queue)에 일괄 등록
+- 유사 키워드 억제: 후보끼리 + 최근 NEAR_DUP_DAYS일 사용 이력과 MinHash/LSH 유사도가 임계값 이상이면 제외
+- 밴 목록은 Aho-Corasick 오토마톤 1개로 빌드해 재사용 (패턴 집합이 같으면 .cache/ban_matcher.pkl 재로드)
 """
 
-import os, csv, time, random
+import os, csv, time, random, hashlib, itertools
 from datetime import datetime, timedelta
 import argparse
+from aho_matcher import AhoMatcher, cached as _cached_matcher
+import used_store, bloom, kw_queue, keyword_sources
+from near_dup import NearDupIndex, NEAR_DUP_THRESHOLD, NEAR_DUP_DAYS
 
 # ===== env + cli =====
 def _envflag(v: str|None, default=True)->bool:
@@ -24,6 +33,7 @@ def _parse_cli():
     ap.add_argument("--shop-k", type=int)
     ap.add_argument("--shop-gold", type=int)
     ap.add_argument("--days", type=int)
+    ap.add_argument("--parallel", type=int)
     # 불명 인자는 무시
     args, _ = ap.parse_known_args()
     return args
@@ -32,12 +42,14 @@ _args=_parse_cli()
 
 K_ALL   = _args.k or int(os.getenv("K_ALL") or os.getenv("KEYWORDS_K") or "50")
 GOLD_ALL= _args.gold or int(os.getenv("GOLD_ALL") or "20")
+PARALLEL= _args.parallel or int(os.getenv("KEYWORD_SOURCES_PARALLEL") or "4")
 
 USAGE_DIR = os.getenv("USAGE_DIR") or ".usage"
 BACKUP_OLD = _envflag(os.getenv("BACKUP_OLD_KEYWORDS"), True)
 
 BAN_FROM_ENV = [s.strip() for s in (os.getenv("BAN_KEYWORDS") or "").split(",") if s.strip()]
 BAN_FILE = os.path.join(USAGE_DIR, "ban_keywords_shopping.txt")
+BAN_CACHE = os.path.join(os.getenv("CACHE_DIR", ".cache"), "ban_matcher.pkl")
 
 # ===== paths =====
 P_GENERAL = "keywords_general.csv"
@@ -63,7 +75,19 @@ def _write_col(path:str, items:list[str]):
         for x in items:
             if x: w.writerow([x])
 
-def _read_used(path:str, days:int=365)->set[str]:
+def _read_used(path:str, days:int=365):
+    """최근 days일 사용 키워드. sqlite 모드는 `in`만 지원하는 색인 뷰, text 모드는 set."""
+    if used_store.USED_STORE == "sqlite":
+        kind = os.path.splitext(os.path.basename(path))[0].replace("used_", "", 1)
+        st = used_store.UsedStore()
+        n = st.import_text(kind, path)
+        if n: print(f"[USED] {kind}: +{n} lines indexed")
+        if bloom.USED_BLOOM:
+            # 대부분의 후보는 Bloom 음성으로 끝나고, 양성일 때만 색인 조회
+            return bloom.Guarded(bloom.for_log(kind, path), st.view(kind, days))
+        return st.view(kind, days)
+    if bloom.USED_BLOOM:
+        print("[USED] USED_BLOOM=1 ignored: requires USED_STORE=sqlite")
     used=set()
     if not os.path.exists(path): return used
     cutoff = datetime.utcnow().date() - timedelta(days=days)
@@ -82,20 +106,42 @@ def _read_used(path:str, days:int=365)->set[str]:
                 used.add(ln)
     return used
 
-def _load_bans()->list[str]:
+def _recent_used(path:str, days:int)->set[str]:
+    """유사도 비교용 최근 사용 키워드 목록(_read_used와 달리 실제 집합)."""
+    if used_store.USED_STORE == "sqlite":
+        kind = os.path.splitext(os.path.basename(path))[0].replace("used_", "", 1)
+        st = used_store.UsedStore()
+        st.import_text(kind, path)
+        return st.window(kind, days)
+    return _read_used(path, days)
+
+def _near_dup_index(path:str):
+    if NEAR_DUP_THRESHOLD <= 0: return None
+    nd = NearDupIndex(NEAR_DUP_THRESHOLD)
+    nd.add_many(_recent_used(path, NEAR_DUP_DAYS))
+    return nd
+
+def _load_bans()->AhoMatcher:
     bans = set(x for x in BAN_FROM_ENV if x)
     if os.path.exists(BAN_FILE):
-        for ln in open(BAN_FILE,"r",encoding="utf-8",errors="ignore"):
-            ln=ln.strip()
-            if ln: bans.add(ln)
-    # 부분문자열 매칭을 위해 길이 긴 것부터
-    return sorted(bans, key=len, reverse=True)
+        with open(BAN_FILE,"r",encoding="utf-8",errors="ignore") as f:
+            for ln in f:
+                ln=ln.strip()
+                if ln: bans.add(ln)
+    # 부분문자열 매칭: 입력 길이에 선형인 오토마톤 (밴 수만큼 반복하지 않음)
+    return _cached_matcher(bans, BAN_CACHE)
 
-def _ban_or_used(s:str, bans:list[str], used:set[str])->bool:
+def _ban_or_used(s:str, bans:AhoMatcher, used)->bool:
     s=s.strip()
     if not s: return True
     if s in used: return True
-    return any(b and (b in s) for b in bans)
+    return bans.search(s)
+
+def _fresh(s:str, bans:AhoMatcher, used, nd, strict:bool=True)->bool:
+    # strict=False: 후보가 바닥난 뒤에는 유사도 검사 없이 K개 보장이 우선
+    if _ban_or_used(s,bans,used): return False
+    if nd is None: return True
+    return nd.admit(s) if strict else (nd.add(s) or True)
 
 def _uniq_keep_order(seq):
     out=[]; seen=set()
@@ -110,6 +156,29 @@ def _shuffle_daily(seq:list[str], salt:str="")->list[str]:
     rnd.shuffle(tmp)
     return tmp
 
+# 폴백 번호 후보에서 유사도 검사를 유지할 시도 수(K배)
+_ND_TRIES = 20
+
+def _lazy_perm(n:int, salt:str=""):
+    """0..n-1을 일별 시드 순서로 하나씩 — 목록을 만들지 않는 순열(4라운드 Feistel + cycle-walking).
+    필요한 만큼만 꺼내 쓰므로 시간/메모리가 n이 아니라 실제로 꺼낸 개수에 비례."""
+    if n <= 0: return
+    half = max(1, ((n - 1).bit_length() + 1) // 2)
+    mask = (1 << half) - 1
+    key = hashlib.blake2b(f"{datetime.utcnow().date()}|{salt}".encode("utf-8"), digest_size=32).digest()
+    def enc(x:int)->int:
+        l, r = x >> half, x & mask
+        for rnd in range(4):
+            f = int.from_bytes(hashlib.blake2b(bytes([rnd]) + r.to_bytes(8, "little"),
+                                               digest_size=8, key=key).digest(), "little") & mask
+            l, r = r, l ^ f
+        return (l << half) | r
+    for j in range(n):
+        x = enc(j)
+        while x >= n:  # 2^(2*half) 영역의 순열을 [0, n)으로 제한
+            x = enc(x)
+        yield x
+
 # ===== fallback pools =====
 GENERAL_BASE = [
     "가계부","정리정돈","주간 계획","미니멀 라이프","홈카페","아침 루틴","운동 기록",
@@ -125,34 +194,38 @@ SHOP_CATEGORIES = [
 ]
 SHOP_MODS = ["미니","컴팩트","저전력","저소음","가성비","프리미엄","USB","무선","스탠드","휴대용","대용량"]
 
-def _generate_general(k:int, bans:list[str], used:set[str])->list[str]:
-    pool = _shuffle_daily(GENERAL_BASE, "gen")
+def _generate_general(k:int, bans:AhoMatcher, used, nd=None, fresh=())->list[str]:
+    pool = _uniq_keep_order(list(fresh) + _shuffle_daily(GENERAL_BASE, "gen"))
     out=[]
     for x in pool:
-        if not _ban_or_used(x,bans,used):
+        if _fresh(x,bans,used,nd):
             out.append(x)
         if len(out)>=k: break
     i=1
     while len(out)<k:
         cand = f"{random.choice(GENERAL_BASE)} {random.choice(['메모','정리','팁','노트','기록'])} {i}"
-        if not _ban_or_used(cand,bans,used):
+        if _fresh(cand,bans,used,nd,strict=i<=k*_ND_TRIES):
             out.append(cand)
         i+=1
     return out
 
-def _generate_shopping(k:int, bans:list[str], used:set[str])->list[str]:
-    base = [f"{m} {c}" if m else c for c in SHOP_CATEGORIES for m in ([""]+SHOP_MODS)]
-    base += [c for c in SHOP_CATEGORIES]
-    base = _shuffle_daily(_uniq_keep_order(base), "shop")
-    out=[]
-    for x in base:
-        if not _ban_or_used(x,bans,used):
-            out.append(x)
+def _generate_shopping(k:int, bans:AhoMatcher, used, nd=None, fresh=())->list[str]:
+    # 카테고리 × (수식어 없음 + 수식어) 조합 공간을 만들지 않고 인덱스 순열로 필요한 만큼만 생성
+    mods = [""] + SHOP_MODS
+    def combos():
+        for i in _lazy_perm(len(SHOP_CATEGORIES) * len(mods), "shop"):
+            c, m = SHOP_CATEGORIES[i // len(mods)], mods[i % len(mods)]
+            yield f"{m} {c}" if m else c
+    out=[]; taken=set()
+    for x in itertools.chain(fresh, combos()):
+        if x in taken: continue
+        if _fresh(x,bans,used,nd):
+            out.append(x); taken.add(x)
         if len(out)>=k: break
     i=1
     while len(out)<k:
         cand = f"{random.choice(SHOP_MODS)} {random.choice(SHOP_CATEGORIES)} {i}"
-        if not _ban_or_used(cand,bans,used):
+        if _fresh(cand,bans,used,nd,strict=i<=k*_ND_TRIES):
             out.append(cand)
         i+=1
     return out
@@ -179,9 +252,10 @@ def main():
     for p in (P_GENERAL,P_SHOP,P_GOLD,P_ALL):
         _backup(p)
 
-    # NAVER 실패 여부와 무관하게 폴백 제너레이터로 즉시 채우는 구조(안전성 우선)
-    gen  = _generate_general(K_ALL, bans, used_g)
-    shop = _generate_shopping(K_ALL, bans, used_s)
+    # 외부 소스(있으면) 우선 + 폴백 제너레이터로 즉시 채우는 구조(안전성 우선)
+    fresh = keyword_sources.fetch_all(PARALLEL)
+    gen  = _generate_general(K_ALL, bans, used_g, _near_dup_index(USED_GENERAL), fresh["general"])
+    shop = _generate_shopping(K_ALL, bans, used_s, _near_dup_index(USED_SHOP), fresh["shopping"])
     gold = _select_golden(shop, GOLD_ALL)
 
     # 파일 출력
@@ -193,6 +267,13 @@ def main():
     merged = _uniq_keep_order(gold + shop + gen)[:max(K_ALL, 50)]
     _write_col(P_ALL, merged)
 
+    # ROTATE_MODE=queue: 포스터가 대여하는 공유 큐도 새 목록으로 교체
+    if kw_queue.enabled():
+        q = kw_queue.KeywordQueue()
+        for path, items in ((P_GENERAL, gen), (P_GOLD, gold)):
+            print(f"[QUEUE] {kw_queue.name_for(path)}: {q.enqueue_many(kw_queue.name_for(path), items)} enqueued")
+        q.close()
+
     print(f"[GENERAL] {len(gen)} → {P_GENERAL} (head={gen[:4]})")
     print(f"[SHOP]    {len(shop)} → {P_SHOP} (gold={len(gold)})")
     print(f"[GOLD]    {gold[:8]} …")
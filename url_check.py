@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+"""
+url_check.py — 씨드 URL 상태 검사 엔진 (asyncio, 호스트별 동시성 제한)
+- 이벤트 루프가 요청을 스케줄하고 실제 HTTP는 requests로 스레드에서 실행 (추가 의존성 없음)
+- 호스트별 Semaphore(URL_CHECK_PER_HOST) + 호스트별 Session(풀 크기 = 같은 한도) → keep-alive 재사용,
+  "Connection pool is full" 없이 동시 요청 수가 풀과 일치
+- 전역 속도 제한(URL_CHECK_RPS): 요청 시작 간격을 고르게 → 쿠팡 봇 차단 회피
+- HEAD → (비정상/HEAD 미지원 시) Range: bytes=0-0 GET 재확인: 본문은 1바이트만 받음
+- 같은 URL은 한 번만 요청
+- StatusCache: 키(seed_quality_check.cache_key = 쿼리까지 포함한 정규화 URL)별 {ok, status, final_url, etag, last_modified, ts} JSON 캐시
+  → TTL 안의 정상 결과는 요청하지 않음, 나머지는 If-None-Match / If-Modified-Since 조건부 HEAD로 재검증
+  → 304면 이전 결과를 유지하고 ts만 갱신 (실패 결과는 캐시가 있어도 매번 다시 확인)
+
+사용:
+    results = check_urls(urls, timeout=8, verify=True, fallback=True)  # {url: Result}
+    cache = StatusCache(); results = check_urls(urls, cache=cache, key=cache_key); cache.save()
+
+Env:
+    URL_CHECK_PER_HOST   (default: 8)   호스트별 동시 요청
+    URL_CHECK_CONCURRENCY(default: 32)  전체 동시 요청(스레드 수)
+    URL_CHECK_RPS        (default: 20)  초당 요청 시작 상한 (0=무제한)
+    URL_STATUS_CACHE     (default: .cache/url_status.json)
+    URL_STATUS_TTL       (default: 86400)  정상 결과 재사용 초 (0=캐시 끔)
+"""
+
+from __future__ import annotations
+import os, json, time, asyncio, tempfile
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, NamedTuple, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+URL_CHECK_PER_HOST = max(1, int(os.getenv("URL_CHECK_PER_HOST") or "8"))
+URL_CHECK_CONCURRENCY = max(1, int(os.getenv("URL_CHECK_CONCURRENCY") or "32"))
+URL_CHECK_RPS = float(os.getenv("URL_CHECK_RPS") or "20")
+URL_STATUS_CACHE = os.getenv("URL_STATUS_CACHE") or os.path.join(os.getenv("CACHE_DIR", ".cache"), "url_status.json")
+URL_STATUS_TTL = int(os.getenv("URL_STATUS_TTL") or "86400")
+UA = os.getenv("USER_AGENT") or "gpt-blog-auto/url-check"
+
+class Result(NamedTuple):
+    ok: bool
+    status: Optional[int]
+    final_url: str = ""
+    etag: str = ""
+    last_modified: str = ""
+
+class StatusCache:
+    """키별 마지막 검사 결과. hits=TTL 안이라 건너뜀, revalidated=304로 확인된 수."""
+    def __init__(self, path: str = URL_STATUS_CACHE, ttl: int = URL_STATUS_TTL):
+        self.path, self.ttl = path, ttl
+        self.hits = self.revalidated = 0
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                self.data: Dict[str, Dict] = json.load(f)
+        except Exception:
+            self.data = {}
+
+    def fresh(self, key: str) -> Optional[Result]:
+        e = self.data.get(key)
+        if not e or not e.get("ok") or time.time() - float(e.get("ts") or 0) > self.ttl:
+            return None
+        return _from_entry(e)
+
+    def validators(self, key: str) -> Dict[str, str]:
+        e = self.data.get(key) or {}
+        h = {}
+        if e.get("ok") and e.get("etag"): h["If-None-Match"] = e["etag"]
+        if e.get("ok") and e.get("last_modified"): h["If-Modified-Since"] = e["last_modified"]
+        return h
+
+    def put(self, key: str, r: Result):
+        if r.status is None:
+            return  # 타임아웃/예외는 기록하지 않음
+        self.data[key] = dict(r._asdict(), ts=time.time())
+
+    def save(self):
+        d = os.path.dirname(self.path) or "."
+        try:
+            os.makedirs(d, exist_ok=True)
+            with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=d, delete=False, suffix=".tmp") as tmp:
+                json.dump(self.data, tmp, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp.name, self.path)
+        except Exception as e:
+            print(f"[url_check] cache save fail: {e}")
+
+def _from_entry(e: Dict) -> Result:
+    return Result(bool(e.get("ok")), e.get("status"), e.get("final_url") or "",
+                  e.get("etag") or "", e.get("last_modified") or "")
+
+class _Rate:
+    """요청 시작 시각을 1/rps 간격으로 예약 (asyncio 안에서만 사용)."""
+    def __init__(self, rps: float):
+        self.gap = 1.0 / rps if rps > 0 else 0.0
+        self.next_at = 0.0
+
+    async def wait(self):
+        if not self.gap:
+            return
+        now = time.monotonic()
+        at = max(now, self.next_at)
+        self.next_at = at + self.gap
+        if at > now:
+            await asyncio.sleep(at - now)
+
+def _session(per_host: int) -> requests.Session:
+    s = requests.Session()
+    s.headers["User-Agent"] = UA
+    # 리다이렉트 대상 호스트(link → www)까지 풀을 유지하도록 호스트 풀 몇 개를 둠
+    ad = HTTPAdapter(pool_connections=4, pool_maxsize=per_host, max_retries=0)
+    s.mount("https://", ad); s.mount("http://", ad)
+    return s
+
+def _result(r: requests.Response, ok: bool) -> Result:
+    return Result(ok, r.status_code, r.url, r.headers.get("ETag") or "", r.headers.get("Last-Modified") or "")
+
+def _probe(s: requests.Session, url: str, timeout: float, verify: bool, fallback: bool,
+           cond: Optional[Dict[str, str]] = None) -> Result:
+    try:
+        r = s.head(url, allow_redirects=True, timeout=timeout, verify=verify, headers=cond or None)
+        r.close()
+        if 200 <= r.status_code < 400:  # 304(Not Modified) 포함
+            return _result(r, True)
+        if not fallback:
+            return _result(r, False)
+        # HEAD 403/405 등을 내는 호스트 → 1바이트 범위 GET으로 재확인
+        rg = s.get(url, allow_redirects=True, timeout=timeout, verify=verify, stream=True,
+                   headers=dict(cond or {}, Range="bytes=0-0"))
+        try:
+            return _result(rg, 200 <= rg.status_code < 400)
+        finally:
+            rg.close()
+    except Exception:
+        return Result(False, None, "")
+
+async def _check_all(urls, timeout, verify, fallback, per_host, concurrency, rps,
+                     conds: Dict[str, Dict[str, str]]) -> Dict[str, Result]:
+    loop = asyncio.get_running_loop()
+    sems: Dict[str, asyncio.Semaphore] = defaultdict(lambda: asyncio.Semaphore(per_host))
+    sessions: Dict[str, requests.Session] = {}
+    rate = _Rate(rps)
+    out: Dict[str, Result] = {}
+
+    async def one(url: str):
+        host = urlparse(url).netloc.lower()
+        s = sessions.get(host) or sessions.setdefault(host, _session(per_host))
+        async with sems[host]:
+            await rate.wait()
+            out[url] = await loop.run_in_executor(ex, _probe, s, url, timeout, verify, fallback, conds.get(url))
+
+    with ThreadPoolExecutor(max_workers=concurrency) as ex:
+        try:
+            await asyncio.gather(*(one(u) for u in urls))
+        finally:
+            for s in sessions.values():
+                s.close()
+    return out
+
+def check_urls(urls: Iterable[str], timeout: float = 8, verify: bool = True, fallback: bool = True,
+               per_host: int = URL_CHECK_PER_HOST, concurrency: int = URL_CHECK_CONCURRENCY,
+               rps: float = URL_CHECK_RPS, cache: Optional[StatusCache] = None,
+               key: Callable[[str], str] = lambda u: u) -> Dict[str, Result]:
+    """URL별 Result. 같은 URL은 1회만 요청. cache가 있으면 key(url)로 TTL 안의 결과는 건너뛰고 나머지는 조건부 요청.
+    key는 캐시 조회에만 쓰므로 쿼리(itemId, q 등)를 버리면 서로 다른 URL의 결과가 섞임."""
+    uniq = list(dict.fromkeys(u for u in urls if u))
+    known: Dict[str, Result] = {}
+    conds: Dict[str, Dict[str, str]] = {}
+    todo = []
+    for u in uniq:
+        hit = cache.fresh(key(u)) if cache else None
+        if hit:
+            known[u] = hit; cache.hits += 1
+            continue
+        todo.append(u)
+        if cache:
+            conds[u] = cache.validators(key(u))
+    got = asyncio.run(_check_all(todo, timeout, verify, fallback, per_host, concurrency, rps, conds)) if todo else {}
+    for u, r in got.items():
+        if cache:
+            k = key(u)
+            if r.status == 304 and k in cache.data:
+                # 변경 없음 → 이전 결과 유지 (검증자가 응답에 없으면 이전 값 사용)
+                prev = _from_entry(cache.data[k])
+                r = prev._replace(etag=r.etag or prev.etag, last_modified=r.last_modified or prev.last_modified)
+                cache.revalidated += 1
+            cache.put(k, r)
+        known[u] = r
+    return known
+
+if __name__ == "__main__":
+    import argparse, sys
+    ap = argparse.ArgumentParser(description="Check URL health with per-host concurrency limits")
+    ap.add_argument("urls", nargs="*", help="비우면 stdin에서 한 줄에 하나")
+    ap.add_argument("--timeout", type=float, default=8)
+    ap.add_argument("--no-fallback", action="store_true")
+    args = ap.parse_args()
+    urls = args.urls or [ln.strip() for ln in sys.stdin if ln.strip()]
+    t0 = time.perf_counter()
+    res = check_urls(urls, args.timeout, fallback=not args.no_fallback)
+    for u, r in res.items():
+        print(f"{'OK ' if r.ok else 'BAD'}\t{r.status}\t{u}")
+    print(f"[url_check] {sum(r.ok for r in res.values())}/{len(res)} ok in {time.perf_counter() - t0:.2f}s")
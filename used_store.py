@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""
+used_store.py — 사용 키워드 색인 저장소 (SQLite, 날짜 인덱스)
+- .usage/used_*.txt(날짜\\t키워드) 로그를 대체하지 않고 옆에 두는 색인: 텍스트 로그는 그대로 git에 남김
+- import_text(): 로그 파일을 '지난번 읽은 위치'부터만 읽어 반영 (최초 1회 전체 가져오기, 이후 증분)
+- contains(kind, kw, days): (kind, keyword) 기본키 조회 → 1년치 로그를 매번 파싱하지 않음
+- window(kind, days): 최근 N일 키워드 집합 / view(kind, days): `in` 연산만 필요한 곳에 넘기는 뷰
+- 날짜가 없거나 깨진 줄은 기존 _read_used와 같게 '항상 사용됨'으로 취급(day='')
+
+- 색인 DB는 텍스트 로그에서 언제든 다시 만들 수 있는 파생물 → .cache/ 에 둠 (워크플로가 커밋하는 .usage/ 밖)
+  sqlite 모드는 DB가 유지되는 상주 호스트용. CI는 autopost.yml 의 .cache 캐시로 이어받고,
+  캐시가 없으면 첫 조회에서 로그 전체를 다시 가져옴 (결과는 같고 그 실행만 text 모드만큼 느림)
+
+Env:
+    USED_STORE     (default: text)  sqlite 로 두면 update_keywords / affiliate_post가 색인 사용
+    USED_STORE_DB  (default: .cache/used.sqlite3)
+"""
+
+from __future__ import annotations
+import os, sqlite3
+from datetime import datetime, timedelta
+from typing import Optional, Set
+
+USAGE_DIR = os.getenv("USAGE_DIR") or ".usage"
+USED_STORE = (os.getenv("USED_STORE") or "text").strip().lower()
+USED_STORE_DB = os.getenv("USED_STORE_DB") or os.path.join(os.getenv("CACHE_DIR", ".cache"), "used.sqlite3")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS used(
+    kind TEXT NOT NULL,
+    keyword TEXT NOT NULL,
+    day TEXT NOT NULL,
+    PRIMARY KEY(kind, keyword, day)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS ix_used_kind_day ON used(kind, day);
+CREATE TABLE IF NOT EXISTS imports(
+    path TEXT PRIMARY KEY,
+    offset INTEGER NOT NULL,
+    head TEXT
+);
+"""
+
+def _cutoff(days: int) -> str:
+    return (datetime.utcnow().date() - timedelta(days=days)).strftime("%Y-%m-%d")
+
+def _parse_line(ln: str):
+    """(day, keyword) — update_keywords._read_used(기준 파서)와 같은 규칙.
+    기준 파서는 탭 없는 줄을 `used.add(ln)`으로, 날짜 파싱 실패 줄을 except에서 추가 → 둘 다 기간과 무관하게 '사용됨'.
+    여기서는 day=''로 저장해 window/contains가 항상 포함 (줄을 버리면 텍스트 모드보다 재사용이 늘어남)."""
+    ln = ln.strip()
+    if not ln:
+        return None
+    if "\t" in ln:
+        d, k = ln.split("\t", 1)
+        k = k.strip()
+        try:
+            datetime.strptime(d, "%Y-%m-%d")
+        except ValueError:
+            d = ""
+        return (d, k) if k else None
+    return ("", ln)
+
+class UsedView:
+    """`kw in view` → 최근 days일 사용 여부. _ban_or_used 등 set을 기대하는 곳에 그대로 전달."""
+    __slots__ = ("store", "kind", "cutoff")
+
+    def __init__(self, store: "UsedStore", kind: str, days: int):
+        self.store, self.kind, self.cutoff = store, kind, _cutoff(days)
+
+    def __contains__(self, kw: str) -> bool:
+        return self.store._contains_since(self.kind, kw, self.cutoff)
+
+class UsedStore:
+    def __init__(self, path: str = USED_STORE_DB):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.db = sqlite3.connect(path)
+        self.db.executescript(_SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def mark(self, kind: str, kw: str, day: Optional[str] = None):
+        day = day or datetime.utcnow().strftime("%Y-%m-%d")
+        with self.db:
+            self.db.execute("INSERT OR IGNORE INTO used(kind,keyword,day) VALUES(?,?,?)", (kind, kw.strip(), day))
+
+    def _contains_since(self, kind: str, kw: str, cutoff: str) -> bool:
+        row = self.db.execute(
+            "SELECT 1 FROM used WHERE kind=? AND keyword=? AND (day>=? OR day='') LIMIT 1",
+            (kind, (kw or "").strip(), cutoff)).fetchone()
+        return row is not None
+
+    def contains(self, kind: str, kw: str, days: int = 365) -> bool:
+        return self._contains_since(kind, kw, _cutoff(days))
+
+    def window(self, kind: str, days: int = 365) -> Set[str]:
+        cur = self.db.execute("SELECT DISTINCT keyword FROM used WHERE kind=? AND (day>=? OR day='')",
+                              (kind, _cutoff(days)))
+        return {r[0] for r in cur}
+
+    def view(self, kind: str, days: int = 365) -> UsedView:
+        return UsedView(self, kind, days)
+
+    def import_text(self, kind: str, path: str) -> int:
+        """로그 파일에서 새로 덧붙은 줄만 가져온다. 파일이 교체/축소됐으면 처음부터 다시(중복은 기본키로 무시)."""
+        if not os.path.exists(path):
+            return 0
+        key = os.path.normpath(path)
+        row = self.db.execute("SELECT offset, head FROM imports WHERE path=?", (key,)).fetchone()
+        offset, head = (row if row else (0, None))
+        size = os.path.getsize(path)
+        with open(path, "rb") as f:
+            cur_head = f.readline()[:200].decode("utf-8", "ignore")
+            if size < offset or (head is not None and head != cur_head):
+                offset = 0
+            f.seek(offset)
+            chunk = f.read()
+        # 마지막 줄이 아직 쓰이는 중일 수 있으므로 줄바꿈까지만 반영
+        end = chunk.rfind(b"\n") + 1
+        rows = []
+        for ln in chunk[:end].decode("utf-8", "ignore").splitlines():
+            p = _parse_line(ln)
+            if p:
+                rows.append((kind, p[1], p[0]))
+        with self.db:
+            self.db.executemany("INSERT OR IGNORE INTO used(kind,keyword,day) VALUES(?,?,?)", rows)
+            self.db.execute("INSERT OR REPLACE INTO imports(path,offset,head) VALUES(?,?,?)",
+                            (key, offset + end, cur_head))
+        return len(rows)
+
+if __name__ == "__main__":
+    import argparse
+    ap = argparse.ArgumentParser(description="Import .usage/used_*.txt into the indexed store")
+    ap.add_argument("--db", default=USED_STORE_DB)
+    ap.add_argument("--days", type=int, default=365)
+    args = ap.parse_args()
+    st = UsedStore(args.db)
+    for kind in ("shopping", "general"):
+        n = st.import_text(kind, os.path.join(USAGE_DIR, f"used_{kind}.txt"))
+        print(f"[used_store] {kind}: +{n} lines, window({args.days}d)={len(st.window(kind, args.days))}")
+    st.close()
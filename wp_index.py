@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+"""
+wp_index.py — 블로그 글 로컬 색인(SQLite) + 증분 동기화
+- 컬럼: id, title, slug, date_gmt, modified_gmt, status, categories(JSON), content_hash
+- sync(): modified_after(WP 5.7+) + 페이지네이션 + 조건부 요청(ETag/Last-Modified)으로 바뀐 글만 받아 upsert
+- 조회: has_title / occupied / search_title — API 왕복 없이 로컬에서 응답
+- 발행 직후 record()로 응답을 바로 반영해 다음 동기화 전에도 최신 상태 유지
+
+Env:
+    WP_INDEX        (default: 0)  1이면 플래너/중복검사가 색인을 사용
+    WP_INDEX_DB     (default: .cache/wp_index.sqlite3)  사이트에서 다시 받을 수 있는 파생물 → 커밋되는 .usage/ 밖
+                    CI에서는 autopost.yml 의 .cache 캐시 단계로 실행 간 유지
+
+사용:
+    python wp_index.py            # 증분 동기화
+    python wp_index.py --full     # 전체 재동기화(삭제된 글 정리 포함)
+"""
+
+from __future__ import annotations
+import os, json, sqlite3, hashlib
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, List, Optional, Set, Tuple
+import requests
+
+WP_INDEX = (os.getenv("WP_INDEX") or "0").strip().lower() in ("1", "true", "yes", "on")
+WP_INDEX_DB = os.getenv("WP_INDEX_DB") or os.path.join(os.getenv("CACHE_DIR", ".cache"), "wp_index.sqlite3")
+
+GMT_FMT = "%Y-%m-%dT%H:%M:%S"
+# modified_after는 사이트 로컬 시각(post_modified)과 비교되므로 시간대 차이만큼 겹쳐서 요청
+SYNC_OVERLAP = timedelta(days=1)
+STATUSES = "publish,future,draft,pending,private,trash"
+FIELDS = "id,title,slug,date_gmt,modified_gmt,status,categories,content"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS posts(
+    id INTEGER PRIMARY KEY,
+    title TEXT NOT NULL,
+    slug TEXT,
+    date_gmt TEXT,
+    modified_gmt TEXT,
+    status TEXT,
+    categories TEXT,
+    content_hash TEXT
+);
+CREATE INDEX IF NOT EXISTS ix_posts_date ON posts(date_gmt);
+CREATE INDEX IF NOT EXISTS ix_posts_title ON posts(title);
+CREATE INDEX IF NOT EXISTS ix_posts_slug ON posts(slug);
+CREATE TABLE IF NOT EXISTS meta(k TEXT PRIMARY KEY, v TEXT);
+"""
+
+def _hash(s: str) -> str:
+    return hashlib.sha256((s or "").encode("utf-8")).hexdigest()
+
+def _raw(field) -> str:
+    # context=edit → {"raw":..., "rendered":...}, 그 외 → 문자열
+    if isinstance(field, dict):
+        return field.get("raw") if field.get("raw") is not None else (field.get("rendered") or "")
+    return field or ""
+
+class WPIndex:
+    def __init__(self, path: str = WP_INDEX_DB):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.executescript(_SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    # ----- meta -----
+    def _get(self, k: str) -> Optional[str]:
+        row = self.db.execute("SELECT v FROM meta WHERE k=?", (k,)).fetchone()
+        return row[0] if row else None
+
+    def _set(self, k: str, v: Optional[str]):
+        if v is None:
+            self.db.execute("DELETE FROM meta WHERE k=?", (k,))
+        else:
+            self.db.execute("INSERT OR REPLACE INTO meta(k,v) VALUES(?,?)", (k, v))
+
+    # ----- write -----
+    def record(self, it: dict):
+        """REST 응답(글 1건)을 upsert. trash 상태는 색인에서 제거."""
+        pid = it.get("id")
+        if not pid:
+            return
+        if it.get("status") == "trash":
+            self.db.execute("DELETE FROM posts WHERE id=?", (int(pid),))
+            return
+        self.db.execute(
+            "INSERT OR REPLACE INTO posts(id,title,slug,date_gmt,modified_gmt,status,categories,content_hash)"
+            " VALUES(?,?,?,?,?,?,?,?)",
+            (int(pid), _raw(it.get("title")).strip(), it.get("slug") or "",
+             (it.get("date_gmt") or "")[:19], (it.get("modified_gmt") or "")[:19],
+             it.get("status") or "", json.dumps(it.get("categories") or []),
+             _hash(_raw(it.get("content")))),
+        )
+
+    def record_many(self, items: Iterable[dict]):
+        with self.db:
+            for it in items:
+                if isinstance(it, dict) and not it.get("error"):
+                    self.record(it)
+
+    # ----- sync -----
+    def sync(self, session: requests.Session, wp_url: str, auth: Tuple[str, str],
+             verify: bool = True, full: bool = False) -> int:
+        """바뀐 글만 받아 반영. 반환: 반영한 글 수 (304면 0)."""
+        last = None if full else self._get("last_modified_gmt")
+        params = {"context": "edit", "status": STATUSES, "per_page": 100,
+                  "orderby": "modified", "order": "asc", "_fields": FIELDS}
+        if last:
+            since = datetime.strptime(last, GMT_FMT) - SYNC_OVERLAP
+            params["modified_after"] = since.strftime(GMT_FMT)
+
+        seen: Set[int] = set()
+        newest = last or ""
+        n = 0
+        page = 1
+        while True:
+            params["page"] = page
+            headers = {}
+            if page == 1 and not full:
+                if self._get("etag"): headers["If-None-Match"] = self._get("etag")
+                if self._get("last_modified"): headers["If-Modified-Since"] = self._get("last_modified")
+            r = session.get(f"{wp_url}/wp-json/wp/v2/posts", params=params, headers=headers,
+                            auth=auth, verify=verify, timeout=30)
+            if r.status_code == 304:
+                return 0
+            if r.status_code == 400 and page > 1:
+                break
+            r.raise_for_status()
+            if page == 1:
+                self._set("etag", r.headers.get("ETag"))
+                self._set("last_modified", r.headers.get("Last-Modified"))
+            items = r.json()
+            with self.db:
+                for it in items:
+                    self.record(it)
+                    seen.add(int(it["id"]))
+                    newest = max(newest, (it.get("modified_gmt") or "")[:19])
+                    n += 1
+            if page >= int(r.headers.get("X-WP-TotalPages") or "1"):
+                break
+            page += 1
+
+        with self.db:
+            if full and seen:
+                # 전체 동기화에서 보이지 않은 글 = 영구 삭제됨
+                q = ",".join("?" * len(seen))
+                self.db.execute(f"DELETE FROM posts WHERE id NOT IN ({q})", tuple(seen))
+            if newest:
+                self._set("last_modified_gmt", newest)
+            self._set("synced_at", datetime.now(timezone.utc).strftime(GMT_FMT))
+        return n
+
+    # ----- query -----
+    def has_title(self, title: str) -> bool:
+        return self.db.execute("SELECT 1 FROM posts WHERE title=? LIMIT 1", (title.strip(),)).fetchone() is not None
+
+    def occupied(self, after_gmt: str, before_gmt: Optional[str] = None,
+                 statuses: Tuple[str, ...] = ("future",), categories: Optional[List[int]] = None) -> Set[str]:
+        sql = f"SELECT date_gmt, categories FROM posts WHERE date_gmt>? AND status IN ({','.join('?' * len(statuses))})"
+        args: list = [after_gmt, *statuses]
+        if before_gmt:
+            sql += " AND date_gmt<?"; args.append(before_gmt)
+        out: Set[str] = set()
+        want = set(categories or [])
+        for g, cats in self.db.execute(sql, args):
+            if want and not (want & set(json.loads(cats or "[]"))):
+                continue
+            out.add(g)
+        return out
+
+    def search_title(self, q: str, limit: int = 5) -> List[Tuple[int, str, str]]:
+        """내부 링크용: 제목에 q가 들어간 공개 글 (id, title, slug)."""
+        return self.db.execute(
+            "SELECT id,title,slug FROM posts WHERE status='publish' AND instr(title, ?)>0"
+            " ORDER BY date_gmt DESC LIMIT ?", (q, limit)).fetchall()
+
+    def count(self) -> int:
+        return self.db.execute("SELECT COUNT(*) FROM posts").fetchone()[0]
+
+if __name__ == "__main__":
+    import argparse
+    from dotenv import load_dotenv
+    load_dotenv()
+    import wp_schedule
+
+    ap = argparse.ArgumentParser(description="Sync local WordPress post index")
+    ap.add_argument("--full", action="store_true", help="전체 재동기화")
+    ap.add_argument("--db", default=WP_INDEX_DB)
+    args = ap.parse_args()
+
+    wp_url = (os.getenv("WP_URL") or "").strip().rstrip("/")
+    auth = (os.getenv("WP_USER") or "", os.getenv("WP_APP_PASSWORD") or "")
+    verify = (os.getenv("WP_TLS_VERIFY") or "true").lower() != "false"
+    if not (wp_url and all(auth)):
+        raise SystemExit("WP_URL/WP_USER/WP_APP_PASSWORD 필요")
+    idx = WPIndex(args.db)
+    n = idx.sync(wp_schedule.make_session(), wp_url, auth, verify, full=args.full)
+    print(f"[wp_index] synced {n} posts → {args.db} (total={idx.count()})")
+    idx.close()
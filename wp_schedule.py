@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+"""
+wp_schedule.py — 여러 날짜 예약 플래너 (일상/쿠팡 공용)
+- plan_slots(): KST 슬롯 목록 × N일 → 예약 시각(date_gmt) 목록
+- fetch_occupied(): 이미 예약된(future) 글의 date_gmt 집합 (페이지네이션)
+- publish_many(): /wp-json/batch/v1 로 최대 25건씩 묶어 발행, 실패 시 건별 POST 폴백
+- make_session(): 커넥션 풀을 재사용하는 requests.Session
+- open_index(): WP_INDEX=1 이면 로컬 색인(wp_index)을 증분 동기화해 점유/중복 검사를 로컬에서 처리
+
+사용처: affiliate_post.main / auto_wp_gpt.main 의 --plan-days(PLAN_DAYS) 모드
+"""
+
+from __future__ import annotations
+import os
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import requests
+from requests.adapters import HTTPAdapter
+
+KST = ZoneInfo("Asia/Seoul")
+BATCH_MAX = 25  # WP 코어 batch/v1 기본 상한
+GMT_FMT = "%Y-%m-%dT%H:%M:%S"
+
+PLAN_DAYS = int(os.getenv("PLAN_DAYS") or "1")
+USE_BATCH = (os.getenv("WP_USE_BATCH") or "1").strip().lower() in ("1", "true", "yes", "on")
+
+def make_session(headers: Optional[Dict[str, str]] = None, pool: int = 8) -> requests.Session:
+    s = requests.Session()
+    ad = HTTPAdapter(pool_connections=pool, pool_maxsize=pool)
+    s.mount("https://", ad)
+    s.mount("http://", ad)
+    if headers:
+        s.headers.update(headers)
+    return s
+
+def _parse_hm(slot) -> Tuple[int, int]:
+    if isinstance(slot, int):
+        return slot, 0
+    hh, mm = [int(x) for x in str(slot).strip().split(":")]
+    return hh, mm
+
+def plan_slots(slots: Iterable, days: int, now: Optional[datetime] = None) -> List[Tuple[str, str]]:
+    """
+    슬롯(“HH:MM” 또는 시(int)) 목록을 앞으로 days일 동안 펼친다.
+    - 각 슬롯은 _slot_to_utc와 같은 규칙으로 '다음 발생'부터 시작해 슬롯당 days개
+    - 반환: [(KST 'YYYY-MM-DD HH:MM', date_gmt), ...] 시간순
+    """
+    now = now or datetime.now(KST)
+    out: List[Tuple[datetime, str]] = []
+    for hh, mm in {_parse_hm(s) for s in slots}:
+        first = now.replace(hour=hh, minute=mm, second=0, microsecond=0)
+        if first <= now: first += timedelta(days=1)
+        for d in range(max(1, days)):
+            tgt = first + timedelta(days=d)
+            out.append((tgt, tgt.astimezone(timezone.utc).strftime(GMT_FMT)))
+    out.sort()
+    return [(t.strftime("%Y-%m-%d %H:%M"), g) for t, g in out]
+
+def fetch_occupied(
+    session: requests.Session,
+    wp_url: str,
+    auth: Tuple[str, str],
+    verify: bool = True,
+    after_gmt: Optional[str] = None,
+    before_gmt: Optional[str] = None,
+    categories: Optional[List[int]] = None,
+) -> Set[str]:
+    """예약(future) 글의 date_gmt 집합. 목록만 필요하므로 _fields로 응답을 최소화."""
+    params = {
+        "status": "future",
+        "per_page": 100,
+        "context": "edit",
+        "orderby": "date",
+        "order": "asc",
+        "_fields": "id,date_gmt,categories",
+    }
+    if after_gmt: params["after"] = after_gmt
+    if before_gmt: params["before"] = before_gmt
+    if categories: params["categories"] = ",".join(str(c) for c in categories)
+
+    occupied: Set[str] = set()
+    page = 1
+    while True:
+        params["page"] = page
+        r = session.get(f"{wp_url}/wp-json/wp/v2/posts", params=params, auth=auth, verify=verify, timeout=20)
+        if r.status_code == 400 and page > 1:
+            break  # rest_post_invalid_page_number
+        r.raise_for_status()
+        for it in r.json():
+            g = (it.get("date_gmt") or "")[:19]
+            if g: occupied.add(g)
+        total = int(r.headers.get("X-WP-TotalPages") or "1")
+        if page >= total:
+            break
+        page += 1
+    return occupied
+
+def open_index(session: requests.Session, wp_url: str, auth: Tuple[str, str], verify: bool = True):
+    """WP_INDEX=1 이면 동기화된 WPIndex, 아니면 None (동기화 실패 시에도 None → API 경로)."""
+    import wp_index
+    if not wp_index.WP_INDEX:
+        return None
+    idx = wp_index.WPIndex()
+    try:
+        n = idx.sync(session, wp_url, auth, verify)
+        print(f"[wp_index] +{n} (total={idx.count()})")
+        return idx
+    except requests.RequestException as e:
+        print(f"[wp_index] sync failed → API fallback: {e}")
+        idx.close()
+        return None
+
+def _post_one(session, wp_url, auth, verify, payload) -> dict:
+    r = session.post(f"{wp_url}/wp-json/wp/v2/posts", json=payload, auth=auth, verify=verify, timeout=20)
+    r.raise_for_status()
+    return r.json()
+
+def publish_many(
+    session: requests.Session,
+    wp_url: str,
+    auth: Tuple[str, str],
+    payloads: List[dict],
+    verify: bool = True,
+    use_batch: Optional[bool] = None,
+) -> List[dict]:
+    """
+    글 여러 건 발행. batch/v1(WP 5.6+) 우선, 지원하지 않거나 실패하면 건별 POST.
+    - 반환: payloads 순서대로의 응답 dict (실패 건은 {"error": ...})
+    """
+    use_batch = USE_BATCH if use_batch is None else use_batch
+    results: List[dict] = []
+    for i in range(0, len(payloads), BATCH_MAX):
+        chunk = payloads[i:i + BATCH_MAX]
+        if use_batch and len(chunk) > 1:
+            body = {
+                "validation": "normal",
+                "requests": [{"method": "POST", "path": "/wp/v2/posts", "body": p} for p in chunk],
+            }
+            try:
+                r = session.post(f"{wp_url}/wp-json/batch/v1", json=body, auth=auth, verify=verify, timeout=60)
+                if r.status_code in (200, 207):
+                    data = r.json()
+                    resp = data.get("responses") or []
+                    if data.get("failed") != "validation" and len(resp) == len(chunk):
+                        for it in resp:
+                            st = int(it.get("status") or 0)
+                            if 200 <= st < 300:
+                                results.append(it.get("body") or {})
+                            else:
+                                results.append({"error": f"HTTP {st}", "body": it.get("body")})
+                        continue
+                print(f"[wp_schedule] batch unsupported/failed (HTTP {r.status_code}) → per-post fallback")
+            except requests.Timeout as e:
+                # 서버가 이미 처리했을 수 있으므로 재발행하지 않음(중복 예약 방지)
+                results.extend({"error": f"batch timeout: {e}"} for _ in chunk)
+                continue
+            except requests.RequestException as e:
+                print(f"[wp_schedule] batch error → per-post fallback: {e}")
+            use_batch = False  # 이후 청크는 바로 건별 처리
+        for p in chunk:
+            try:
+                results.append(_post_one(session, wp_url, auth, verify, p))
+            except requests.RequestException as e:
+                results.append({"error": str(e)})
+    return results
@@ -0,0 +1,301 @@
+# -*- coding: utf-8 -*-
+"""
+wp_stub_server.py — 로컬 WordPress REST 대역(stand-in) 서버 (부하/오프라인 검증용)
+- 구현 엔드포인트(우리 스크립트가 쓰는 것만):
+    GET/POST /wp-json/wp/v2/categories, /wp-json/wp/v2/tags   (search, per_page / name 생성)
+    GET/POST /wp-json/wp/v2/posts                               (status/after/before/modified_after/categories/page)
+    GET/POST /wp-json/wp/v2/blocks, POST /wp-json/wp/v2/blocks/<id>  (재사용 블록: 공용 스타일시트)
+    POST     /wp-json/wp/v2/media                               (원본 바이트 + Content-Disposition)
+    POST     /wp-json/batch/v1                                  (최대 25건, 위 엔드포인트로 내부 디스패치)
+    GET      /stub/stats                                        (요청 수, 분당 발행 수 등)
+- Basic Auth 검사, 지연(--latency-ms/--jitter-ms), 오류율(--error-rate → 503) 주입
+- 상태 JSON 파일에 영구 저장(--state)
+
+사용:
+    python wp_stub_server.py --port 8089 --latency-ms 80 --error-rate 0.05
+    WP_URL=http://127.0.0.1:8089 WP_USER=stub WP_APP_PASSWORD=stub python affiliate_post.py --plan-days 7
+"""
+
+from __future__ import annotations
+import os, json, time, base64, random, threading, argparse, hashlib, re
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+from typing import Dict, Optional, Tuple
+
+GMT_FMT = "%Y-%m-%dT%H:%M:%S"
+BATCH_MAX = 25
+
+def _now_gmt() -> str:
+    return datetime.now(timezone.utc).strftime(GMT_FMT)
+
+class StubState:
+    """글/용어/미디어 저장소. 쓰기마다 JSON 파일로 저장."""
+    def __init__(self, path: Optional[str]):
+        self.path = path
+        self.lock = threading.Lock()
+        self.data = {"next_id": 1, "posts": [], "categories": [], "tags": [], "media": [], "blocks": []}
+        self.stats = {"started": time.time(), "requests": 0, "errors_injected": 0, "posts_created": 0,
+                      "media_created": 0, "batches": 0, "auth_fail": 0}
+        if path and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self.data.update(json.load(f))
+
+    def _id(self) -> int:
+        i = self.data["next_id"]; self.data["next_id"] += 1
+        return i
+
+    def save(self):
+        if not self.path:
+            return
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.data, f, ensure_ascii=False)
+        os.replace(tmp, self.path)
+
+class Handler(BaseHTTPRequestHandler):
+    server_version = "wp-stub/1.0"
+    state: StubState = None  # type: ignore
+    cfg: argparse.Namespace = None  # type: ignore
+
+    def log_message(self, fmt, *args):
+        if self.cfg.verbose:
+            super().log_message(fmt, *args)
+
+    # ----- 공통 -----
+    def _send(self, code: int, obj, headers: Optional[Dict[str, str]] = None):
+        body = json.dumps(obj, ensure_ascii=False).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json; charset=UTF-8")
+        self.send_header("Content-Length", str(len(body)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _authorized(self) -> bool:
+        if not self.cfg.user:
+            return True
+        h = self.headers.get("Authorization") or ""
+        if not h.startswith("Basic "):
+            return False
+        try:
+            u, _, p = base64.b64decode(h[6:]).decode("utf-8").partition(":")
+        except Exception:
+            return False
+        # 앱 비밀번호는 공백을 넣어 보여주므로 공백 무시
+        return u == self.cfg.user and p.replace(" ", "") == self.cfg.password.replace(" ", "")
+
+    def _inject(self) -> bool:
+        """지연 + 오류 주입. True면 이미 오류 응답을 보냄."""
+        if self.cfg.latency_ms or self.cfg.jitter_ms:
+            time.sleep(max(0.0, self.cfg.latency_ms + random.uniform(-1, 1) * self.cfg.jitter_ms) / 1000.0)
+        if self.cfg.error_rate and random.random() < self.cfg.error_rate:
+            with self.state.lock:
+                self.state.stats["errors_injected"] += 1
+            self._send(503, {"code": "stub_injected", "message": "injected failure"})
+            return True
+        return False
+
+    def _body(self) -> bytes:
+        n = int(self.headers.get("Content-Length") or "0")
+        return self.rfile.read(n) if n else b""
+
+    def _handle(self, method: str):
+        with self.state.lock:
+            self.state.stats["requests"] += 1
+        u = urlparse(self.path)
+        if u.path == "/stub/stats":
+            return self._send(200, self._stats())
+        if self._inject():
+            return
+        if not self._authorized():
+            with self.state.lock:
+                self.state.stats["auth_fail"] += 1
+            return self._send(401, {"code": "rest_not_logged_in", "message": "auth required"})
+        q = {k: v[-1] for k, v in parse_qs(u.query).items()}
+        raw = self._body() if method == "POST" else b""
+        if u.path == "/wp-json/batch/v1" and method == "POST":
+            return self._send(207, self._batch(json.loads(raw or b"{}")))
+        ctype = (self.headers.get("Content-Type") or "")
+        if u.path == "/wp-json/wp/v2/media" and method == "POST":
+            code, obj, hdr = self._media(raw, self.headers.get("Content-Disposition") or "", ctype)
+        else:
+            body = json.loads(raw) if raw and "json" in ctype else {}
+            code, obj, hdr = self.dispatch(method, u.path, q, body)
+        self._send(code, obj, hdr)
+
+    def do_GET(self): self._handle("GET")
+    def do_POST(self): self._handle("POST")
+
+    # ----- 라우팅 -----
+    def dispatch(self, method: str, path: str, q: Dict[str, str], body: Dict) -> Tuple[int, object, Dict[str, str]]:
+        m = re.fullmatch(r"/wp-json/wp/v2/(categories|tags|posts|blocks)(?:/(\d+))?", path)
+        if not m or (m.group(2) and m.group(1) != "blocks"):
+            return 404, {"code": "rest_no_route", "message": f"no route {method} {path}"}, {}
+        kind = m.group(1)
+        if kind == "blocks":
+            return self._blocks(method, int(m.group(2) or 0), q, body)
+        if kind == "posts":
+            return self._posts_get(q) if method == "GET" else self._posts_create(body)
+        return self._terms_get(kind, q) if method == "GET" else self._terms_create(kind, body)
+
+    def _terms_get(self, kind, q):
+        s = (q.get("search") or "").strip()
+        with self.state.lock:
+            items = [t for t in self.state.data[kind] if s in t["name"]]
+        return 200, items[:int(q.get("per_page") or 10)], {}
+
+    def _terms_create(self, kind, body):
+        name = (body.get("name") or "").strip()
+        if not name:
+            return 400, {"code": "rest_missing_callback_param", "message": "name required"}, {}
+        with self.state.lock:
+            for t in self.state.data[kind]:
+                if t["name"] == name:
+                    return 400, {"code": "term_exists", "message": "exists", "data": {"term_id": t["id"]}}, {}
+            t = {"id": self.state._id(), "name": name, "slug": name}
+            self.state.data[kind].append(t)
+            self.state.save()
+        return 201, t, {}
+
+    def _blocks(self, method, bid, q, body):
+        with self.state.lock:
+            blocks = self.state.data.setdefault("blocks", [])
+            if method == "GET":
+                s = (q.get("search") or "").strip()
+                return 200, [{**b, "title": {"raw": b["title"]}} for b in blocks if s in b["title"]], {}
+            if bid:
+                hit = next((b for b in blocks if b["id"] == bid), None)
+                if not hit:
+                    return 404, {"code": "rest_post_invalid_id", "message": "invalid id"}, {}
+                hit.update({k: body[k] for k in ("title", "content", "status") if k in body})
+                code = 200
+            else:
+                hit = {"id": self.state._id(), "title": body.get("title") or "", "content": body.get("content") or "",
+                       "status": body.get("status") or "publish"}
+                blocks.append(hit)
+                code = 201
+            self.state.save()
+            return code, dict(hit), {}
+
+    def _posts_get(self, q):
+        statuses = set((q.get("status") or "publish").split(","))
+        per = max(1, min(100, int(q.get("per_page") or 10)))
+        page = max(1, int(q.get("page") or 1))
+        cats = {int(c) for c in (q.get("categories") or "").split(",") if c}
+        with self.state.lock:
+            items = [p for p in self.state.data["posts"]
+                     if ("any" in statuses or p["status"] in statuses)
+                     and (not q.get("after") or p["date_gmt"] > q["after"][:19])
+                     and (not q.get("before") or p["date_gmt"] < q["before"][:19])
+                     and (not q.get("modified_after") or p["modified_gmt"] > q["modified_after"][:19])
+                     and (not cats or cats & set(p["categories"]))]
+        key = "modified_gmt" if q.get("orderby") == "modified" else "date_gmt"
+        items.sort(key=lambda p: (p[key], p["id"]), reverse=(q.get("order") or "desc") == "desc")
+        total = len(items)
+        pages = max(1, -(-total // per))
+        if page > pages and total:
+            return 400, {"code": "rest_post_invalid_page_number", "message": "page out of range"}, {}
+        chunk = [self._post_view(p, q.get("context") == "edit") for p in items[(page - 1) * per: page * per]]
+        if q.get("_fields"):
+            keep = set(q["_fields"].split(","))
+            chunk = [{k: v for k, v in p.items() if k in keep} for p in chunk]
+        return 200, chunk, {"X-WP-Total": str(total), "X-WP-TotalPages": str(pages)}
+
+    @staticmethod
+    def _post_view(p: Dict, edit: bool) -> Dict:
+        v = dict(p)
+        v["title"] = {"raw": p["title"], "rendered": p["title"]} if edit else {"rendered": p["title"]}
+        v["content"] = {"raw": p["content"], "rendered": p["content"]} if edit else {"rendered": p["content"]}
+        return v
+
+    def _posts_create(self, body):
+        title = body.get("title") or ""
+        if not (title or body.get("content")):
+            return 400, {"code": "empty_content", "message": "title/content required"}, {}
+        now = _now_gmt()
+        date_gmt = (body.get("date_gmt") or now)[:19]
+        status = body.get("status") or "draft"
+        if status == "future" and date_gmt <= now:
+            status = "publish"  # WP와 동일: 과거 시각 예약은 즉시 발행
+        with self.state.lock:
+            pid = self.state._id()
+            p = {"id": pid, "title": title, "content": body.get("content") or "", "status": status,
+                 "slug": re.sub(r"\s+", "-", title.strip().lower()) or str(pid),
+                 "date_gmt": date_gmt, "modified_gmt": now, "categories": body.get("categories") or [],
+                 "tags": body.get("tags") or [], "featured_media": int(body.get("featured_media") or 0),
+                 "link": f"http://stub.local/?p={pid}"}
+            self.state.data["posts"].append(p)
+            self.state.stats["posts_created"] += 1
+            self.state.save()
+        return 201, self._post_view(p, True), {}
+
+    def _media(self, raw: bytes, disposition: str, ctype: str):
+        if not raw:
+            return 400, {"code": "rest_upload_no_data", "message": "no data"}, {}
+        m = re.search(r'filename="?([^";]+)"?', disposition)
+        name = m.group(1) if m else "upload.bin"
+        with self.state.lock:
+            mid = self.state._id()
+            item = {"id": mid, "source_url": f"http://stub.local/uploads/{mid}-{name}", "mime_type": ctype,
+                    "bytes": len(raw), "sha256": hashlib.sha256(raw).hexdigest()}
+            self.state.data["media"].append(item)
+            self.state.stats["media_created"] += 1
+            self.state.save()
+        return 201, item, {}
+
+    def _batch(self, body: Dict):
+        reqs = body.get("requests") or []
+        with self.state.lock:
+            self.state.stats["batches"] += 1
+        if len(reqs) > BATCH_MAX:
+            return {"failed": "validation", "responses": [
+                {"status": 400, "body": {"code": "rest_batch_max_requests"}}]}
+        out = []
+        for r in reqs:
+            u = urlparse(r.get("path") or "")
+            code, obj, hdr = self.dispatch((r.get("method") or "POST").upper(), "/wp-json" + u.path,
+                                           {k: v[-1] for k, v in parse_qs(u.query).items()}, r.get("body") or {})
+            out.append({"status": code, "headers": hdr, "body": obj})
+        return {"responses": out}
+
+    def _stats(self):
+        with self.state.lock:
+            st = dict(self.state.stats)
+            st["posts_total"] = len(self.state.data["posts"])
+        mins = max(1e-9, (time.time() - st["started"]) / 60.0)
+        st["posts_per_minute"] = round(st["posts_created"] / mins, 2)
+        st["uptime_sec"] = round(time.time() - st["started"], 1)
+        return st
+
+def main():
+    ap = argparse.ArgumentParser(description="Local WordPress REST stand-in")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8089)
+    ap.add_argument("--user", default=os.getenv("STUB_WP_USER", "stub"), help="빈 문자열이면 인증 생략")
+    ap.add_argument("--password", default=os.getenv("STUB_WP_PASSWORD", "stub"))
+    ap.add_argument("--latency-ms", type=float, default=0.0)
+    ap.add_argument("--jitter-ms", type=float, default=0.0)
+    ap.add_argument("--error-rate", type=float, default=0.0, help="0~1, 해당 확률로 503")
+    ap.add_argument("--state", default=".cache/wp_stub_state.json", help="상태 파일(빈 문자열이면 메모리만)")
+    ap.add_argument("--verbose", action="store_true")
+    args = ap.parse_args()
+
+    if args.state:
+        os.makedirs(os.path.dirname(args.state) or ".", exist_ok=True)
+    Handler.state = StubState(args.state or None)
+    Handler.cfg = args
+    srv = ThreadingHTTPServer((args.host, args.port), Handler)
+    print(f"[wp_stub] http://{args.host}:{args.port} (state={args.state or 'memory'}, "
+          f"latency={args.latency_ms}±{args.jitter_ms}ms, error_rate={args.error_rate})")
+    try:
+        srv.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        srv.server_close()
+        print("[wp_stub] stats:", json.dumps(Handler.state.stats, ensure_ascii=False))
+
+if __name__ == "__main__":
+    main()